@@ -1,23 +1,29 @@
 import logging
-import streamlit as st
-from transformers import T5ForConditionalGeneration, AutoTokenizer
-import torch
-import firebase_admin
-from firebase_admin import credentials, firestore
 import os
-import re
-from firebase.firebase_config import firebase_auth  # Import Firebase Authentication
-from firebase_admin import firestore
+import threading
+from concurrent.futures import Future
+import streamlit as st
+from firebase.firebase_config import get_db
+from firebase.firestore_writer import FirestoreBatchWriter
+from firebase.translation_counts import ensure_translation_count, save_writes
+from translator.loader import load_translation_model
+from translator.engine import TranslationEngine
+from translator.device_manager import FAULT_RATE, DeviceManager
+from translator.scheduler import MicroBatchScheduler
+from translator.continuous import CONTINUOUS_BATCHING, ContinuousBatchDecoder
+from translator.segmentation import SentencePipeline
+from translator.worker_pool import DEFAULT_WORKERS, WorkerPool
+from translator.warmup import WARMUP_ENABLED, format_warmup, warmup
+from translator.cache import TranslationCache
+from translator.text_utils import clean_translation, ensure_punctuation, ensure_valid_input
+from translator.metrics import metrics
 
-# ✅ Ensure Firestore client is obtained within the file
-db = firestore.client()
+# Importing this module has no side effects: page setup, Firebase and the
+# model are only touched when Streamlit runs it as the main script (main()).
+logger = logging.getLogger()
 
-# ✅ Streamlit Page Configuration
-st.set_page_config(
-    page_title="ROJAK | Malaysian Code-Switched Translator",
-    page_icon="image/logo4.png",
-    layout="wide"
-)
+# ✅ Streaming mode: show the bot reply token by token (greedy decoding)
+STREAMING_ENABLED = os.getenv("TRANSLATION_STREAMING", "0") == "1"
 
 css_dark_mode = """
 <style>
@@ -72,78 +78,167 @@ css_dark_mode = """
     }
 </style>
 """
-st.markdown(css_dark_mode, unsafe_allow_html=True)
-
-# ✅ Initialize Firebase Admin SDK and Firestore
-if not firebase_admin._apps:
-    cred = credentials.Certificate(service_account_path)
-    firebase_admin.initialize_app(cred)
-
-db = firestore.client()
-
-# ✅ Logging Configuration
-logging.basicConfig(
-    level=logging.ERROR,
-    filename="error_logs.log",
-    filemode="a",
-    format="%(asctime)s - %(message)s"
-)
-logger = logging.getLogger()
+
+# ✅ Streamlit Page Configuration + Logging Configuration
+def setup_page():
+    st.set_page_config(
+        page_title="ROJAK | Malaysian Code-Switched Translator",
+        page_icon="image/logo4.png",
+        layout="wide"
+    )
+    st.markdown(css_dark_mode, unsafe_allow_html=True)
+    logging.basicConfig(
+        level=logging.ERROR,
+        filename="error_logs.log",
+        filemode="a",
+        format="%(asctime)s - %(message)s"
+    )
+
 
 # ✅ Load Model and Tokenizer (Cached)
 @st.cache_resource
 def load_model():
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    if device == "cuda":
-        try:
-            torch.cuda.init()  # Explicit CUDA check
-            tokenizer = AutoTokenizer.from_pretrained("./fine_tuned_nanot5")
-            model = T5ForConditionalGeneration.from_pretrained("./fine_tuned_nanot5")
-            model.to(device)
-            st.session_state["success_message"] = "✅ Fine-tuned model is ready for chat!"
-        except torch.cuda.CudaError as e:
-            device = "cpu"
-            tokenizer = AutoTokenizer.from_pretrained('mesolitica/nanot5-small-malaysian-translation-v2')
-            model = T5ForConditionalGeneration.from_pretrained('mesolitica/nanot5-small-malaysian-translation-v2')
-            model.to(device)
-            st.session_state["success_message"] = "⚠️ CUDA initialization error. Loaded base model on CPU."
-    else:
-        tokenizer = AutoTokenizer.from_pretrained('mesolitica/nanot5-small-malaysian-translation-v2')
-        model = T5ForConditionalGeneration.from_pretrained('mesolitica/nanot5-small-malaysian-translation-v2')
-        model.to(device)
-        st.session_state["success_message"] = "⚠️ CUDA not available. Loaded base model on CPU."
-    
+    model, tokenizer, device, message = load_translation_model()
+    st.session_state["success_message"] = message
     return model, tokenizer, device
 
 
-# ✅ Cleaning Translation Results
-def clean_translation(text):
-    sentences = [s.strip() for s in text.split('.') if s.strip()]
-    return sentences[0] if sentences else text
+# ✅ Pay first-call (and TRANSLATION_COMPILE=1 compile) costs on the engines that
+# will serve, not in a user's translation
+def warm_up(report, *engines):
+    if not WARMUP_ENABLED:
+        return
+    for engine in engines:
+        report(f"✅ {format_warmup(warmup(engine))}.")
+
+
+# ✅ Serving stack: micro-batching scheduler shared by all sessions of the process
+# On CPU, TRANSLATION_WORKERS=N serves requests from N pinned worker processes
+# that share one copy of the weights instead (translator/worker_pool.py).
+def build_scheduler(report):
+    model, tokenizer, device, message = load_translation_model()
+    report(message)
+    if DEFAULT_WORKERS > 0 and device == "cpu":
+        # The workers rebuild a plain torch model: INT8/ONNX backends keep the in-process engine
+        if getattr(model, "translation_backend", "torch") == "torch":
+            return SentencePipeline(WorkerPool(model, tokenizer, workers=DEFAULT_WORKERS).start())
+        logger.warning(f"TRANSLATION_WORKERS={DEFAULT_WORKERS} needs the torch backend, "
+                       f"not {model.translation_backend}; using the micro-batch scheduler.")
+    engine = TranslationEngine(model, tokenizer, device, cache=TranslationCache())
+    # TRANSLATION_CONTINUOUS=1: iteration-level batching (greedy) instead of micro-batches;
+    # the step decoder runs the torch modules, so INT8/ONNX backends keep micro-batching
+    if CONTINUOUS_BATCHING and getattr(model, "translation_backend", "torch") == "torch":
+        decoder = ContinuousBatchDecoder(engine).start()
+        warm_up(report, decoder)
+        return SentencePipeline(decoder)
+    # GPU errors at generate time are rerouted to a warm CPU replica
+    # (TRANSLATION_FAULT_RATE injects them on a CPU-only box)
+    if device == "cuda" or FAULT_RATE > 0:
+        engine = DeviceManager.for_engine(engine)
+        warm_up(report, engine.primary, engine.replica)
+    else:
+        warm_up(report, engine)
+    # Multi-sentence messages are split and translated sentence by sentence
+    return MicroBatchScheduler(SentencePipeline(engine)).start()
+
+
+# ✅ Build the serving stack in a background thread
+# Started when the server process first runs this script (Streamlit has no
+# earlier hook), so no page render waits for model load, warmup or compile;
+# the sidebar shows the progress and a translation waits only if it arrives
+# before the stack is ready.
+class ServingStartup:
+    def __init__(self):
+        self.messages = []
+        self.future = Future()
+        threading.Thread(target=self._run, name="translation-startup", daemon=True).start()
+
+    def _run(self):
+        try:
+            self.future.set_result(build_scheduler(self.messages.append))
+        except Exception as e:
+            logger.error(f"Translation startup failed: {e}")
+            self.future.set_exception(e)
+
+    def status(self):
+        text = " ".join(self.messages)
+        if not self.future.done():
+            return "info", f"{text} ⏳ Warming up the translator...".strip()
+        if self.future.exception() is not None:
+            return "error", f"❌ Translator failed to start: {self.future.exception()}"
+        return "success", text
+
+
+@st.cache_resource
+def start_serving():
+    return ServingStartup()
+
+
+def get_scheduler():
+    return start_serving().future.result()
+
+# ✅ Background Firestore Writer (one per server process)
+@st.cache_resource
+def get_firestore_writer():
+    return FirestoreBatchWriter(get_db()).start()
+
+# ✅ Metrics endpoint (Prometheus text on TRANSLATION_METRICS_PORT) and/or
+# periodic JSON dump (TRANSLATION_METRICS_JSON); only when TRANSLATION_METRICS=1
+@st.cache_resource
+def start_metrics_exporters():
+    if not metrics.enabled:
+        return None
+    port = os.getenv("TRANSLATION_METRICS_PORT")
+    json_path = os.getenv("TRANSLATION_METRICS_JSON")
+    server = metrics.start_http_server(int(port)) if port else None
+    if json_path:
+        metrics.start_json_dump(json_path)
+    return server
 
 # ✅ Save Translation to Firestore (Auto-Save)
+# The write is queued and committed in batches off the request path.
 def save_translation_to_firestore(input_text, output_text):
     if "user" not in st.session_state or not st.session_state["user"]:
         st.warning("⚠️ Please log in to save translations.")
         return False
 
     try:
-        db.collection("translations").add({
-            "user": st.session_state["user"],
-            "input_text": input_text,
-            "output_text": output_text,
-            "timestamp": firestore.SERVER_TIMESTAMP
-        })
-        st.success("✅ Translation saved successfully!")
+        from firebase_admin import firestore
+        writer = get_firestore_writer()
+        with metrics.span("firestore_save"):
+            if st.session_state.get("counted_user") != st.session_state["user"]:
+                ensure_translation_count(get_db(), st.session_state["user"])
+                st.session_state["counted_user"] = st.session_state["user"]
+            # ✅ The per-user counter shown on the Account page is updated in the same batch
+            writer.enqueue_group(save_writes(st.session_state["user"], {
+                "user": st.session_state["user"],
+                "input_text": input_text,
+                "output_text": output_text,
+                "timestamp": firestore.SERVER_TIMESTAMP
+            }))
+        # The Saved page refetches instead of showing its cached pages without this one
+        st.session_state.pop("saved_pager", None)
+        st.success("✅ Translation queued for saving!")
         return True
     except Exception as e:
         st.error(f"❌ Failed to save translation: {e}")
         logger.error(f"Error saving translation: {e}")
         return False
 
+# ✅ Render the bot reply progressively while the model is still generating
+def stream_bot_reply(engine, chat_input):
+    st.markdown(f'<p style="text-align: right; color: #65CCB8;">{chat_input} 👤</p>', unsafe_allow_html=True)
+    placeholder = st.empty()
+    streamed = ""
+    for piece in engine.stream_translate(chat_input):
+        streamed += piece
+        placeholder.markdown(f'<p style="text-align: left; color: white;">🤖 {streamed}▌</p>', unsafe_allow_html=True)
+    translated_text = engine.postprocess(streamed)
+    placeholder.markdown(f'<p style="text-align: left; color: white;">🤖 {translated_text}</p>', unsafe_allow_html=True)
+    return translated_text
+
 # ✅ Main Translation Interface with Refresh Button
 def translator_page():
-    model, tokenizer, device = load_model()
     st.markdown('<h1 style="color: #65CCB8;">Malaysian Code-Switched Language Translator</h1>', unsafe_allow_html=True)
 
 
@@ -176,17 +271,6 @@ def translator_page():
     # ✅ User Input with Punctuation Handling
     chat_input = st.chat_input("Enter your code-switched text here")
 
-    def ensure_punctuation(text):
-        if text and text[-1] not in ['.', '!', '?']:
-            return text + '.'
-        return text
-
-    # Allow letters, numbers, spaces, and standard punctuation only
-    def ensure_valid_input(text):
-        if not re.match(r'^[a-zA-Z0-9\s.,!?]+$', text):
-            return False
-        return True
-
     if chat_input:
         if not chat_input.strip():
             st.error("Input cannot be empty. Please enter some text.")
@@ -198,13 +282,14 @@ def translator_page():
             try:
                 
                 st.session_state.conversation.append({"role": "user", "text": chat_input})
-                prefix = "terjemah ke Inggeris: "
-                input_text_prefixed = prefix + chat_input
-                input_ids = tokenizer(input_text_prefixed, return_tensors="pt").input_ids.to(device)
-                outputs = model.generate(input_ids, max_length=30, num_beams=2)
-                translated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-                translated_text = clean_translation(translated_text)
-                translated_text = ensure_punctuation(translated_text)
+                with st.spinner("Warming up the translator..."):
+                    scheduler = get_scheduler()
+                with metrics.span("translate"):
+                    # The worker pool has no in-process engine to stream from
+                    if STREAMING_ENABLED and hasattr(getattr(scheduler, "engine", None), "stream_translate"):
+                        translated_text = stream_bot_reply(scheduler.engine, chat_input)
+                    else:
+                        translated_text = scheduler.translate(chat_input)
 
                 # ✅ Display and Save Translation
                 st.session_state.conversation.append({"role": "bot", "text": translated_text})
@@ -212,29 +297,40 @@ def translator_page():
                 st.rerun()
 
             except Exception as e:
+                metrics.inc("translation_errors_total")
                 st.error(f"Translation error: {str(e)}")
                 logger.error(f"Translation Error: {e}")
 
-# ✅ Call the Translator Page
+# ✅ Sidebar Footer (Info Section)
+def sidebar_footer():
+    st.sidebar.image("image/logo3.png", use_container_width=True)
+    st.sidebar.title("Instructions")
+    st.sidebar.markdown("""
+    - *Enter Code-Switched Text*: Type your Malay-English code-switched text in the box.
+    - *Translation happens automatically.*
+    - *Save Translations*: You must log in to save translations.
+    """)
+
+    level, message = start_serving().status()
+    getattr(st.sidebar, level)(message)
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("""Developed by: *PRAVIN RAJ A/L MURALITHARAN*""")
+    st.sidebar.markdown(
+        """
+        [![GitHub](https://img.shields.io/badge/View%20on-GitHub-181717?style=for-the-badge&logo=github)](https://github.com/PravinRaj01/FYP-AI.git)
+        """,
+        unsafe_allow_html=True
+    )
 
-translator_page()
 
-# ✅ Sidebar Footer (Info Section)
-st.sidebar.image("image/logo3.png", use_container_width=True)
-st.sidebar.title("Instructions")
-st.sidebar.markdown("""
-- *Enter Code-Switched Text*: Type your Malay-English code-switched text in the box.
-- *Translation happens automatically.*
-- *Save Translations*: You must log in to save translations.
-""")
-
-if "success_message" in st.session_state:
-        st.sidebar.success(st.session_state["success_message"])
-st.sidebar.markdown("---")
-st.sidebar.markdown("""Developed by: *PRAVIN RAJ A/L MURALITHARAN*""")
-st.sidebar.markdown(
-    """
-    [![GitHub](https://img.shields.io/badge/View%20on-GitHub-181717?style=for-the-badge&logo=github)](https://github.com/PravinRaj01/FYP-AI.git)
-    """,
-    unsafe_allow_html=True
-)
\ No newline at end of file
+def main():
+    setup_page()
+    start_serving()
+    start_metrics_exporters()
+    translator_page()
+    sidebar_footer()
+
+
+# ✅ Streamlit runs this file as __main__; tests and tools can import it freely
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# benchmark.py
+# ✅ Reproducible inference benchmark for the translation path
+#
+#   python benchmark.py --batch-sizes 1,8 --num-beams 1,2 --threads 1,4 --output bench.json
+#   python benchmark.py --backends torch,int8,onnx --rounds 5
+#   python benchmark.py --policies fixed,adaptive       # fixed vs adaptive generation budget
+#   python benchmark.py --traffic 200 --rate 8          # request-level vs continuous batching
+#
+# Every backend is measured in a fresh process so model load time and peak RSS
+# are not polluted by the previous backend. Results are written as JSON so two
+# runs can be compared (see --compare).
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from translator.reference_corpus import REFERENCE_SENTENCES
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def make_batches(sentences, batch_size, rounds):
+    pool = sentences * (1 + (batch_size * rounds) // len(sentences))
+    return [pool[i * batch_size:(i + 1) * batch_size] for i in range(rounds)]
+
+
+# ✅ Time one configuration through the production path (TranslationEngine.generate_batch:
+# length bucketing, lean/compiled decoding, confidence retry); returns latency
+# percentiles, throughput and the padding the buckets left
+def run_config(engine, sentences, batch_size, num_beams, max_length, threads, rounds, warmup=2):
+    import torch
+    from translator.batching import PaddingStats
+
+    torch.set_num_threads(threads)
+    engine.num_beams = num_beams
+    engine.max_length = max_length
+    engine.max_batch_size = batch_size
+
+    batches = make_batches(sentences, batch_size, rounds + warmup)
+    latencies, tokens, sentences_done = [], 0, 0
+    for index, batch in enumerate(batches):
+        if index == warmup:
+            engine.padding_stats = PaddingStats()
+        generated_before = engine.generated_tokens
+        start = time.perf_counter()
+        engine.generate_batch(batch)
+        elapsed = time.perf_counter() - start
+        if index < warmup:
+            continue
+        latencies.append(elapsed)
+        tokens += engine.generated_tokens - generated_before
+        sentences_done += len(batch)
+
+    total = sum(latencies)
+    return {
+        "batch_size": batch_size,
+        "num_beams": num_beams,
+        "max_length": max_length,
+        "threads": threads,
+        "rounds": rounds,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "mean": round(statistics.mean(latencies) * 1000, 3),
+        },
+        "sentences_per_sec": round(sentences_done / total, 3),
+        "tokens_per_sec": round(tokens / total, 3),
+        "padding": engine.padding_stats.as_dict(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# ✅ Fixed vs adaptive generation budget, one sentence per call
+# Quality is measured against a large-budget reference decode (num_beams=4,
+# max_length=256): the share of identical outputs and the number of outputs
+# cut off before EOS. Latency is split into short and long inputs.
+def run_policies(engine, sentences, policies, rounds):
+    from translator.generation_policy import GenerationBudget
+
+    saved = engine.budget, engine.num_beams, engine.max_length
+    engine.budget, engine.num_beams, engine.max_length = None, 4, 256
+    reference = [engine.generate_batch([text])[0] for text in sentences]
+    engine.num_beams, engine.max_length = saved[1], saved[2]
+
+    lengths = [len(ids) for ids in engine.tokenize(sentences)]
+    short_cutoff = statistics.median(lengths)
+    results = []
+    for name in policies:
+        engine.budget = GenerationBudget() if name == "adaptive" else None
+        engine.generate_batch(sentences[:2])  # warm-up
+        engine.truncated_outputs = 0
+        outputs, short, long = [], [], []
+        for round_index in range(rounds):
+            for text, length in zip(sentences, lengths):
+                start = time.perf_counter()
+                output = engine.generate_batch([text])[0]
+                (short if length <= short_cutoff else long).append(time.perf_counter() - start)
+                if round_index == 0:
+                    outputs.append(output)
+        latencies = short + long
+        results.append({
+            "policy": name,
+            "generation": engine.generation_kwargs(),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000, 3),
+                "p95": round(percentile(latencies, 95) * 1000, 3),
+                "short_p50": round(percentile(short, 50) * 1000, 3),
+                "long_p50": round(percentile(long, 50) * 1000, 3) if long else None,
+            },
+            "matches_reference": round(sum(a == b for a, b in zip(outputs, reference)) / len(reference), 4),
+            "truncated_outputs": engine.truncated_outputs // rounds,
+        })
+    engine.budget = saved[0]
+    return results
+
+
+# ✅ Open-loop traffic: Poisson arrivals of mixed-length sentences, greedy decoding
+# "request" is the micro-batching scheduler (whole batches run to completion),
+# "continuous" the iteration-level decoder. Reports throughput and latency tails.
+def run_traffic(engine, sentences, mode, requests, rate, seed=0):
+    import random
+    import threading
+    from translator.continuous import ContinuousBatchDecoder
+    from translator.scheduler import MicroBatchScheduler
+
+    # The step decoder runs the torch modules: INT8/ONNX backends are measured with micro-batches
+    if getattr(engine.model, "translation_backend", "torch") != "torch":
+        mode = "request"
+    saved = engine.num_beams, engine.cache
+    engine.num_beams, engine.cache = 1, None
+    server = ContinuousBatchDecoder(engine) if mode == "continuous" else MicroBatchScheduler(engine)
+    server.start()
+    server.translate(sentences[0], timeout=300)  # warm-up
+
+    rng = random.Random(seed)
+    arrivals, clock = [], 0.0
+    for _ in range(requests):
+        clock += rng.expovariate(rate)
+        arrivals.append(clock)
+    latencies = [None] * requests
+    done = threading.Event()
+    remaining = [requests]
+    lock = threading.Lock()
+
+    def finished(index, submitted):
+        def callback(future):
+            latencies[index] = time.perf_counter() - submitted
+            with lock:
+                remaining[0] -= 1
+                if not remaining[0]:
+                    done.set()
+        return callback
+
+    start = time.perf_counter()
+    for index, arrival in enumerate(arrivals):
+        delay = start + arrival - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        submitted = time.perf_counter()
+        server.submit(sentences[rng.randrange(len(sentences))]).add_done_callback(finished(index, submitted))
+    done.wait()
+    elapsed = time.perf_counter() - start
+    server.stop()
+    engine.num_beams, engine.cache = saved
+    return {
+        "mode": mode,
+        "requests": requests,
+        "arrival_rate": rate,
+        "requests_per_sec": round(requests / elapsed, 3),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+        },
+    }
+
+
+# ✅ Load one backend and run every configuration (executed in a child process)
+def run_backend(backend, settings):
+    from translator.engine import TranslationEngine
+    from translator.loader import load_translation_model
+
+    start = time.perf_counter()
+    model_kwargs = {"model_dir": settings["model"], "base_model": settings["model"],
+                    "packaged_dir": settings["model"]} if settings["model"] else {}
+    model, tokenizer, device, message = load_translation_model(backend=backend, **model_kwargs)
+    load_seconds = time.perf_counter() - start
+    engine = TranslationEngine(model, tokenizer, device, budget=None)
+    rss_after_load = peak_rss_mb()
+
+    results = []
+    for threads in settings["threads"]:
+        for num_beams in settings["num_beams"]:
+            for max_length in settings["max_length"]:
+                for batch_size in settings["batch_sizes"]:
+                    results.append(run_config(
+                        engine, settings["sentences"], batch_size, num_beams,
+                        max_length, threads, settings["rounds"],
+                    ))
+    report = {
+        "backend": backend,
+        "device": device,
+        "status": message,
+        "load_seconds": round(load_seconds, 3),
+        "rss_after_load_mb": rss_after_load,
+        "results": results,
+    }
+    if settings.get("traffic"):
+        report["traffic"] = [
+            run_traffic(engine, settings["sentences"], mode, settings["traffic"], settings["rate"])
+            for mode in ("request", "continuous")
+        ]
+    if settings.get("policies"):
+        report["policies"] = run_policies(engine, settings["sentences"], settings["policies"], settings["rounds"])
+    return report
+
+
+def environment_info():
+    import torch
+    import transformers
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+    }
+
+
+# ✅ Print p50 latency / throughput change against a previous JSON report
+def compare(previous, current):
+    def key(backend, row):
+        return (backend, row["batch_size"], row["num_beams"], row["max_length"], row["threads"])
+
+    old = {key(b["backend"], r): r for b in previous["backends"] for r in b["results"]}
+    for backend in current["backends"]:
+        for row in backend["results"]:
+            before = old.get(key(backend["backend"], row))
+            if before is None:
+                continue
+            p50 = (row["latency_ms"]["p50"] / before["latency_ms"]["p50"] - 1) * 100
+            tput = (row["sentences_per_sec"] / before["sentences_per_sec"] - 1) * 100
+            print(f"{backend['backend']:6} bs={row['batch_size']:<3} beams={row['num_beams']} "
+                  f"max_length={row['max_length']:<3} "
+                  f"threads={row['threads']:<2} p50 {p50:+6.1f}%  sentences/sec {tput:+6.1f}%")
+
+
+def int_list(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the translation model on a fixed Manglish corpus.")
+    parser.add_argument("--backends", default="torch", help="Comma-separated: torch,int8,onnx")
+    parser.add_argument("--batch-sizes", type=int_list, default=[1, 8])
+    parser.add_argument("--num-beams", type=int_list, default=[2])
+    parser.add_argument("--max-length", type=int_list, default=[30])
+    parser.add_argument("--threads", type=int_list, default=[os.cpu_count() or 1])
+    parser.add_argument("--model", help="Model directory or hub id (default: the loader's choice)")
+    parser.add_argument("--rounds", type=int, default=10, help="Timed generate calls per configuration")
+    parser.add_argument("--policies", default="", help="Compare generation budgets, e.g. fixed,adaptive")
+    parser.add_argument("--traffic", type=int, default=0,
+                        help="Simulate N Poisson arrivals: request-level vs continuous batching")
+    parser.add_argument("--rate", type=float, default=5.0, help="Arrival rate for --traffic (requests/sec)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    settings = {
+        "sentences": REFERENCE_SENTENCES,
+        "batch_sizes": args.batch_sizes,
+        "num_beams": args.num_beams,
+        "max_length": args.max_length,
+        "threads": args.threads,
+        "rounds": args.rounds,
+        "model": args.model,
+        "policies": [p for p in args.policies.split(",") if p],
+        "traffic": args.traffic,
+        "rate": args.rate,
+    }
+    report = {"environment": environment_info(), "settings": dict(settings, sentences=len(REFERENCE_SENTENCES)),
+              "backends": []}
+
+    ctx = multiprocessing.get_context("spawn")
+    for backend in [b for b in args.backends.split(",") if b]:
+        with ctx.Pool(1) as pool:
+            report["backends"].append(pool.apply(run_backend, (backend, settings)))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# bulk_translate.py
+# ✅ Offline bulk translation of text / CSV / JSONL files (no browser needed)
+#
+#   python bulk_translate.py chats.txt translated.jsonl
+#   python bulk_translate.py logs.jsonl out.jsonl --field body --batch-size 64
+#   python bulk_translate.py data.csv out.jsonl --column input_text --resume
+#
+# Input is streamed in chunks; the engine groups each chunk into token-length
+# buckets of --batch-size so batches carry little padding, and results are
+# appended to the output JSONL (one {"offset", "input", "output"} object per
+# line) in input order. With --resume
+# the run continues after the last offset already present in the output file.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+
+# ✅ Stream (offset, text) pairs from the input file
+# A malformed JSONL line, or a value that is not a string, is logged and
+# written as an empty row, so a resumed run never stops on the same record.
+def read_records(path, fmt=None, field="text", column="input_text", log=print):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            for offset, row in enumerate(csv.DictReader(f)):
+                yield offset, row.get(column) or ""
+        elif fmt == "jsonl":
+            for offset, line in enumerate(f):
+                line = line.strip()
+                try:
+                    value = json.loads(line).get(field) if line else ""
+                except (ValueError, AttributeError):
+                    log(f"⚠️ Record {offset} (line {offset + 1}): not a JSON object; skipped")
+                    value = ""
+                if not isinstance(value, str):
+                    if value is not None:
+                        log(f"⚠️ Record {offset}: {field!r} is {type(value).__name__}, not text; skipped")
+                    value = ""
+                yield offset, value
+        else:
+            for offset, line in enumerate(f):
+                yield offset, line.rstrip("\r\n")
+
+
+# ✅ Find where a previous run stopped; a half-written last line is dropped
+# and a complete last line missing its newline gets one, so appends start clean
+def last_completed_offset(output_path):
+    if not os.path.exists(output_path):
+        return -1
+    last_offset = -1
+    valid_bytes = 0
+    newline = True
+    with open(output_path, "rb") as f:
+        for line in f:
+            try:
+                last_offset = json.loads(line)["offset"]
+            except (ValueError, KeyError):
+                break
+            valid_bytes += len(line)
+            newline = line.endswith(b"\n")
+    with open(output_path, "r+b") as f:
+        f.truncate(valid_bytes)
+        if not newline:
+            f.seek(valid_bytes)
+            f.write(b"\n")
+    return last_offset
+
+
+# ✅ Translate one chunk in input order; the engine buckets it by token length
+# (translator/batching.py), so the chunk is tokenized once
+def translate_chunk(engine, records):
+    texts = [text.strip() for _, text in records]
+    pending = [i for i, text in enumerate(texts) if text]
+
+    outputs = [""] * len(texts)
+    if pending:
+        for index, translated in zip(pending, engine.translate_batch([texts[i] for i in pending])):
+            outputs[index] = translated
+    return outputs
+
+
+def run(engine, input_path, output_path, chunk_size=2048, resume=False,
+        fmt=None, field="text", column="input_text", log=print):
+    start_offset = last_completed_offset(output_path) + 1 if resume else 0
+    records = read_records(input_path, fmt=fmt, field=field, column=column, log=log)
+    records = islice(records, start_offset, None)
+
+    done = 0
+    started = time.perf_counter()
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as out:
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            for (offset, text), translated in zip(chunk, translate_chunk(engine, chunk)):
+                out.write(json.dumps({"offset": offset, "input": text, "output": translated}, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            done += len(chunk)
+            elapsed = time.perf_counter() - started
+            log(f"✅ {start_offset + done} records done ({done / elapsed:.1f} sentences/sec)")
+    stats = getattr(engine, "padding_stats", None)
+    if stats is not None and stats.padded_tokens:
+        padding = stats.as_dict()
+        log(f"✅ Padding efficiency {padding['padding_efficiency']:.1%}: {padding['real_tokens']} real of "
+            f"{padding['padded_tokens']} computed input tokens in {padding['batches']} batches")
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translate a text/CSV/JSONL file of Manglish sentences.")
+    parser.add_argument("input", help="Input file (.txt, .csv or .jsonl)")
+    parser.add_argument("output", help="Output JSONL file")
+    parser.add_argument("--format", choices=["txt", "csv", "jsonl"], help="Override format detection")
+    parser.add_argument("--field", default="text", help="JSONL field holding the text")
+    parser.add_argument("--column", default="input_text", help="CSV column holding the text")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--chunk-size", type=int, default=2048, help="Records read and bucketed at a time")
+    parser.add_argument("--resume", action="store_true", help="Continue after the last offset in the output")
+    args = parser.parse_args(argv)
+
+    from translator.engine import TranslationEngine
+    from translator.loader import load_translation_model
+
+    model, tokenizer, device, message = load_translation_model()
+    print(message)
+    engine = TranslationEngine(model, tokenizer, device, max_batch_size=args.batch_size)
+    run(engine, args.input, args.output, chunk_size=args.chunk_size,
+        resume=args.resume, fmt=args.format, field=args.field, column=args.column)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
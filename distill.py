@@ -0,0 +1,107 @@
+# distill.py
+# ✅ Distill the translator into a shallow-decoder student (CPU is fine)
+#
+#   python distill.py --corpus manglish.txt --output ./fine_tuned_nanot5_student
+#   python distill.py --corpus manglish.txt --decoder-layers 1 --epochs 5 --alpha 0.5
+#   TRANSLATION_MODEL_DIR=./fine_tuned_nanot5_student streamlit run Home.py
+#
+# 1. The teacher (packaged model if present, else fine_tuned_nanot5 / base)
+#    translates the --corpus sentences with the serving settings; the labels
+#    are saved to --labels and reused on the next run.
+# 2. A student with the teacher's encoder and --decoder-layers decoder layers
+#    is trained on them (translator/distillation.py).
+# 3. The student is written as a packaged directory (package_model.py), which
+#    load_translation_model() serves when TRANSLATION_MODEL_DIR points at it,
+#    and a quality/latency report against the teacher is printed for the
+#    --eval sentences (default: the reference corpus).
+import argparse
+import json
+import os
+import sys
+
+from package_model import default_source, load_source, read_lines, write_package
+from translator.fast_loader import PACKAGED_MODEL_DIR, is_packaged, load_packaged_model
+from translator.reference_corpus import REFERENCE_SENTENCES
+
+
+def load_labels(path, sources):
+    if not path or not os.path.isfile(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    if [row["source"] for row in rows] != sources:
+        return None  # corpus changed: label again
+    return [row["labels"] for row in rows]
+
+
+def save_labels(path, sources, labels):
+    with open(path, "w", encoding="utf-8") as f:
+        for source, row in zip(sources, labels):
+            f.write(json.dumps({"source": source, "labels": row}, ensure_ascii=False) + "\n")
+
+
+# ✅ Quality / latency of the student against the teacher (translator/parity.py)
+def distillation_report(teacher, student, tokenizer, sentences=REFERENCE_SENTENCES, min_match_rate=0.9):
+    from translator.engine import TranslationEngine
+    from translator.parity import verify_backend
+
+    report = verify_backend(TranslationEngine(teacher, tokenizer, "cpu"), TranslationEngine(student, tokenizer, "cpu"),
+                            sentences, min_match_rate)
+    report.pop("backend")
+    report["teacher_decoder_layers"] = teacher.config.num_decoder_layers
+    report["student_decoder_layers"] = student.config.num_decoder_layers
+    return report
+
+
+def main(argv=None):
+    from translator.distillation import default_decoder_layers, distill, make_student, pseudo_labels
+    from translator.engine import TranslationEngine
+
+    parser = argparse.ArgumentParser(description="Distill the translator into a shallow-decoder student.")
+    parser.add_argument("--source", default=None,
+                        help="Teacher: packaged directory, model directory or hub id (default: packaged model if present)")
+    parser.add_argument("--corpus", nargs="+", required=True, help="Source (Manglish) sentences, one per line")
+    parser.add_argument("--labels", default="distill_labels.jsonl", help="Teacher label cache (JSON lines)")
+    parser.add_argument("--eval", nargs="*", help="Sentences for the report (default: reference corpus)")
+    parser.add_argument("--output", default="./fine_tuned_nanot5_student")
+    parser.add_argument("--decoder-layers", type=int, choices=(1, 2), default=2)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--learning-rate", type=float, default=3e-4)
+    parser.add_argument("--alpha", type=float, default=0.0, help="Weight of the teacher's soft targets (0 = labels only)")
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--min-match-rate", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    source = args.source or (PACKAGED_MODEL_DIR if is_packaged(PACKAGED_MODEL_DIR) else default_source())
+    teacher, tokenizer = load_source(source)
+    engine = TranslationEngine(teacher, tokenizer, "cpu")
+    sources = read_lines(args.corpus)
+
+    labels = load_labels(args.labels, sources)
+    if labels is None:
+        print(f"Labelling {len(sources)} sentences with the teacher...")
+        labels = pseudo_labels(engine, sources, args.batch_size)
+        save_labels(args.labels, sources, labels)
+
+    layers = default_decoder_layers(teacher, args.decoder_layers)
+    student = make_student(teacher, layers)
+    history = distill(student, engine, sources, labels, teacher=teacher, epochs=args.epochs,
+                      batch_size=args.batch_size, learning_rate=args.learning_rate, alpha=args.alpha,
+                      temperature=args.temperature)
+
+    manifest = write_package(student, tokenizer, args.output, source=source, dtype="float32",
+                             teacher_decoder_layers=layers, corpus_sentences=len(sources), epochs=args.epochs,
+                             alpha=args.alpha, final_loss=round(history[-1], 4) if history else None)
+    print(f"✅ Student with decoder layers {layers} of {teacher.config.num_decoder_layers} written to "
+          f"{args.output} ({manifest['size_bytes'] / 2**20:.0f} MB)")
+
+    student, _, _ = load_packaged_model(args.output)
+    report = distillation_report(teacher, student, tokenizer, read_lines(args.eval) or REFERENCE_SENTENCES,
+                                 args.min_match_rate)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,41 @@
 # firebase/firebase_config.py
-import firebase_admin
-from firebase_admin import credentials, auth, firestore
-import streamlit as st
+# ✅ Firebase is initialized lazily, on first use, not on import.
+# get_db() returns the Firestore client; `firebase_auth` (and `db`) are still
+# importable from this module and trigger initialization when accessed.
+
 
 # ✅ Ensure Firebase is initialized only once
-if not firebase_admin._apps:
-    try:
-        # ✅ Convert Streamlit secrets to a dictionary
-        cred_dict = dict(st.secrets["FIREBASE_SERVICE_ACCOUNT"])
+def init_firebase():
+    import firebase_admin
+    from firebase_admin import credentials
+
+    if not firebase_admin._apps:
+        import streamlit as st
+        try:
+            # ✅ Convert Streamlit secrets to a dictionary
+            cred_dict = dict(st.secrets["FIREBASE_SERVICE_ACCOUNT"])
+
+            # ✅ Initialize Firebase Admin SDK
+            cred = credentials.Certificate(cred_dict)
+            firebase_admin.initialize_app(cred)
+
+        except Exception as e:
+            st.error(f"🔥 Firebase Initialization Error: {e}")
 
-        # ✅ Initialize Firebase Admin SDK
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
 
-        # ✅ Initialize Firestore client
-        db = firestore.client()
+# ✅ Firestore client
+def get_db():
+    from firebase_admin import firestore
+    init_firebase()
+    return firestore.client()
 
-    except Exception as e:
-        st.error(f"🔥 Firebase Initialization Error: {e}")
 
-# ✅ Export Firestore and Firebase authentication
-firebase_auth = auth
+# ✅ Export Firestore and Firebase authentication (resolved on first access)
+def __getattr__(name):
+    if name == "firebase_auth":
+        from firebase_admin import auth
+        init_firebase()
+        return auth
+    if name == "db":
+        return get_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,168 @@
+# firebase/firestore_writer.py
+import atexit
+import logging
+import queue
+import random
+import threading
+import time
+
+from translator.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_OPS = 500  # Firestore WriteBatch limit
+# Commit errors that mean the server did not apply the batch. Anything else
+# (DeadlineExceeded, ServiceUnavailable, dropped connections) may have been
+# applied before the error reached us.
+NOT_APPLIED_ERRORS = ("Aborted", "ResourceExhausted", "TooManyRequests")
+
+
+# Increment transforms add up when a write is applied twice; plain sets do not
+def _idempotent(data):
+    return not any(type(value).__name__ == "Increment" for value in data.values())
+
+
+# ✅ Background Firestore Writer
+# Saves are queued and a single thread coalesces them into WriteBatch commits
+# (up to 500 operations each), retrying failed commits with exponential
+# backoff. Writes queued together with enqueue_group() always share a batch.
+# After an error that may have been applied, only idempotent writes are
+# retried: Increment transforms are dropped and counted in `uncertain`
+# (repair_translation_counts.py recomputes the counters). Pending writes are
+# flushed on close() and at interpreter exit.
+class FirestoreBatchWriter:
+    def __init__(self, db, max_batch_ops=MAX_BATCH_OPS, flush_interval=0.25,
+                 max_retries=5, base_backoff=0.5, max_backoff=10.0):
+        self.db = db
+        self.max_batch_ops = max(1, min(int(max_batch_ops), MAX_BATCH_OPS))
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.commits = 0
+        self.written = 0
+        self.failed = 0
+        self.uncertain = 0
+        self._carry = None  # group that did not fit in the previous batch
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="firestore-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    # ✅ Queue a document write; the document id is fixed now so a retried
+    # commit overwrites instead of duplicating.
+    def enqueue_set(self, collection, data, document_id=None, merge=False):
+        return self.enqueue_group([(collection, data, document_id, merge)])[0]
+
+    def enqueue_add(self, collection, data):
+        return self.enqueue_set(collection, data)
+
+    # ✅ Queue writes that must commit together, e.g. a save and its counter
+    # increment: one (collection, data, document_id, merge) tuple per write
+    def enqueue_group(self, writes):
+        ops = []
+        for collection, data, document_id, merge in writes:
+            ref = self.db.collection(collection)
+            ref = ref.document(document_id) if document_id else ref.document()
+            ops.append((ref, data, merge))
+        if len(ops) > self.max_batch_ops:
+            raise ValueError(f"A write group cannot exceed {self.max_batch_ops} operations.")
+        self._queue.put(ops)
+        self.start()
+        return [ref.id for ref, _, _ in ops]
+
+    def pending(self):
+        return self._queue.unfinished_tasks
+
+    # ✅ Block until everything queued so far has been committed (or dropped)
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=30.0):
+        flushed = self.flush(timeout)
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        atexit.unregister(self.close)
+        return flushed
+
+    # Whole groups, up to max_batch_ops operations; a group that does not fit waits for the next batch
+    def _collect_groups(self):
+        if self._carry is not None:
+            first, self._carry = self._carry, None
+        else:
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                return []
+        groups, size = [first], len(first)
+        deadline = time.monotonic() + self.flush_interval
+        while size < self.max_batch_ops:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                group = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(group) > self.max_batch_ops:
+                self._carry = group
+                break
+            groups.append(group)
+            size += len(group)
+        return groups
+
+    def _commit(self, ops):
+        for attempt in range(self.max_retries + 1):
+            try:
+                batch = self.db.batch()
+                for ref, data, merge in ops:
+                    batch.set(ref, data, merge=merge)
+                with metrics.span("firestore_commit"):
+                    batch.commit()
+                self.commits += 1
+                self.written += len(ops)
+                return True
+            except Exception as e:
+                metrics.inc("firestore_commit_errors_total")
+                if attempt == self.max_retries:
+                    self.failed += len(ops)
+                    logger.error(f"Error saving {len(ops)} translations to Firestore: {e}")
+                    return False
+                if type(e).__name__ not in NOT_APPLIED_ERRORS:
+                    # Possibly applied: retrying an Increment could count it twice
+                    uncertain = [op for op in ops if not _idempotent(op[1])]
+                    if uncertain:
+                        ops = [op for op in ops if _idempotent(op[1])]
+                        self.uncertain += len(uncertain)
+                        metrics.inc("firestore_uncertain_writes_total", len(uncertain))
+                        logger.warning(f"{len(uncertain)} counter updates may not have been applied ({e}); "
+                                       f"run repair_translation_counts.py to recompute them")
+                        if not ops:
+                            return False
+                delay = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _run(self):
+        while not (self._stop_event.is_set() and self._queue.empty() and self._carry is None):
+            groups = self._collect_groups()
+            if not groups:
+                continue
+            try:
+                self._commit([op for group in groups for op in group])
+            finally:
+                for _ in groups:
+                    self._queue.task_done()
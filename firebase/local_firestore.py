@@ -0,0 +1,174 @@
+# firebase/local_firestore.py
+# ✅ In-memory stand-in for the small part of the Firestore client this app uses
+# (collection/document get, set with merge, delete, WriteBatch, equality
+# where(), order_by, select, start_after, limit, stream and count()).
+# Used by translation_service.py --local-firestore and by the tests, so the
+# real write path (FirestoreBatchWriter, counters) runs without credentials.
+import copy
+import itertools
+import threading
+from datetime import datetime, timezone
+
+_ids = itertools.count(1)
+
+
+def _resolve(value, current):
+    # firestore.Increment(n) and firestore.SERVER_TIMESTAMP are applied like the server would
+    kind = type(value).__name__
+    if kind == "Increment":
+        return (current if isinstance(current, (int, float)) else 0) + value.value
+    if kind == "Sentinel":
+        return datetime.now(timezone.utc)
+    return value
+
+
+class LocalSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return (self._data or {}).get(field)
+
+
+class LocalDocumentReference:
+    def __init__(self, db, collection, doc_id):
+        self._db = db
+        self._collection = collection
+        self.id = doc_id
+
+    def get(self):
+        with self._db.lock:
+            return LocalSnapshot(self.id, copy.deepcopy(self._db.data[self._collection].get(self.id)))
+
+    def set(self, data, merge=False):
+        with self._db.lock:
+            docs = self._db.data[self._collection]
+            current = dict(docs.get(self.id) or {}) if merge else {}
+            for field, value in data.items():
+                current[field] = _resolve(value, current.get(field))
+            docs[self.id] = current
+
+    def delete(self):
+        with self._db.lock:
+            self._db.data[self._collection].pop(self.id, None)
+
+
+class LocalCountResult:
+    def __init__(self, value):
+        self.value = value
+
+
+class LocalQuery:
+    def __init__(self, db, collection, filters=(), order=None, fields=None, after=None, limit=None):
+        self._db = db
+        self._collection = collection
+        self._filters = list(filters)
+        self._order = order
+        self._fields = fields
+        self._after = after
+        self._limit = limit
+
+    def _copy(self, **changes):
+        state = dict(filters=self._filters, order=self._order, fields=self._fields,
+                     after=self._after, limit=self._limit)
+        state.update(changes)
+        return LocalQuery(self._db, self._collection, **state)
+
+    def where(self, field, op, value):
+        if op != "==":
+            raise NotImplementedError("LocalFirestore only supports '==' filters")
+        return self._copy(filters=self._filters + [(field, value)])
+
+    def order_by(self, field, direction="ASCENDING"):
+        return self._copy(order=(field, str(direction).upper().endswith("DESCENDING")))
+
+    def select(self, fields):
+        return self._copy(fields=list(fields))
+
+    def start_after(self, snapshot):
+        return self._copy(after=snapshot.id)
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def _snapshots(self):
+        with self._db.lock:
+            docs = [(doc_id, copy.deepcopy(data)) for doc_id, data in self._db.data[self._collection].items()]
+        docs = [(i, d) for i, d in docs if all(d.get(f) == v for f, v in self._filters)]
+        if self._order:
+            field, descending = self._order
+            docs.sort(key=lambda item: (item[1].get(field) is None, item[1].get(field)), reverse=descending)
+        if self._after is not None:
+            ids = [doc_id for doc_id, _ in docs]
+            docs = docs[ids.index(self._after) + 1:] if self._after in ids else []
+        if self._limit is not None:
+            docs = docs[:self._limit]
+        if self._fields is not None:
+            docs = [(i, {f: d[f] for f in self._fields if f in d}) for i, d in docs]
+        return [LocalSnapshot(doc_id, data) for doc_id, data in docs]
+
+    def stream(self):
+        return iter(self._snapshots())
+
+    def get(self):
+        return self._snapshots()
+
+    def count(self):
+        query = self
+
+        class _Aggregation:
+            def get(self):
+                return [[LocalCountResult(len(query._snapshots()))]]
+
+        return _Aggregation()
+
+
+class LocalCollectionReference(LocalQuery):
+    def document(self, doc_id=None):
+        return LocalDocumentReference(self._db, self._collection, doc_id or f"local-{next(_ids)}")
+
+    def add(self, data):
+        ref = self.document()
+        ref.set(data)
+        return None, ref
+
+
+class LocalWriteBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append(("set", ref, data, merge))
+
+    def delete(self, ref):
+        self._ops.append(("delete", ref, None, False))
+
+    def commit(self):
+        with self._db.lock:
+            self._db.commits += 1
+            for kind, ref, data, merge in self._ops:
+                if kind == "set":
+                    ref.set(data, merge=merge)
+                else:
+                    ref.delete()
+
+
+class LocalFirestore:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.data = {}
+        self.commits = 0
+
+    def collection(self, name):
+        with self.lock:
+            self.data.setdefault(name, {})
+        return LocalCollectionReference(self, name)
+
+    def batch(self):
+        return LocalWriteBatch(self)
@@ -0,0 +1,75 @@
+# firebase/saved_translations.py
+PAGE_SIZE = 20
+PROJECTED_FIELDS = ["input_text", "output_text", "timestamp"]  # timestamp is needed for the cursor
+
+
+# ✅ Fetch one page of a user's saved translations, newest first
+# Uses limit + start_after cursors and a field projection so only the
+# displayed fields are transferred. Returns (rows, last_snapshot, has_more).
+# Note: Firestore needs a composite index on (user, timestamp desc) for this query.
+def fetch_translations_page(db, user, page_size=PAGE_SIZE, start_after=None):
+    query = (
+        db.collection("translations")
+        .where("user", "==", user)
+        .order_by("timestamp", direction="DESCENDING")
+        .select(PROJECTED_FIELDS)
+    )
+    if start_after is not None:
+        query = query.start_after(start_after)
+    docs = list(query.limit(page_size + 1).stream())
+
+    has_more = len(docs) > page_size
+    docs = docs[:page_size]
+    rows = []
+    for doc in docs:
+        data = doc.to_dict() or {}
+        rows.append({
+            "id": doc.id,  # Keep this for deletion purposes but don't display it
+            "Input Text": data.get("input_text", ""),
+            "Output Text": data.get("output_text", "")
+        })
+    return rows, (docs[-1] if docs else None), has_more
+
+
+# ✅ Per-session page cache
+# Kept in st.session_state so Streamlit reruns reuse pages already fetched
+# instead of streaming the whole collection again.
+class SavedTranslationsPager:
+    def __init__(self, db, user, page_size=PAGE_SIZE):
+        self.db = db
+        self.user = user
+        self.page_size = page_size
+        self.pages = []
+        self.cursors = []
+        self.has_more = True
+
+    def _fetch_next(self):
+        cursor = self.cursors[-1] if self.cursors else None
+        rows, last_doc, has_more = fetch_translations_page(self.db, self.user, self.page_size, cursor)
+        if rows:
+            self.pages.append(rows)
+            self.cursors.append(last_doc)
+        self.has_more = has_more and bool(rows)
+
+    def get_page(self, index):
+        while len(self.pages) <= index and self.has_more:
+            self._fetch_next()
+        return self.pages[index] if index < len(self.pages) else []
+
+    def has_next(self, index):
+        return index + 1 < len(self.pages) or (index + 1 == len(self.pages) and self.has_more)
+
+    # ✅ Drop a deleted row locally; later cursors stay valid.
+    # A page left empty is refetched from the start instead.
+    def remove(self, doc_id):
+        for rows in self.pages:
+            for row in rows:
+                if row["id"] == doc_id:
+                    rows.remove(row)
+                    if not rows:
+                        self.reset()
+                    return True
+        return False
+
+    def reset(self):
+        self.pages, self.cursors, self.has_more = [], [], True
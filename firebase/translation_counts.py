@@ -0,0 +1,98 @@
+# firebase/translation_counts.py
+from collections import Counter
+
+# ✅ Per-user translation counter
+# Stored as "translation_count" on users/{email}, the same document the
+# Account page already reads for the profile picture, so showing the total
+# costs no extra reads. Saves and deletes keep it up to date with atomic
+# increments; recompute_translation_counts() repairs any drift offline.
+USERS_COLLECTION = "users"
+COUNT_FIELD = "translation_count"
+
+
+def counter_update(delta):
+    from firebase_admin import firestore
+    return {COUNT_FIELD: firestore.Increment(delta)}
+
+
+def counter_ref(db, user):
+    return db.collection(USERS_COLLECTION).document(user)
+
+
+# ✅ A saved translation and its counter increment, for FirestoreBatchWriter.enqueue_group()
+# so both are committed in the same batch
+def save_writes(user, translation):
+    return [
+        ("translations", translation, None, False),
+        (USERS_COLLECTION, counter_update(1), user, True),
+    ]
+
+
+# ✅ Delete a saved translation and decrement the owner's counter in one batch.
+# The document is read first: deleting one that is already gone (a second
+# click) or that belongs to someone else must not touch the counter.
+def delete_translation(db, user, doc_id):
+    ref = db.collection("translations").document(doc_id)
+    snapshot = ref.get()
+    if not snapshot.exists or (snapshot.to_dict() or {}).get("user") != user:
+        return False
+    batch = db.batch()
+    batch.delete(ref)
+    batch.set(counter_ref(db, user), counter_update(-1), merge=True)
+    batch.commit()
+    return True
+
+
+# ✅ Count with a Firestore aggregation query (no documents transferred)
+def count_translations(db, user):
+    query = db.collection("translations").where("user", "==", user)
+    if hasattr(query, "count"):
+        result = query.count().get()
+        return int(result[0][0].value)
+    return sum(1 for _ in query.select([]).stream())
+
+
+# ✅ Read the maintained counter; users created before the counter existed
+# are counted once with an aggregation query and the result is stored.
+def get_translation_count(db, user, user_data=None):
+    if user_data is None:
+        snapshot = counter_ref(db, user).get()
+        user_data = snapshot.to_dict() if snapshot.exists else {}
+    count = (user_data or {}).get(COUNT_FIELD)
+    if isinstance(count, int):
+        return max(count, 0)
+    count = count_translations(db, user)
+    counter_ref(db, user).set({COUNT_FIELD: count}, merge=True)
+    return count
+
+
+# ✅ Call before a user's first counter increment (once per session): the
+# merged Increment would otherwise create a legacy user's missing counter at
+# 1, and get_translation_count() would then never backfill the real total.
+def ensure_translation_count(db, user):
+    return get_translation_count(db, user)
+
+
+# ✅ Consistency repair: recompute every user's counter from the translations
+# collection (reading only the "user" field) and overwrite the stored values.
+def recompute_translation_counts(db, batch_size=500):
+    counts = Counter()
+    for doc in db.collection("translations").select(["user"]).stream():
+        user = (doc.to_dict() or {}).get("user")
+        if user:
+            counts[user] += 1
+
+    # Users whose translations were all deleted go back to zero
+    for doc in db.collection(USERS_COLLECTION).select([COUNT_FIELD]).stream():
+        counts.setdefault(doc.id, 0)
+
+    batch, pending = db.batch(), 0
+    for user, count in counts.items():
+        batch.set(counter_ref(db, user), {COUNT_FIELD: count}, merge=True)
+        pending += 1
+        if pending == batch_size:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    return dict(counts)
@@ -0,0 +1,148 @@
+# package_model.py
+# ✅ Package the translator into a self-contained, offline model directory
+#
+#   python package_model.py --output ./fine_tuned_nanot5_packaged
+#   python package_model.py --output ./fine_tuned_nanot5_packaged --report   # startup timing report
+#
+# The directory holds config, generation config, tokenizer, a single
+# model.safetensors and package.json (source, checksum, dtype). When it exists,
+# load_translation_model() memory-maps it with translator/fast_loader.py
+# instead of downloading the base model, so cold starts need no network.
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from translator.fast_loader import (
+    MANIFEST_NAME,
+    PACKAGED_MODEL_DIR,
+    WEIGHTS_NAME,
+    file_sha256,
+    format_timings,
+    is_packaged,
+    load_packaged_model,
+)
+from translator.loader import BASE_MODEL_NAME, FINE_TUNED_MODEL_DIR, enable_kv_cache
+
+DTYPES = ("float32", "bfloat16", "float16")
+
+
+def has_weights(model_dir):
+    return os.path.isdir(model_dir) and any(
+        name.endswith((".safetensors", ".bin")) for name in os.listdir(model_dir)
+    )
+
+
+# ✅ Fine-tuned weights when they are on disk, otherwise the base model
+def default_source():
+    return FINE_TUNED_MODEL_DIR if has_weights(FINE_TUNED_MODEL_DIR) else BASE_MODEL_NAME
+
+
+# ✅ Shared by the model tools (prune_vocab.py, distill.py)
+def read_lines(paths):
+    lines = []
+    for path in paths or []:
+        with open(path, encoding="utf-8") as f:
+            lines.extend(line.strip() for line in f if line.strip())
+    return lines
+
+
+# Packaged directory, model directory or hub id -> (model, tokenizer)
+def load_source(source):
+    from transformers import AutoTokenizer, T5ForConditionalGeneration
+    if is_packaged(source):
+        model, tokenizer, _ = load_packaged_model(source)
+        return model, tokenizer
+    model = T5ForConditionalGeneration.from_pretrained(source).eval()
+    enable_kv_cache(model)
+    return model, AutoTokenizer.from_pretrained(source)
+
+
+def package(source, output, tokenizer_source=None, dtype="float32"):
+    import torch
+    from transformers import AutoTokenizer, T5ForConditionalGeneration
+
+    model = T5ForConditionalGeneration.from_pretrained(source)
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_source or source)
+    if dtype != "float32":
+        model = model.to(getattr(torch, dtype))
+    model.eval()
+    enable_kv_cache(model)
+    return write_package(model, tokenizer, output, source=source, tokenizer_source=tokenizer_source or source,
+                         dtype=dtype)
+
+
+# ✅ Save a loaded model + tokenizer as a packaged directory; `details` go into package.json
+def write_package(model, tokenizer, output, **details):
+    os.makedirs(output, exist_ok=True)
+    # One shard, so the loader maps a single file
+    model.save_pretrained(output, safe_serialization=True, max_shard_size="100GB")
+    tokenizer.save_pretrained(output)
+
+    weights_path = os.path.join(output, WEIGHTS_NAME)
+    manifest = dict(
+        details,
+        weights=WEIGHTS_NAME,
+        sha256=file_sha256(weights_path),
+        size_bytes=os.path.getsize(weights_path),
+        created=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    )
+    with open(os.path.join(output, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def time_mmap_load(model_dir):
+    start = time.perf_counter()
+    _, _, timings = load_packaged_model(model_dir)
+    timings["with_imports"] = round(time.perf_counter() - start, 4)
+    return timings
+
+
+def time_from_pretrained(model_dir):
+    start = time.perf_counter()
+    from transformers import AutoTokenizer, T5ForConditionalGeneration
+    loaded = time.perf_counter()
+    AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+    T5ForConditionalGeneration.from_pretrained(model_dir, local_files_only=True)
+    end = time.perf_counter()
+    return {"with_imports": round(end - start, 4), "total": round(end - loaded, 4)}
+
+
+# ✅ Compare the mmap loader with a regular from_pretrained on the same directory
+# Each loader runs in a fresh process so both pay the same cold-start costs.
+def startup_report(model_dir):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        timings = pool.apply(time_mmap_load, (model_dir,))
+    with ctx.Pool(1) as pool:
+        baseline = pool.apply(time_from_pretrained, (model_dir,))
+    return {"mmap_loader": timings, "from_pretrained": baseline}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Package the translator as an offline safetensors directory.")
+    parser.add_argument("--source", default=None, help="Model directory or hub id (default: fine-tuned if present, else base)")
+    parser.add_argument("--tokenizer", default=None, help="Tokenizer directory or hub id (default: --source)")
+    parser.add_argument("--output", default=PACKAGED_MODEL_DIR)
+    parser.add_argument("--dtype", choices=DTYPES, default="float32")
+    parser.add_argument("--report", action="store_true", help="Only print the startup timing report for --output")
+    args = parser.parse_args(argv)
+
+    if not args.report:
+        source = args.source or default_source()
+        manifest = package(source, args.output, args.tokenizer, args.dtype)
+        print(f"✅ Packaged {manifest['source']} into {args.output} ({manifest['size_bytes'] / 2**20:.0f} MB)")
+
+    report = startup_report(args.output)
+    timings = report["mmap_loader"]
+    print(f"mmap loader: {timings['with_imports']:.2f}s cold, {format_timings(timings)} after imports")
+    baseline = report["from_pretrained"]
+    print(f"from_pretrained: {baseline['with_imports']:.2f}s cold, {baseline['total']:.2f}s after imports")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
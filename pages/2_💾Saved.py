@@ -6,6 +6,8 @@ import streamlit as st
 import os
 import re
 from firebase.firebase_config import firebase_auth  # Import Firebase Authentication
+from firebase.saved_translations import SavedTranslationsPager
+from firebase.translation_counts import delete_translation
 from firebase_admin import firestore
 
 # ✅ Ensure Firestore client is obtained within the file
@@ -38,19 +40,21 @@ if "user" not in st.session_state or not st.session_state["user"]:
     st.warning("⚠️ Please log in to view and manage saved translations.")
     st.stop()
 
-# ✅ Fetch Translations for Logged-in User
+# ✅ Fetch Translations for Logged-in User (paginated, cached per session)
 try:
-    # Fetch translations for the logged-in user
-    translations_ref = db.collection("translations").where("user", "==", st.session_state["user"]).stream()
-    translations = []
+    pager = st.session_state.get("saved_pager")
+    if pager is None or pager.user != st.session_state["user"]:
+        pager = SavedTranslationsPager(db, st.session_state["user"])
+        st.session_state["saved_pager"] = pager
+        st.session_state["saved_page_index"] = 0
 
-    for doc in translations_ref:
-        data = doc.to_dict()
-        translations.append({
-            "id": doc.id,  # Keep this for deletion purposes but don't display it
-            "Input Text": data.get("input_text", ""),
-            "Output Text": data.get("output_text", "")
-        })
+    page_index = st.session_state.get("saved_page_index", 0)
+    translations = pager.get_page(page_index)
+    # Step back when deletions emptied the last page
+    while not translations and page_index > 0:
+        page_index -= 1
+        translations = pager.get_page(page_index)
+    st.session_state["saved_page_index"] = page_index
 
     # ✅ Display Translations in a Table with a Delete Button Next to Each Row
     if translations:
@@ -69,7 +73,8 @@ try:
                 # ✅ Delete Button (Row-Wise)
                 if st.button(f"❌ Delete", key=f"delete_{translation['id']}"):
                     try:
-                        db.collection("translations").document(translation['id']).delete()
+                        delete_translation(db, st.session_state["user"], translation['id'])
+                        pager.remove(translation['id'])
                         st.success("✅ Translation successfully deleted!")
                         st.rerun()
                     except Exception as e:
@@ -77,8 +82,26 @@ try:
 
             st.markdown("---")
 
+        # ✅ Pagination Controls
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Previous", disabled=page_index == 0):
+                st.session_state["saved_page_index"] = page_index - 1
+                st.rerun()
+        with col2:
+            st.markdown(f"Page {page_index + 1}")
+        with col3:
+            if st.button("Next ➡️", disabled=not pager.has_next(page_index)):
+                st.session_state["saved_page_index"] = page_index + 1
+                st.rerun()
+
     else:
         st.info("No saved translations found.")
 
+    if st.button("🔄 Refresh"):
+        pager.reset()
+        st.session_state["saved_page_index"] = 0
+        st.rerun()
+
 except Exception as e:
     st.error(f"❌ Error loading saved translations: {e}")
\ No newline at end of file
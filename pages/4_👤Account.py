@@ -2,6 +2,7 @@ import streamlit as st
 import os
 import re
 from firebase.firebase_config import firebase_auth  # Import Firebase Authentication
+from firebase.translation_counts import get_translation_count
 import streamlit as st
 import firebase_admin
 from firebase_admin import auth, firestore, credentials
@@ -105,19 +106,15 @@ elif st.session_state["account_page"] == "profile":
     user_doc_ref = db.collection("users").document(user_email)
     user_doc = user_doc_ref.get()
 
-    if user_doc.exists:
-        user_data = user_doc.to_dict()
-        profile_pic_url = user_data.get("profile_pic_url", "https://www.w3schools.com/w3images/avatar2.png")
-    else:
-        profile_pic_url = "https://www.w3schools.com/w3images/avatar2.png"
+    user_data = user_doc.to_dict() if user_doc.exists else {}
+    profile_pic_url = user_data.get("profile_pic_url", "https://www.w3schools.com/w3images/avatar2.png")
 
     # ✅ Display user profile
     st.image(profile_pic_url, width=150)
     st.markdown(f"📧 **Email:** {user_email}")
 
-    # ✅ Fetch and display total translations
-    translations_ref = db.collection("translations").where("user", "==", user_email).stream()
-    translation_count = sum(1 for _ in translations_ref)
+    # ✅ Display total translations from the maintained counter (no collection scan)
+    translation_count = get_translation_count(db, user_email, user_data)
     st.markdown(f"📄 **Total Translations:** {translation_count}")
 
     # ✅ Logout Button
@@ -0,0 +1,76 @@
+# prune_vocab.py
+# ✅ Prune the translator's output vocabulary to the tokens a corpus needs
+#
+#   python prune_vocab.py --corpus manglish.txt --output ./fine_tuned_nanot5_pruned
+#   python prune_vocab.py --corpus manglish.txt --targets english.txt --eval held_out.txt
+#   TRANSLATION_MODEL_DIR=./fine_tuned_nanot5_pruned streamlit run Home.py
+#
+# The active vocabulary is every token the full model generates for the
+# --corpus sentences (serving beam settings and greedy, as used by streaming),
+# plus the tokens of any --targets reference translations and the special
+# tokens. The pruned model is written as a packaged directory (see
+# package_model.py), and a quality/latency report against the full model is
+# printed for the --eval sentences (default: the reference corpus).
+import argparse
+import copy
+import json
+import sys
+
+from package_model import default_source, load_source, read_lines, write_package
+from translator.fast_loader import PACKAGED_MODEL_DIR, is_packaged, load_packaged_model
+from translator.reference_corpus import REFERENCE_SENTENCES
+
+
+def prune(model, tokenizer, sources, targets=()):
+    from translator.engine import TranslationEngine
+    from translator.vocab_pruning import active_vocabulary, generated_token_ids, prune_lm_head
+
+    engine = TranslationEngine(model, tokenizer, "cpu")
+    generated = generated_token_ids(engine, sources) | generated_token_ids(engine, sources, num_beams=1)
+    vocab_ids = active_vocabulary(model, tokenizer, targets, generated)
+    return prune_lm_head(copy.deepcopy(model), vocab_ids)
+
+
+# ✅ Quality / latency of the pruned model against the full one (translator/parity.py)
+def pruning_report(model, pruned_model, tokenizer, sentences=REFERENCE_SENTENCES, min_match_rate=0.9):
+    from translator.engine import TranslationEngine
+    from translator.parity import verify_backend
+
+    reference = TranslationEngine(model, tokenizer, "cpu")
+    candidate = TranslationEngine(pruned_model, tokenizer, "cpu")
+    report = verify_backend(reference, candidate, sentences, min_match_rate)
+    report["vocab_size"] = model.config.vocab_size
+    report["pruned_vocab_size"] = pruned_model.config.pruned_vocab_size
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prune the lm_head to the output vocabulary of a corpus.")
+    parser.add_argument("--source", default=None,
+                        help="Packaged directory, model directory or hub id (default: packaged model if present)")
+    parser.add_argument("--corpus", nargs="+", required=True, help="Source (Manglish) sentences, one per line")
+    parser.add_argument("--targets", nargs="*", help="Reference translations, one per line")
+    parser.add_argument("--eval", nargs="*", help="Sentences for the report (default: reference corpus)")
+    parser.add_argument("--output", default="./fine_tuned_nanot5_pruned")
+    parser.add_argument("--min-match-rate", type=float, default=0.9)
+    args = parser.parse_args(argv)
+
+    source = args.source or (PACKAGED_MODEL_DIR if is_packaged(PACKAGED_MODEL_DIR) else default_source())
+    model, tokenizer = load_source(source)
+    sources = read_lines(args.corpus)
+    pruned = prune(model, tokenizer, sources, read_lines(args.targets))
+    manifest = write_package(pruned, tokenizer, args.output, source=source, dtype=str(model.dtype).split(".")[-1],
+                             pruned_vocab_size=pruned.config.pruned_vocab_size, corpus_sentences=len(sources))
+    print(f"✅ Kept {manifest['pruned_vocab_size']} of {model.config.vocab_size} output tokens; "
+          f"wrote {args.output} ({manifest['size_bytes'] / 2**20:.0f} MB)")
+
+    pruned_model, _, _ = load_packaged_model(args.output)
+    report = pruning_report(model, pruned_model, tokenizer, read_lines(args.eval) or REFERENCE_SENTENCES,
+                            args.min_match_rate)
+    report.pop("backend")
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
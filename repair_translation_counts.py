@@ -0,0 +1,29 @@
+# repair_translation_counts.py
+# ✅ Offline consistency repair for the per-user translation counters
+#   python repair_translation_counts.py
+# Reads FIREBASE_KEY_PATH from .env, recomputes every user's
+# "translation_count" from the translations collection and overwrites it.
+import os
+import sys
+
+import firebase_admin
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore
+
+from firebase.translation_counts import recompute_translation_counts
+
+
+def main():
+    load_dotenv()
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(os.getenv("FIREBASE_KEY_PATH"))
+        firebase_admin.initialize_app(cred)
+    db = firestore.client()
+
+    counts = recompute_translation_counts(db)
+    print(f"✅ Repaired translation counts for {len(counts)} users")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,32 @@
 import pytest
-from Home import load_model
 
 @pytest.fixture(scope="module")
 def load_translation_model():
+    from Home import load_model
     model, tokenizer, device, success_message = load_model()
     return model, tokenizer, device
+
+
+# In-memory Firestore (firebase/local_firestore.py) for the firebase/ tests
+@pytest.fixture
+def local_firestore():
+    from firebase.local_firestore import LocalFirestore
+    return LocalFirestore()
+
+
+# Tiny random T5 for the translator/ tests; EOS is made likely so sequences
+# finish at different steps. Call it again for a fresh model.
+@pytest.fixture
+def tiny_t5():
+    def make(seed=0, tie_word_embeddings=False, num_decoder_layers=2, eos_boost=5):
+        import torch
+        from transformers import T5Config, T5ForConditionalGeneration
+        torch.manual_seed(seed)
+        config = T5Config(vocab_size=32100, d_model=32, d_kv=8, d_ff=64, num_layers=2,
+                          num_decoder_layers=num_decoder_layers, num_heads=4, feed_forward_proj="gated-gelu",
+                          decoder_start_token_id=0, eos_token_id=1, pad_token_id=0,
+                          tie_word_embeddings=tie_word_embeddings)
+        model = T5ForConditionalGeneration(config).eval()
+        model.lm_head.weight.data[1] *= eos_boost
+        return model
+    return make
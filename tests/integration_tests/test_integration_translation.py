@@ -1,5 +1,5 @@
 import pytest
-from Home import load_model, save_translation_to_firestore
+from Home import load_model, save_translation_to_firestore, get_firestore_writer
 import firebase_admin
 from firebase_admin import auth, credentials, firestore
 import os
@@ -46,6 +46,7 @@ def test_translation_and_saving(firebase_setup):
 
     success = save_translation_to_firestore(test_input_text, test_output_text)
     assert success == True
+    assert get_firestore_writer().flush(timeout=30)  # ✅ Saves are committed in the background
 
     # ✅ Verify the data was saved correctly in Firebase
     translations = db.collection("translations").where("user", "==", "test_user@gmail.com").get()
@@ -82,6 +83,7 @@ def test_full_translation_flow(firebase_setup):
     # ✅ Save the translation
     success = save_translation_to_firestore(test_input_text, translated_text)
     assert success == True
+    assert get_firestore_writer().flush(timeout=30)
 
     # ✅ Verify the saved translation
     translations = db.collection("translations").where("user", "==", "test_user@gmail.com").get()
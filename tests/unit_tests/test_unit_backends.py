@@ -0,0 +1,66 @@
+import os
+import pytest
+import torch
+from transformers import AutoTokenizer
+from package_model import write_package
+from translator.backends import ONNX_SOURCE_FILE, apply_backend, load_onnx_model, onnx_source
+from translator.fast_loader import load_packaged_model
+from translator.vocab_pruning import prune_lm_head
+from translator.engine import TranslationEngine
+from translator.parity import verify_backend
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5")
+INPUTS = ["Saya lapar.", "Aku nak gi shopping.", "Jom.", "Dia tanya pasal apa?"]
+
+
+# ✅ TC-066: INT8 backend is tagged, keyed separately in the cache and checked for parity
+def test_int8_backend_parity(tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    reference = TranslationEngine(tiny_t5(), tokenizer, max_length=12)
+    model, note = apply_backend(tiny_t5(), "cpu", "int8")
+    candidate = TranslationEngine(model, tokenizer, max_length=12)
+    assert "INT8" in note and model.translation_backend == "int8"
+    assert isinstance(model.lm_head, torch.ao.nn.quantized.dynamic.Linear)
+    assert candidate.model_revision()[-1] == "int8" and reference.model_revision()[-1] == "torch"
+
+    report = verify_backend(reference, candidate, INPUTS, min_match_rate=0.0)
+    assert report["backend"] == "int8" and report["passed"]
+    assert len(report["sentences"]) == len(INPUTS)
+    assert 0.0 <= report["token_match_rate"] <= 1.0
+
+    # GPU models keep the torch backend
+    model, note = apply_backend(tiny_t5(), "cuda", "int8")
+    assert model.translation_backend == "torch" and "CPU-only" in note
+
+
+# ✅ TC-067: The ONNX export is reused only while the source weights are unchanged
+def test_onnx_export_follows_source(tmp_path, tiny_t5):
+    pytest.importorskip("optimum.onnxruntime")
+    source, onnx_dir = str(tmp_path / "model"), str(tmp_path / "onnx")
+    tiny_t5().save_pretrained(source)
+    load_onnx_model(source, onnx_dir)
+    exported = os.path.join(onnx_dir, "encoder_model.onnx")
+    assert os.path.exists(os.path.join(onnx_dir, ONNX_SOURCE_FILE))
+
+    first = os.stat(exported).st_mtime_ns
+    load_onnx_model(source, onnx_dir)
+    assert os.stat(exported).st_mtime_ns == first
+
+    tiny_t5().save_pretrained(source)  # new weights at the same path
+    load_onnx_model(source, onnx_dir)
+    assert os.stat(exported).st_mtime_ns != first
+
+
+# ✅ TC-073: A packaged model is exported from its own directory; a pruned one is refused
+def test_onnx_source_for_packaged_models(tmp_path, tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    output = str(tmp_path / "packaged")
+    manifest = write_package(tiny_t5(), tokenizer, output)
+    model, _, _ = load_packaged_model(output)
+    assert onnx_source(model) == (output, manifest["sha256"])
+
+    pruned_dir = str(tmp_path / "pruned")
+    write_package(prune_lm_head(tiny_t5(), list(range(200))), tokenizer, pruned_dir)
+    pruned, _, _ = load_packaged_model(pruned_dir)
+    with pytest.raises(ValueError, match="pruned output vocabulary"):
+        apply_backend(pruned, "cpu", "onnx")
@@ -0,0 +1,28 @@
+from translator.batching import PaddingStats, bucket_by_length, padded_length, reorder
+
+
+# ✅ TC-021: Lengths are padded up to the stride
+def test_padded_length():
+    assert padded_length(1, 8) == 8
+    assert padded_length(8, 8) == 8
+    assert padded_length(9, 8) == 16
+
+
+# ✅ TC-022: Buckets never mix padded lengths and respect the batch size
+def test_bucket_by_length():
+    lengths = [5, 20, 7, 3, 18, 6]
+    batches = bucket_by_length(lengths, max_batch_size=2, stride=8)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 2
+        assert len({padded_length(lengths[i], 8) for i in batch}) == 1
+
+
+# ✅ TC-023: Results are restored to input order and padding is reported
+def test_reorder_and_padding_stats():
+    batches = [[1, 3], [0, 2]]
+    assert reorder(batches, [["b", "d"], ["a", "c"]], 4) == ["a", "b", "c", "d"]
+
+    stats = PaddingStats()
+    stats.record([6, 8], padded_to=8)
+    assert stats.as_dict()["padding_efficiency"] == 0.875
@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+import torch
+import benchmark
+from translator.engine import TranslationEngine
+
+
+# ✅ TC-031: Percentiles interpolate between samples
+def test_percentile():
+    values = [0.1, 0.2, 0.3, 0.4, 0.5]
+    assert benchmark.percentile(values, 50) == 0.3
+    assert abs(benchmark.percentile(values, 95) - 0.48) < 1e-9
+    assert benchmark.percentile([], 50) is None
+
+
+# ✅ TC-032: Only generated tokens are counted (no start token, no padding)
+def test_count_generated_tokens():
+    engine = TranslationEngine(model=SimpleNamespace(config=SimpleNamespace(pad_token_id=0)), tokenizer=None)
+    engine._count_generated(torch.tensor([[0, 11, 12, 1, 0, 0], [0, 21, 22, 23, 24, 25]]))
+    assert engine.generated_tokens == 3 + 5
+
+
+# ✅ TC-033: Batches cycle through the fixed corpus
+def test_make_batches():
+    batches = benchmark.make_batches(["a", "b", "c"], batch_size=2, rounds=3)
+    assert batches == [["a", "b"], ["c", "a"], ["b", "c"]]
@@ -0,0 +1,62 @@
+import os
+from transformers import AutoTokenizer
+from translator.cache import TranslationCache, make_cache_key, normalize_input
+from translator.engine import TranslationEngine
+
+
+# ✅ TC-015: Normalization ignores spacing and missing punctuation
+def test_cache_key_normalization():
+    settings = {"max_length": 30, "num_beams": 2}
+    assert normalize_input("  Aku nak   gi shopping ") == "Aku nak gi shopping."
+    assert make_cache_key("Aku nak gi shopping", "p: ", settings, "rev") == \
+        make_cache_key("Aku nak gi shopping.", "p: ", settings, "rev")
+    assert make_cache_key("Aku nak gi shopping.", "p: ", settings, "rev") != \
+        make_cache_key("Aku nak gi shopping.", "p: ", dict(settings, num_beams=4), "rev")
+
+
+# ✅ TC-016: LRU eviction and hit/miss counters
+def test_cache_lru_eviction():
+    cache = TranslationCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1 and stats["entries"] == 2
+
+
+# ✅ TC-017: SQLite tier survives a restart
+def test_cache_persists_to_disk(tmp_path):
+    db_path = str(tmp_path / "translations.sqlite")
+    cache = TranslationCache(max_entries=4, db_path=db_path)
+    cache.put("key", "I want to go shopping.")
+    cache.close()
+
+    reopened = TranslationCache(max_entries=4, db_path=db_path)
+    assert reopened.get("key") == "I want to go shopping."
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+
+# ✅ TC-018: Engine only generates cache misses
+def test_engine_uses_cache():
+    calls = []
+    engine = TranslationEngine(model=None, tokenizer=None, cache=TranslationCache(max_entries=8))
+    engine.generate_batch = lambda texts, **kwargs: calls.append(list(texts)) or [f"out {t}" for t in texts]
+
+    first = engine.translate_batch(["Saya lapar.", "Saya lapar", "Dia tanya pasal apa?"])
+    second = engine.translate_batch(["Saya lapar."])
+    assert first[0] == first[1] == second[0]
+    assert calls == [["Saya lapar.", "Dia tanya pasal apa?"]]
+
+
+# ✅ TC-076: Inputs that share a cache key are tokenized identically
+def test_tokenize_matches_cache_normalization():
+    tokenizer = AutoTokenizer.from_pretrained(os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5"))
+    engine = TranslationEngine(model=None, tokenizer=tokenizer)
+    texts = ["Aku nak\n\ngi   shopping", " Aku nak gi shopping."]
+    assert make_cache_key(texts[0], "p: ", {}, "rev") == make_cache_key(texts[1], "p: ", {}, "rev")
+    first, second = engine.tokenize(texts)
+    assert first == second
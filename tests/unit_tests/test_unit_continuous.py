@@ -0,0 +1,76 @@
+import os
+import pytest
+import time
+import torch
+from transformers import AutoTokenizer
+from translator.continuous import ContinuousBatchDecoder
+from translator.engine import TranslationEngine
+from translator.t5_decoder import T5StepDecoder
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5")
+INPUTS = ["Saya lapar.", "Aku nak gi shopping dengan kawan aku petang ni.", "Jom.", "Dia tanya pasal apa?"]
+
+
+def tiny_engine(model):
+    return TranslationEngine(model, AutoTokenizer.from_pretrained(TOKENIZER_DIR), num_beams=1, max_length=20)
+
+
+# ✅ TC-051: The step decoder reproduces greedy model.generate token for token
+def test_step_decoder_matches_generate(tiny_t5):
+    for tied in (False, True):
+        engine = tiny_engine(tiny_t5(tie_word_embeddings=tied))
+        decoder = T5StepDecoder(engine.model)
+        inputs = engine.encode(INPUTS)
+        with torch.inference_mode():
+            expected = engine.model.generate(**inputs, max_length=20, num_beams=1)
+            cross = decoder.cross_kv(decoder.encode(inputs["input_ids"], inputs["attention_mask"]))
+            cross_bias = decoder.mask_bias(inputs["attention_mask"].bool())[:, None, None, :]
+            cache = decoder.empty_self_cache(len(INPUTS), 19)
+            tokens = torch.full((len(INPUTS),), decoder.start_token_id)
+            generated = [tokens]
+            for step in range(expected.shape[1] - 1):
+                positions = torch.full((len(INPUTS),), step)
+                tokens = decoder.step(tokens, positions, cache, cross, cross_bias, step + 1).argmax(-1)
+                generated.append(tokens)
+        generated = torch.stack(generated, dim=1)
+        # generate pads finished rows; compare up to and including each row's EOS
+        for row, expected_row in zip(generated.tolist(), expected.tolist()):
+            end = expected_row.index(1) + 1 if 1 in expected_row[1:] else len(expected_row)
+            assert row[:end] == expected_row[:end]
+
+
+# ✅ TC-052: Requests joining mid-decode get the same output as a one-off batch
+def test_continuous_decoder_matches_engine(tiny_t5):
+    engine = tiny_engine(tiny_t5())
+    expected = engine.translate_batch(INPUTS)
+    decoder = ContinuousBatchDecoder(engine, max_slots=2, encoder_capacity=4).start()
+    try:
+        futures = []
+        for text in INPUTS:
+            futures.append(decoder.submit(text))
+            time.sleep(0.01)
+        assert [future.result(timeout=60) for future in futures] == expected
+        assert decoder.requests_served == len(INPUTS)
+    finally:
+        decoder.stop()
+
+
+# ✅ TC-061: A failed admission fails its requests and the decoder keeps serving
+def test_continuous_decoder_survives_admit_error(tiny_t5):
+    engine = tiny_engine(tiny_t5())
+    expected = engine.translate_batch(INPUTS[:1])
+    decoder = ContinuousBatchDecoder(engine, max_slots=2)
+    allocate = decoder._allocate
+
+    def failing_allocate(encoder_length):
+        decoder._allocate = allocate
+        raise MemoryError("no room for the KV buffers")
+
+    decoder._allocate = failing_allocate
+    decoder.start()
+    try:
+        with pytest.raises(MemoryError):
+            decoder.translate(INPUTS[1], timeout=60)
+        assert decoder.translate(INPUTS[0], timeout=60) == expected[0]
+    finally:
+        decoder.stop()
@@ -0,0 +1,73 @@
+import pytest
+from translator.device_manager import DeviceManager, FaultInjector, is_accelerator_error
+
+
+class RecordingEngine:
+    def __init__(self, name, error=None):
+        self.name = name
+        self.device = name
+        self.error = error
+        self.calls = 0
+
+    def translate_batch(self, texts):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return [f"{self.name}:{text}" for text in texts]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ✅ TC-044: An accelerator error at generate time is served by the CPU replica
+def test_device_manager_reroutes_failed_batch():
+    injector = FaultInjector()
+    injector.fail_next = 1
+    manager = DeviceManager(RecordingEngine("cuda"), RecordingEngine("cpu"), injector=injector)
+
+    assert manager.translate_batch(["Saya lapar."]) == ["cpu:Saya lapar."]
+    assert manager.translate_batch(["Saya lapar."]) == ["cuda:Saya lapar."]
+    assert manager.fallbacks == 1 and not manager.demoted
+
+    # Non-device errors are real bugs and are not hidden by the fallback
+    broken = DeviceManager(RecordingEngine("cuda", ValueError("bad input")), RecordingEngine("cpu"))
+    with pytest.raises(ValueError):
+        broken.translate_batch(["Saya lapar."])
+    assert is_accelerator_error(RuntimeError("CUDA error: CUBLAS_STATUS_NOT_INITIALIZED"))
+
+
+# ✅ TC-045: Repeated failures demote the accelerator; a passing health check re-promotes it
+def test_device_manager_demotes_and_repromotes():
+    clock = FakeClock()
+    health = {"ok": False}
+
+    def health_check():
+        if not health["ok"]:
+            raise RuntimeError("CUDA error: device unavailable")
+
+    injector = FaultInjector(rate=1.0, seed=0)
+    primary, replica = RecordingEngine("cuda"), RecordingEngine("cpu")
+    manager = DeviceManager(primary, replica, health_check=health_check, injector=injector,
+                            min_samples=2, failure_threshold=0.5, cooldown=10, clock=clock)
+
+    for _ in range(2):
+        assert manager.translate("ayat") == "cpu:ayat"
+    assert manager.demoted and manager.demotions == 1
+
+    injector.rate = 0.0
+    clock.now = 11  # cooldown passed, but the device is still unhealthy
+    assert manager.translate("ayat") == "cpu:ayat"
+    assert manager.demoted
+
+    health["ok"] = True
+    clock.now = 25  # still inside the doubled cooldown
+    assert manager.translate("ayat") == "cpu:ayat"
+    clock.now = 32
+    assert manager.translate("ayat") == "cuda:ayat"
+    assert not manager.demoted and manager.repromotions == 1
+    assert primary.calls == 1
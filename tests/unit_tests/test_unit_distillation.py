@@ -0,0 +1,54 @@
+import os
+import torch
+from transformers import AutoTokenizer
+from package_model import write_package
+from translator.distillation import default_decoder_layers, distill, make_student, pseudo_labels
+from translator.engine import TranslationEngine
+from translator.fast_loader import load_packaged_model
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5")
+INPUTS = ["Saya lapar.", "Aku nak gi shopping.", "Jom.", "Dia tanya pasal apa?"]
+
+
+# ✅ TC-057: The student copies the encoder and the chosen decoder layers
+def test_make_student_copies_teacher_layers(tiny_t5):
+    teacher = tiny_t5(num_decoder_layers=4)
+    layers = default_decoder_layers(teacher, 2)
+    assert layers == [0, 3] and default_decoder_layers(teacher, 1) == [3]
+
+    student = make_student(teacher, layers)
+    assert student.config.num_decoder_layers == 2 and teacher.config.num_decoder_layers == 4
+    teacher_state, student_state = teacher.state_dict(), student.state_dict()
+    for name, tensor in student_state.items():
+        if name.startswith("decoder.block.1."):
+            source = name.replace("decoder.block.1.", "decoder.block.3.")
+        else:
+            source = name
+        assert torch.equal(tensor, teacher_state[source]), name
+
+    inputs = TranslationEngine(teacher, AutoTokenizer.from_pretrained(TOKENIZER_DIR)).encode(INPUTS)
+    with torch.inference_mode():
+        assert torch.equal(student.encoder(**inputs).last_hidden_state, teacher.encoder(**inputs).last_hidden_state)
+
+
+# ✅ TC-058: Training on teacher labels lowers the loss and the student packages like any model
+def test_distill_and_package(tmp_path, tiny_t5):
+    teacher = tiny_t5(num_decoder_layers=4)
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    engine = TranslationEngine(teacher, tokenizer, num_beams=1, max_length=12)
+    labels = pseudo_labels(engine, INPUTS)
+    assert len(labels) == len(INPUTS) and all(row[-1] == 1 for row in labels)
+
+    student = make_student(teacher, [0])
+    history = distill(student, engine, INPUTS, labels, teacher=teacher, epochs=8, batch_size=2,
+                      learning_rate=1e-2, alpha=0.5, log=lambda message: None)
+    assert history[-1] < history[0]
+    assert not student.training
+
+    output = str(tmp_path / "student")
+    write_package(student, tokenizer, output, source="test")
+    loaded, _, _ = load_packaged_model(output, verify=True)
+    assert loaded.config.num_decoder_layers == 1
+    inputs = engine.encode(INPUTS)
+    with torch.inference_mode():
+        assert torch.equal(loaded.generate(**inputs, max_length=12), student.generate(**inputs, max_length=12))
@@ -0,0 +1,54 @@
+import os
+import torch
+from safetensors.torch import save_file
+from transformers import AutoTokenizer
+from package_model import package, write_package
+from translator.cache import make_cache_key
+from translator.engine import TranslationEngine
+from translator.fast_loader import is_packaged, load_packaged_model, mmap_safetensors
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5")
+
+
+# ✅ TC-042: Safetensors are mapped as zero-copy views with the stored values
+def test_mmap_safetensors_round_trip(tmp_path):
+    tensors = {"a": torch.randn(4, 3), "b": torch.arange(10, dtype=torch.int64), "c": torch.randn(5).half()}
+    path = str(tmp_path / "weights.safetensors")
+    save_file(tensors, path)
+
+    loaded, copied = mmap_safetensors(path)
+    assert copied == 0
+    for name, tensor in tensors.items():
+        assert loaded[name].dtype == tensor.dtype
+        assert torch.equal(loaded[name], tensor)
+
+
+# ✅ TC-043: A packaged model loads offline and matches the source weights
+def test_packaged_model_matches_source(tmp_path, tiny_t5):
+    source = tiny_t5()
+    source.save_pretrained(str(tmp_path / "source"))
+
+    output = str(tmp_path / "packaged")
+    manifest = package(str(tmp_path / "source"), output, tokenizer_source=TOKENIZER_DIR)
+    assert is_packaged(output) and len(manifest["sha256"]) == 64
+
+    model, tokenizer, timings = load_packaged_model(output, verify=True)
+    assert timings["copied_tensors"] == 0 and model.config.use_cache
+
+    inputs = {"input_ids": torch.tensor([[5, 6, 7, 1]]), "decoder_input_ids": torch.tensor([[0, 5]])}
+    with torch.no_grad():
+        assert torch.allclose(model(**inputs).logits, source(**inputs).logits)
+
+
+# ✅ TC-072: Packages with different weights never share cache keys
+def test_packaged_models_have_distinct_revisions(tmp_path, tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    keys = []
+    for seed in (0, 1):
+        output = str(tmp_path / f"package_{seed}")
+        manifest = write_package(tiny_t5(seed), tokenizer, output)
+        model, tokenizer, _ = load_packaged_model(output)
+        assert model.config._name_or_path == output and model.package_revision == manifest["sha256"]
+        engine = TranslationEngine(model, tokenizer)
+        keys.append(make_cache_key("Saya lapar.", engine.prefix, engine.generation_kwargs(), engine.model_revision()))
+    assert keys[0] != keys[1]
@@ -0,0 +1,79 @@
+from firebase.firestore_writer import FirestoreBatchWriter
+from firebase.translation_counts import save_writes
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Aborted(Exception):
+    pass
+
+
+# Make the next commits of `db` raise `errors`, in order
+def fail_commits(db, errors):
+    make_batch = db.batch
+
+    def batch():
+        write_batch = make_batch()
+        commit = write_batch.commit
+
+        def failing_commit():
+            if errors:
+                raise errors.pop(0)
+            commit()
+
+        write_batch.commit = failing_commit
+        return write_batch
+
+    db.batch = batch
+
+
+# ✅ TC-024: Queued saves are coalesced into a few batch commits
+def test_writer_coalesces_saves(local_firestore):
+    writer = FirestoreBatchWriter(local_firestore, flush_interval=0.2).start()
+    for i in range(50):
+        writer.enqueue_add("translations", {"input_text": f"ayat {i}"})
+    assert writer.flush(timeout=5)
+    writer.close()
+
+    assert len(local_firestore.data["translations"]) == 50
+    assert local_firestore.commits < 50
+    assert writer.written == 50 and writer.failed == 0
+
+
+# ✅ TC-025: Failed commits are retried with backoff
+def test_writer_retries_failed_commit(local_firestore):
+    fail_commits(local_firestore, [ConnectionError("deadline exceeded"), ConnectionError("deadline exceeded")])
+    writer = FirestoreBatchWriter(local_firestore, flush_interval=0.01, base_backoff=0.01).start()
+    writer.enqueue_add("translations", {"input_text": "Saya lapar."})
+    assert writer.close(timeout=5)
+
+    assert len(local_firestore.data["translations"]) == 1
+    assert writer.failed == 0
+
+
+# ✅ TC-062: A save and its counter increment share a batch and are never applied twice
+def test_writer_groups_and_counter_retries(local_firestore):
+    writer = FirestoreBatchWriter(local_firestore, max_batch_ops=3, flush_interval=0.2).start()
+    for i in range(2):
+        writer.enqueue_group(save_writes("a@b.com", {"user": "a@b.com", "input_text": f"ayat {i}"}))
+    assert writer.flush(timeout=5)
+    # Two groups of two do not fit in one batch of three: one commit each
+    assert local_firestore.commits == 2
+    assert local_firestore.data["users"]["a@b.com"]["translation_count"] == 2
+
+    # Known not applied: the whole group is retried
+    fail_commits(local_firestore, [Aborted("contention")])
+    writer.base_backoff = 0.01
+    writer.enqueue_group(save_writes("a@b.com", {"user": "a@b.com", "input_text": "ayat 2"}))
+    assert writer.flush(timeout=5)
+    assert local_firestore.data["users"]["a@b.com"]["translation_count"] == 3
+
+    # Maybe applied: the translation is retried, the increment is not
+    fail_commits(local_firestore, [DeadlineExceeded("deadline exceeded")])
+    writer.enqueue_group(save_writes("a@b.com", {"user": "a@b.com", "input_text": "ayat 3"}))
+    assert writer.close(timeout=5)
+    assert len(local_firestore.data["translations"]) == 4
+    assert local_firestore.data["users"]["a@b.com"]["translation_count"] == 3
+    assert writer.uncertain == 1 and writer.failed == 0
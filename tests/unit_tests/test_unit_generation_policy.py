@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+import torch
+from translator.cache import make_cache_key
+from translator.engine import TranslationEngine
+from translator.generation_policy import GenerationBudget
+
+
+# ✅ TC-046: The token budget follows the input length within its bounds
+def test_budget_scales_with_input():
+    budget = GenerationBudget(ratio=1.5, slack=4, min_new_tokens=8, max_new_tokens=64)
+    assert budget.max_new_tokens_for(1) == 8
+    assert budget.max_new_tokens_for(20) == 34
+    assert budget.max_new_tokens_for(200) == 64
+
+
+# ✅ TC-047: Short inputs decode greedily, long ones with beams and early stopping
+def test_budget_greedy_vs_beam():
+    budget = GenerationBudget(beam_min_tokens=8, num_beams=2)
+    assert budget.for_input(3)["num_beams"] == 1
+    assert "early_stopping" not in budget.for_input(3)
+    long_kwargs = budget.for_input(12)
+    assert long_kwargs["num_beams"] == 2 and long_kwargs["early_stopping"]
+
+    # A different policy must not reuse cached translations
+    key = make_cache_key("Saya lapar.", "p: ", {"budget": budget.describe()}, ["rev"])
+    other = make_cache_key("Saya lapar.", "p: ", {"budget": GenerationBudget(ratio=2.0).describe()}, ["rev"])
+    assert key != other
+
+
+# ✅ TC-069: Truncation is counted against the EOS that generate stops on
+def test_truncation_uses_generation_config_eos():
+    model = SimpleNamespace(config=SimpleNamespace(eos_token_id=1), generation_config=SimpleNamespace(eos_token_id=[2, 5]))
+    engine = TranslationEngine(model=model, tokenizer=None)
+    assert engine.eos_token_id() == 2
+    engine._count_truncated(torch.tensor([[0, 7, 2, 0], [0, 7, 1, 0], [0, 7, 8, 9]]))
+    assert engine.truncated_outputs == 2
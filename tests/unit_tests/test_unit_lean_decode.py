@@ -0,0 +1,67 @@
+import os
+import pytest
+import torch
+from transformers import AutoTokenizer
+from translator.engine import TranslationEngine
+from translator.lean_decode import LeanDecoder
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5")
+INPUTS = ["Saya lapar.", "Aku nak gi shopping dengan kawan aku petang ni.", "Jom.", "Dia tanya pasal apa?",
+          "ok lah", "Jom pergi makan nasi lemak dekat kedai mamak tu, aku belanja."]
+
+
+# ✅ TC-053: Same token ids as model.generate for greedy and beam search
+def test_lean_decoder_matches_generate(tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    settings = [
+        {"max_length": 20, "num_beams": 1},
+        {"max_length": 20, "num_beams": 2},
+        {"max_length": 30, "num_beams": 2, "early_stopping": True},
+        {"max_new_tokens": 12, "num_beams": 3},
+    ]
+    for seed in range(3):
+        for tied in (False, True):
+            model = tiny_t5(seed, tied, eos_boost=3 + seed)
+            inputs = TranslationEngine(model, tokenizer).encode(INPUTS)
+            decoder = LeanDecoder(model)  # reused: buffers grow and shrink between calls
+            for kwargs in settings:
+                with torch.inference_mode():
+                    expected = model.generate(**inputs, **kwargs)
+                assert torch.equal(decoder.generate(**inputs, **kwargs), expected), (seed, tied, kwargs)
+
+
+# ✅ TC-054: The engine gives the same translations with the lean loop enabled
+def test_engine_lean_decoding(tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    model = tiny_t5(0, eos_boost=3)
+    expected = TranslationEngine(model, tokenizer).translate_batch(INPUTS)
+    engine = TranslationEngine(model, tokenizer, lean_decoding=True)
+    assert engine.translate_batch(INPUTS) == expected
+    assert engine._lean_decoder.supports(engine.generate_kwargs(8))
+
+
+# ✅ TC-070: length_penalty is honoured; settings the loop lacks (sampling,
+# early_stopping="never", ...) go to model.generate
+def test_lean_decoder_unsupported_settings(tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    model = tiny_t5(1, eos_boost=4)
+    inputs = TranslationEngine(model, tokenizer).encode(INPUTS)
+    decoder = LeanDecoder(model)
+    for length_penalty in (0.0, 2.0):
+        kwargs = {"max_length": 20, "num_beams": 3, "length_penalty": length_penalty}
+        with torch.inference_mode():
+            expected = model.generate(**inputs, **kwargs)
+        assert torch.equal(decoder.generate(**inputs, **kwargs), expected), length_penalty
+
+    assert decoder.supports({"max_new_tokens": 12, "num_beams": 2, "early_stopping": True, "use_cache": False})
+    assert decoder.unsupported({"num_beams": 2, "early_stopping": "never"}) == ["early_stopping"]
+    assert decoder.unsupported({"do_sample": True, "num_return_sequences": 1}) == ["do_sample"]
+    with pytest.raises(ValueError, match="repetition_penalty"):
+        decoder.generate(**inputs, repetition_penalty=1.3)
+
+    # A non-neutral generation_config setting makes the engine fall back to generate
+    model.generation_config.repetition_penalty = 1.3
+    expected = TranslationEngine(model, tokenizer).translate_batch(INPUTS)
+    engine = TranslationEngine(model, tokenizer, lean_decoding=True)
+    assert engine.translate_batch(INPUTS) == expected
+    assert not engine._lean_decoder.supports(engine.generate_kwargs(8))
@@ -0,0 +1,48 @@
+import json
+import urllib.request
+from translator.metrics import MetricsRegistry, SIZE_BUCKETS
+
+
+# ✅ TC-034: Disabled metrics record nothing
+def test_disabled_metrics_are_noops():
+    registry = MetricsRegistry(enabled=False)
+    registry.inc("requests_total")
+    with registry.span("generate"):
+        pass
+    assert registry.snapshot()["counters"] == {}
+    assert registry.render_prometheus() == "\n"
+
+
+# ✅ TC-035: Counters, spans and histograms in Prometheus text format
+def test_prometheus_rendering():
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("requests_total", 3)
+    registry.inc("cache_hits_total")
+    with registry.span("generate"):
+        pass
+    registry.observe("batch_size", 5, buckets=SIZE_BUCKETS)
+
+    text = registry.render_prometheus()
+    assert "# TYPE translation_requests_total counter" in text
+    assert "translation_requests_total 3" in text
+    assert 'translation_stage_seconds_count{stage="generate"} 1' in text
+    assert 'translation_batch_size_bucket{le="4"} 0' in text
+    assert 'translation_batch_size_bucket{le="8"} 1' in text
+
+
+# ✅ TC-036: JSON dump and HTTP endpoint expose the same registry
+def test_json_dump_and_http_endpoint(tmp_path):
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("failures_total")
+    path = str(tmp_path / "metrics.json")
+    registry.dump_json(path)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["counters"]["failures_total"] == 1
+
+    server = registry.start_http_server(0, host="127.0.0.1")
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode("utf-8")
+        assert "translation_failures_total 1" in body
+    finally:
+        server.shutdown()
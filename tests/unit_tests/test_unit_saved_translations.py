@@ -0,0 +1,49 @@
+import firebase.saved_translations as saved_translations
+from firebase.local_firestore import LocalQuery
+from firebase.saved_translations import SavedTranslationsPager, fetch_translations_page
+
+
+def add_translations(db, count):
+    for i in range(count):
+        db.collection("translations").document(f"doc{i}").set(
+            {"user": "a@b.com", "input_text": f"in {i}", "output_text": f"out {i}", "timestamp": i, "extra": "x" * 100})
+    db.collection("translations").document("other").set({"user": "c@d.com", "input_text": "x", "timestamp": 9})
+
+
+# ✅ TC-026: Pages are ordered newest first and only projected fields are read
+def test_fetch_translations_page(local_firestore, monkeypatch):
+    add_translations(local_firestore, 5)
+    projections = []
+    select = LocalQuery.select
+    monkeypatch.setattr(LocalQuery, "select", lambda self, fields: projections.append(list(fields)) or select(self, fields))
+
+    rows, cursor, has_more = fetch_translations_page(local_firestore, "a@b.com", page_size=2)
+    assert [row["id"] for row in rows] == ["doc4", "doc3"]
+    assert has_more and cursor.id == "doc3"
+    assert projections == [["input_text", "output_text", "timestamp"]]
+    assert "extra" not in cursor.to_dict()
+
+    rows, cursor, has_more = fetch_translations_page(local_firestore, "a@b.com", page_size=2, start_after=cursor)
+    assert [row["id"] for row in rows] == ["doc2", "doc1"]
+
+
+# ✅ TC-027: The pager caches fetched pages across reruns
+def test_pager_caches_pages(local_firestore, monkeypatch):
+    add_translations(local_firestore, 5)
+    fetches = []
+    fetch = saved_translations.fetch_translations_page
+    monkeypatch.setattr(saved_translations, "fetch_translations_page",
+                        lambda *args: fetches.append(args) or fetch(*args))
+
+    pager = SavedTranslationsPager(local_firestore, "a@b.com", page_size=2)
+    assert [row["id"] for row in pager.get_page(1)] == ["doc2", "doc1"]
+    fetched = len(fetches)
+    pager.get_page(0)
+    pager.get_page(1)
+    assert len(fetches) == fetched
+    assert pager.has_next(1)
+    assert [row["id"] for row in pager.get_page(2)] == ["doc0"]
+    assert not pager.has_next(2)
+
+    assert pager.remove("doc0")
+    assert pager.pages == [] and pager.has_more
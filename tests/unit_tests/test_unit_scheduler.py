@@ -0,0 +1,46 @@
+import threading
+import pytest
+from translator.scheduler import MicroBatchScheduler
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.batches = []
+
+    def translate_batch(self, texts):
+        self.batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+
+# ✅ TC-012: Concurrent requests are coalesced into one batch
+def test_scheduler_batches_concurrent_requests():
+    engine = RecordingEngine()
+    scheduler = MicroBatchScheduler(engine, batch_window_ms=200, max_batch_size=8).start()
+    inputs = [f"ayat {i}" for i in range(8)]
+    results = [None] * len(inputs)
+
+    def worker(index):
+        results[index] = scheduler.translate(inputs[index], timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(inputs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    scheduler.stop()
+
+    assert results == [text.upper() for text in inputs]
+    assert len(engine.batches) < len(inputs)
+    assert max(len(batch) for batch in engine.batches) <= 8
+
+
+# ✅ TC-013: Engine errors are propagated to every waiting caller
+def test_scheduler_propagates_errors():
+    class FailingEngine:
+        def translate_batch(self, texts):
+            raise RuntimeError("generate failed")
+
+    scheduler = MicroBatchScheduler(FailingEngine(), batch_window_ms=1).start()
+    with pytest.raises(RuntimeError):
+        scheduler.translate("Saya lapar.", timeout=5)
+    scheduler.stop()
@@ -0,0 +1,34 @@
+from translator.segmentation import SentencePipeline, restore_punctuation, split_sentences
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.calls = []
+
+    def translate_batch(self, texts, single_batch=False):
+        self.calls.append((list(texts), single_batch))
+        return [f"<{text.rstrip('.!?')}>." for text in texts]
+
+
+# ✅ TC-049: Sentences are split on end punctuation, keeping spacing and abbreviations
+def test_split_sentences():
+    text = "Saya lapar. Jom makan!  Jumpa Dr. Ali esok?"
+    parts = split_sentences(text)
+    assert parts == [("Saya lapar.", " "), ("Jom makan!", "  "), ("Jumpa Dr. Ali esok?", "")]
+    assert "".join(sentence + separator for sentence, separator in parts) == text
+    assert split_sentences("Harga 3.50 je") == [("Harga 3.50 je", "")]
+    assert restore_punctuation("Awak nak ikut?", "Do you want to come.") == "Do you want to come?"
+
+
+# ✅ TC-050: A paragraph is translated as one batch and reassembled in order
+def test_pipeline_reassembles_paragraph():
+    engine = RecordingEngine()
+    pipeline = SentencePipeline(engine)
+    result = pipeline.translate("Saya lapar. Awak nak ikut? Jom!")
+
+    assert result == "<Saya lapar>. <Awak nak ikut>? <Jom>!"
+    assert engine.calls == [(["Saya lapar.", "Awak nak ikut?", "Jom!"], True)]
+
+    # Single-sentence requests reach the engine unchanged
+    assert pipeline.translate_batch(["Saya lapar", "Jom makan."]) == ["<Saya lapar>.", "<Jom makan>."]
+    assert engine.calls[-1] == (["Saya lapar", "Jom makan."], False)
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import threading
+from firebase.firestore_writer import FirestoreBatchWriter
+from firebase.local_firestore import LocalFirestore
+from translation_service import TranslationService
+
+
+class UpperEngine:
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.batches = []
+
+    def translate_batch(self, texts):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+
+async def http_request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, head.decode("latin-1"), json.loads(body) if body else None
+
+
+def run_service(service, scenario):
+    async def runner():
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port)
+        finally:
+            await service.stop()
+
+    return asyncio.run(runner())
+
+
+# ✅ TC-037: Single and batch endpoints return translations in order
+def test_service_translate_endpoints():
+    service = TranslationService(UpperEngine())
+
+    async def scenario(port):
+        single = await http_request(port, "POST", "/translate", {"text": "Saya lapar"})
+        batch = await http_request(port, "POST", "/translate/batch", {"texts": ["Saya lapar.", "Jom makan."]})
+        empty = await http_request(port, "POST", "/translate", {"text": "   "})
+        return single, batch, empty
+
+    single, batch, empty = run_service(service, scenario)
+    assert single[0] == 200 and single[2]["translation"] == "SAYA LAPAR."
+    assert batch[0] == 200 and batch[2]["translations"] == ["SAYA LAPAR.", "JOM MAKAN."]
+    assert empty[0] == 400
+
+
+# ✅ TC-038: A full queue is answered with 503 instead of waiting
+def test_service_backpressure():
+    gate = threading.Event()
+    service = TranslationService(UpperEngine(gate), workers=1, queue_size=1, max_batch_size=1)
+
+    async def scenario(port):
+        busy = asyncio.create_task(http_request(port, "POST", "/translate", {"text": "ayat satu"}))
+        await asyncio.sleep(0.2)  # worker is now blocked inside generate
+        queued = asyncio.create_task(http_request(port, "POST", "/translate", {"text": "ayat dua"}))
+        await asyncio.sleep(0.2)  # queue is now full
+        rejected = await http_request(port, "POST", "/translate", {"text": "ayat tiga"})
+        gate.set()
+        return await busy, await queued, rejected
+
+    busy, queued, rejected = run_service(service, scenario)
+    assert busy[0] == 200 and queued[0] == 200
+    assert rejected[0] == 503 and "Retry-After" in rejected[1]
+
+
+# ✅ TC-039: Saves go through the batch writer into the local Firestore stand-in
+def test_service_saves_to_local_firestore():
+    db = LocalFirestore()
+    writer = FirestoreBatchWriter(db, flush_interval=0.01).start()
+    service = TranslationService(UpperEngine(), writer=writer)
+
+    async def scenario(port):
+        return await http_request(port, "POST", "/translate/batch",
+                                  {"texts": ["Saya lapar.", "Jom makan."], "user": "test@example.com"})
+
+    status, _, payload = run_service(service, scenario)
+    assert status == 200 and payload["saved"]
+
+    saved = db.collection("translations").where("user", "==", "test@example.com").get()
+    assert sorted(doc.get("output_text") for doc in saved) == ["JOM MAKAN.", "SAYA LAPAR."]
+    assert db.collection("users").document("test@example.com").get().get("translation_count") == 2
+
+
+# ✅ TC-071: A bad Content-Length and an oversized batch are answered with an error status
+def test_service_rejects_bad_requests():
+    engine = UpperEngine()
+    service = TranslationService(engine, max_request_texts=2)
+
+    async def raw_request(port, content_length):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /translate HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        return int(raw.split()[1])
+
+    async def scenario(port):
+        return (await raw_request(port, "abc"), await raw_request(port, "-5"),
+                await http_request(port, "POST", "/translate/batch", {"texts": ["satu", "dua", "tiga"]}))
+
+    non_numeric, negative, oversized = run_service(service, scenario)
+    assert non_numeric == 400 and negative == 400
+    assert oversized[0] == 413 and "At most 2 texts" in oversized[2]["error"]
+    assert engine.batches == []
+
+
+# ✅ TC-075: A slow Firestore counter backfill does not stall other connections
+def test_service_counter_backfill_off_event_loop(monkeypatch):
+    import time
+    import translation_service
+    release = threading.Event()
+    monkeypatch.setattr(translation_service, "ensure_translation_count", lambda db, user: release.wait(5))
+    writer = FirestoreBatchWriter(LocalFirestore(), flush_interval=0.01).start()
+    service = TranslationService(UpperEngine(), writer=writer)
+
+    async def scenario(port):
+        save = asyncio.create_task(http_request(port, "POST", "/translate",
+                                                {"text": "Saya lapar", "user": "test@example.com"}))
+        await asyncio.sleep(0.2)  # the save is now waiting on the backfill
+        started = time.perf_counter()
+        health = await http_request(port, "GET", "/health")
+        elapsed = time.perf_counter() - started
+        release.set()
+        return health, elapsed, await save
+
+    health, elapsed, save = run_service(service, scenario)
+    assert health[0] == 200 and elapsed < 1
+    assert save[0] == 200 and save[2]["saved"]
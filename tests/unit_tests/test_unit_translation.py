@@ -1,7 +1,7 @@
 import pytest
 from Home import load_model, clean_translation
-from transformers import T5ForConditionalGeneration, AutoTokenizer
-import torch
+from translator.engine import TranslationEngine
+from translator.parity import verify_kv_cache
 
 # ✅ TC-001: Tokenizer Behavior Test
 def test_tokenizer_behavior():
@@ -51,3 +51,33 @@ def test_invalid_input():
     outputs = model.generate(input_ids, max_length=30, num_beams=2)
     translated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
     assert any(word in translated_text.lower() for word in ["invalid", "error", "@#$%"])  # More flexible matching
+
+
+# ✅ TC-011: Batched Translation Test
+def test_batched_translation_matches_single():
+    engine = TranslationEngine.from_loaded(load_model())
+    inputs = ["Saya lapar.", "Aku nak eat.", "Dia tanya pasal apa?"]
+    batched = engine.translate_batch(inputs)
+    assert len(batched) == len(inputs)
+    assert batched == [engine.translate(text) for text in inputs]
+    assert all(text[-1] in ['.', '!', '?'] for text in batched)
+    assert engine.translate_batch([]) == []
+
+
+# ✅ TC-014: KV-Cache Parity Test
+def test_kv_cache_outputs_identical():
+    engine = TranslationEngine.from_loaded(load_model())
+    assert engine.model.config.use_cache
+    report = verify_kv_cache(engine, ["Saya lapar.", "Aku nak gi shopping."], warmup=False)
+    assert report["all_identical"]
+
+
+# ✅ TC-048: Adaptive budget does not cut long sentences
+def test_adaptive_budget_translation():
+    from translator.generation_policy import GenerationBudget
+    engine = TranslationEngine.from_loaded(load_model(), budget=GenerationBudget())
+    long_input = ("Semalam aku pergi pasar malam dengan kawan-kawan aku and we bought so much food "
+                  "sampai tak larat nak habiskan semua tu.")
+    results = engine.translate_batch(["Saya lapar.", long_input])
+    assert "hungry" in results[0].lower()
+    assert engine.truncated_outputs == 0
@@ -0,0 +1,70 @@
+from firebase.firestore_writer import FirestoreBatchWriter
+from firebase.local_firestore import LocalQuery
+from firebase.translation_counts import (delete_translation, ensure_translation_count, get_translation_count,
+                                         recompute_translation_counts, save_writes)
+
+
+def seed(db):
+    for i in range(5):
+        db.collection("translations").document(f"t{i}").set({"user": "a@b.com" if i < 3 else "c@d.com"})
+    db.collection("users").document("a@b.com").set({"translation_count": 7})
+    db.collection("users").document("e@f.com").set({"translation_count": 2})
+
+
+def record_reads(monkeypatch):
+    reads = {"count": 0, "stream": 0}
+    count, stream = LocalQuery.count, LocalQuery.stream
+
+    def counting(self):
+        reads["count"] += 1
+        return count(self)
+
+    def streaming(self):
+        reads["stream"] += 1
+        return stream(self)
+
+    monkeypatch.setattr(LocalQuery, "count", counting)
+    monkeypatch.setattr(LocalQuery, "stream", streaming)
+    return reads
+
+
+# ✅ TC-028: The maintained counter is read without scanning translations
+def test_get_translation_count_uses_counter(local_firestore, monkeypatch):
+    seed(local_firestore)
+    reads = record_reads(monkeypatch)
+    assert get_translation_count(local_firestore, "a@b.com", {"translation_count": 7}) == 7
+    assert reads == {"count": 0, "stream": 0}
+
+
+# ✅ TC-029: Missing counters are filled in with an aggregation count
+def test_get_translation_count_backfills(local_firestore, monkeypatch):
+    seed(local_firestore)
+    reads = record_reads(monkeypatch)
+    assert get_translation_count(local_firestore, "c@d.com") == 2
+    assert reads == {"count": 1, "stream": 0}
+    assert local_firestore.data["users"]["c@d.com"]["translation_count"] == 2
+
+
+# ✅ TC-030: Repair job recomputes every counter
+def test_recompute_translation_counts(local_firestore):
+    seed(local_firestore)
+    counts = recompute_translation_counts(local_firestore)
+    assert counts == {"a@b.com": 3, "c@d.com": 2, "e@f.com": 0}
+    assert local_firestore.data["users"]["a@b.com"]["translation_count"] == 3
+    assert local_firestore.data["users"]["e@f.com"]["translation_count"] == 0
+
+
+# ✅ TC-063: A legacy user's first save counts the old translations; deletes count once
+def test_counter_backfill_before_first_save(local_firestore):
+    seed(local_firestore)
+    ensure_translation_count(local_firestore, "c@d.com")
+    writer = FirestoreBatchWriter(local_firestore, flush_interval=0.01).start()
+    writer.enqueue_group(save_writes("c@d.com", {"user": "c@d.com", "input_text": "Saya lapar."}))
+    assert writer.close(timeout=5)
+    assert get_translation_count(local_firestore, "c@d.com") == 3
+
+    assert delete_translation(local_firestore, "c@d.com", "t3")
+    assert not delete_translation(local_firestore, "c@d.com", "t3")  # double click
+    assert not delete_translation(local_firestore, "c@d.com", "t0")  # someone else's
+    assert get_translation_count(local_firestore, "c@d.com") == 2
+    assert "t0" in local_firestore.data["translations"]
@@ -0,0 +1,53 @@
+import os
+import torch
+from transformers import AutoTokenizer
+from package_model import write_package
+from prune_vocab import prune
+from translator.engine import TranslationEngine
+from translator.fast_loader import load_packaged_model
+from translator.lean_decode import LeanDecoder
+from translator.vocab_pruning import PrunedLMHead, active_vocabulary, is_pruned
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5")
+INPUTS = ["Saya lapar.", "Aku nak gi shopping dengan kawan aku petang ni.", "Jom.", "Dia tanya pasal apa?"]
+
+
+# ✅ TC-055: The active vocabulary has the special tokens and every target token
+def test_active_vocabulary(tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    model = tiny_t5()
+    vocab = active_vocabulary(model, tokenizer, targets=["I am hungry."], generated={42, 42, 7})
+    assert vocab == sorted(set(vocab))
+    assert {0, 1, 7, 42} <= set(vocab)
+    assert set(tokenizer("I am hungry.")["input_ids"]) <= set(vocab)
+
+    head = PrunedLMHead(torch.randn(3, 4), torch.tensor([1, 5, 9]), 12)
+    hidden = torch.randn(2, 1, 4)
+    logits = head(hidden)
+    assert logits.shape == (2, 1, 12)
+    assert torch.equal(logits[..., [1, 5, 9]], head.project(hidden))
+    assert (logits[..., 0] == torch.finfo(logits.dtype).min).all()
+
+
+# ✅ TC-056: A pruned model keeps greedy outputs on its corpus and survives packaging
+def test_pruned_model_round_trip(tmp_path, tiny_t5):
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR)
+    model = tiny_t5()
+    pruned = prune(model, tokenizer, INPUTS)
+    assert is_pruned(pruned) and not is_pruned(model)
+    assert pruned.config.pruned_vocab_size < model.config.vocab_size
+
+    inputs = TranslationEngine(model, tokenizer).encode(INPUTS)
+    with torch.inference_mode():
+        expected = model.generate(**inputs, max_length=30, num_beams=1)
+        assert torch.equal(pruned.generate(**inputs, max_length=30, num_beams=1), expected)
+        beams = pruned.generate(**inputs, max_length=30, num_beams=2)
+    # The lean loop decodes over the pruned logits directly
+    assert torch.equal(LeanDecoder(pruned).generate(**inputs, max_length=30, num_beams=2), beams)
+
+    output = str(tmp_path / "pruned")
+    write_package(pruned, tokenizer, output, source="test")
+    loaded, _, timings = load_packaged_model(output, verify=True)
+    assert is_pruned(loaded) and timings["copied_tensors"] == 0
+    with torch.inference_mode():
+        assert torch.equal(loaded.generate(**inputs, max_length=30, num_beams=2), beams)
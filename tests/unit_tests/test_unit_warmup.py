@@ -0,0 +1,65 @@
+import os
+import torch
+from transformers import AutoTokenizer
+from translator.cache import TranslationCache
+from translator.continuous import ContinuousBatchDecoder
+from translator.engine import TranslationEngine
+from translator.lean_decode import LeanDecoder
+from translator.warmup import format_warmup, representative_sentences, warmup
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fine_tuned_nanot5")
+SENTENCES = ["Jom.", "Saya lapar.", "Dia tanya pasal apa?", "Aku nak gi shopping dengan kawan aku petang ni."]
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.batches = []
+
+    def tokenize(self, texts):
+        return [text.split() for text in texts]
+
+    def generate_batch(self, texts):
+        self.batches.append(list(texts))
+        return texts
+
+
+# ✅ TC-059: Every representative shape is generated `rounds` times, bypassing the cache
+def test_warmup_runs_representative_shapes():
+    engine = RecordingEngine()
+    assert representative_sentences(engine, SENTENCES) == [SENTENCES[0], SENTENCES[2], SENTENCES[3]]
+
+    report = warmup(engine, SENTENCES, batch_sizes=(1, 3), rounds=2)
+    assert len(engine.batches) == 3 * 2 * 2
+    assert sorted({len(batch) for batch in engine.batches}) == [1, 3]
+    assert [(shape["batch_size"], shape["input_tokens"]) for shape in report["shapes"]] == [
+        (1, 1), (3, 1), (1, 4), (3, 4), (1, 9), (3, 9)]
+    assert report["compiled"] is False
+    assert "6 shapes (eager)" in format_warmup(report)
+
+
+# ✅ TC-060: The torch.compile decode path gives the same tokens as generate
+def test_compiled_lean_decoder_matches_generate(tiny_t5):
+    model = tiny_t5()
+    engine = TranslationEngine(model, AutoTokenizer.from_pretrained(TOKENIZER_DIR), compiled=True)
+    assert engine.lean_decoding
+
+    inputs = engine.encode(SENTENCES)
+    decoder = LeanDecoder(model, compiled=True)
+    with torch.inference_mode():
+        expected = model.generate(**inputs, max_length=20, num_beams=2)
+    assert torch.equal(decoder.generate(**inputs, max_length=20, num_beams=2), expected)
+
+
+# ✅ TC-065: The continuous decoder is warmed through its own decode loop, with heartbeats
+def test_warmup_continuous_decoder(tiny_t5):
+    engine = TranslationEngine(tiny_t5(), AutoTokenizer.from_pretrained(TOKENIZER_DIR), num_beams=1,
+                               max_length=20, cache=TranslationCache())
+    decoder = ContinuousBatchDecoder(engine, max_slots=4).start()
+    try:
+        beats = []
+        report = warmup(decoder, SENTENCES, batch_sizes=(1, 2), rounds=1, progress=beats.append)
+        assert beats == report["shapes"] and len(beats) == 6
+        assert decoder.requests_served == 3 * (1 + 2)
+        assert engine.cache.stats()["entries"] == 0
+    finally:
+        decoder.stop()
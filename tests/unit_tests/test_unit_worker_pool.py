@@ -0,0 +1,60 @@
+import os
+import pytest
+from translator.segmentation import SentencePipeline
+from translator.worker_pool import WorkerPool, partition_cores
+
+
+class UpperEngine:
+    def translate_batch(self, texts):
+        if any("gagal" in text for text in texts):
+            raise ValueError("generate failed")
+        if any("mati" in text for text in texts):
+            os._exit(1)  # the process dies mid-request, like an OOM kill
+        return [text.upper() for text in texts]
+
+
+def upper_engine_factory(model, tokenizer, **engine_kwargs):
+    return UpperEngine()
+
+
+def broken_engine_factory(model, tokenizer, **engine_kwargs):
+    raise OSError("model files missing")
+
+
+# ✅ TC-040: Cores are split into one disjoint group per worker
+def test_partition_cores():
+    assert partition_cores(4, cores=range(8)) == [[0, 1], [2, 3], [4, 5], [6, 7]]
+    assert partition_cores(2, cores=range(8), threads_per_worker=3) == [[0, 1, 2], [3, 4, 5]]
+    # More workers than cores still pins every worker somewhere
+    assert partition_cores(3, cores=[0, 1]) == [[0], [1], [0]]
+
+
+# ✅ TC-041: Requests are served by the worker processes and errors propagate
+def test_worker_pool_translates():
+    pool = WorkerPool(None, None, workers=2, cores=[0], engine_factory=upper_engine_factory,
+                      start_timeout=60).start()
+    try:
+        assert pool.translate_batch(["saya lapar.", "jom makan."], timeout=30) == ["SAYA LAPAR.", "JOM MAKAN."]
+        # Home wraps the pool so multi-sentence input is not cut to its first sentence
+        assert SentencePipeline(pool).translate("saya lapar. jom makan.") == "SAYA LAPAR. JOM MAKAN."
+        with pytest.raises(RuntimeError, match="generate failed"):
+            pool.translate("gagal", timeout=30)
+    finally:
+        pool.stop()
+
+
+# ✅ TC-064: A crashed worker fails its requests; a failed start is reported at once
+def test_worker_pool_crash_and_start_failure():
+    pool = WorkerPool(None, None, workers=2, cores=[0], engine_factory=upper_engine_factory,
+                      start_timeout=60, health_interval=0.1).start()
+    try:
+        with pytest.raises(RuntimeError, match="exited"):
+            pool.translate("mati", timeout=30)
+        assert pool.translate("saya lapar.", timeout=30) == "SAYA LAPAR."
+    finally:
+        pool.stop()
+
+    pool = WorkerPool(None, None, workers=1, cores=[0], engine_factory=broken_engine_factory, start_timeout=60)
+    with pytest.raises(RuntimeError, match="model files missing"):
+        pool.start()
+    assert pool._processes == []
@@ -0,0 +1,301 @@
+# translation_service.py
+# ✅ Standalone async HTTP translation service (no Streamlit)
+#
+#   python translation_service.py --port 8080 --workers 2
+#   python translation_service.py --local-firestore      # in-memory Firestore stand-in
+#
+#   GET  /health                 -> {"status": "ok", "queued": n}
+#   GET  /metrics                -> Prometheus text (TRANSLATION_METRICS=1)
+#   POST /translate              {"text": "...", "user": "a@b.com"}   -> {"translation": "..."}
+#   POST /translate/batch        {"texts": ["...", "..."]}            -> {"translations": [...]}
+#
+# Requests go through a bounded asyncio queue; when it is full the service
+# answers 503 straight away instead of piling up work (backpressure); a batch
+# request may carry at most max_request_texts texts, so the queue bounds the
+# pending texts too, not just the requests. Worker
+# coroutines drain the queue into batches and run TranslationEngine.translate_batch
+# in a thread pool, so the event loop never blocks on generate. When a request
+# carries "user", the translation is saved through FirestoreBatchWriter exactly
+# like the Streamlit app does.
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from firebase.firestore_writer import FirestoreBatchWriter
+from firebase.translation_counts import ensure_translation_count, save_writes
+from translator.metrics import SIZE_BUCKETS, metrics
+from translator.text_utils import ensure_punctuation, ensure_valid_input
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class ServiceOverloaded(Exception):
+    pass
+
+
+class TranslationService:
+    def __init__(self, engine, writer=None, workers=2, queue_size=64, max_batch_size=16,
+                 max_batch_texts=64, max_request_texts=64, request_timeout=30.0):
+        self.engine = engine
+        self.writer = writer
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.max_batch_size = max_batch_size
+        self.max_batch_texts = max_batch_texts
+        self.max_request_texts = max_request_texts
+        self.request_timeout = request_timeout
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="translation-worker")
+        self.queue = None
+        self._tasks = []
+        self._server = None
+        self._counted_users = set()
+
+    # ✅ Start worker coroutines and the HTTP listener
+    async def start(self, host="127.0.0.1", port=8080):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False)
+        if self.writer is not None:
+            self.writer.close()
+
+    # ✅ Queue texts for translation; raises ServiceOverloaded when the queue is full
+    async def translate(self, texts):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((texts, future))
+        except asyncio.QueueFull:
+            metrics.inc("rejected_total")
+            raise ServiceOverloaded()
+        return await asyncio.wait_for(future, self.request_timeout)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs = [await self.queue.get()]
+            total = len(jobs[0][0])
+            # Coalesce whatever else is already waiting into the same generate call
+            while len(jobs) < self.max_batch_size and total < self.max_batch_texts and not self.queue.empty():
+                jobs.append(self.queue.get_nowait())
+                total += len(jobs[-1][0])
+            jobs = [(texts, future) for texts, future in jobs if not future.done()]
+            flat = [text for texts, _ in jobs for text in texts]
+            metrics.observe("batch_size", len(flat), buckets=SIZE_BUCKETS)
+            try:
+                results = await loop.run_in_executor(self.executor, self.engine.translate_batch, flat) if flat else []
+            except Exception as e:
+                metrics.inc("failures_total", len(flat))
+                logger.error(f"Translation Error: {e}")
+                for _, future in jobs:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                start = 0
+                for texts, future in jobs:
+                    if not future.done():
+                        future.set_result(results[start:start + len(texts)])
+                    start += len(texts)
+            finally:
+                for _ in range(len(jobs)):
+                    self.queue.task_done()
+
+    async def _save(self, user, input_text, output_text):
+        if self.writer is None or not user:
+            return False
+        from firebase_admin import firestore
+        # Backfill a legacy user's counter before its first increment; the
+        # Firestore round-trips run off the event loop
+        if user not in self._counted_users:
+            await asyncio.get_running_loop().run_in_executor(None, ensure_translation_count, self.writer.db, user)
+            self._counted_users.add(user)
+        self.writer.enqueue_group(save_writes(user, {
+            "user": user,
+            "input_text": input_text,
+            "output_text": output_text,
+            "timestamp": firestore.SERVER_TIMESTAMP
+        }))
+        return True
+
+    @staticmethod
+    def _validate(texts):
+        if not texts or not all(isinstance(text, str) and text.strip() for text in texts):
+            return "Input cannot be empty. Please enter some text."
+        if not all(ensure_valid_input(text) for text in texts):
+            return "Invalid characters detected! Please enter only letters, numbers, and basic punctuation."
+        return None
+
+    # ✅ Route one request -> (status, JSON payload or text)
+    async def route(self, method, path, body):
+        path = path.split("?")[0]
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "ok", "queued": self.queue.qsize()}
+        if method == "GET" and path == "/metrics":
+            return HTTPStatus.OK, metrics.render_prometheus()
+        if method != "POST" or path not in ("/translate", "/translate/batch"):
+            return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Body must be JSON"}
+        if not isinstance(payload, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON object"}
+        single = path == "/translate"
+        texts = [payload.get("text")] if single else payload.get("texts")
+        if not isinstance(texts, list):
+            return HTTPStatus.BAD_REQUEST, {"error": "Expected a list of texts"}
+        if len(texts) > self.max_request_texts:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {
+                "error": f"At most {self.max_request_texts} texts per request"}
+        error = self._validate(texts)
+        if error:
+            return HTTPStatus.BAD_REQUEST, {"error": error}
+
+        texts = [ensure_punctuation(text.strip()) for text in texts]
+        try:
+            with metrics.span("service_translate"):
+                translations = await self.translate(texts)
+        except ServiceOverloaded:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Too many pending requests, retry later"}
+        except asyncio.TimeoutError:
+            return HTTPStatus.GATEWAY_TIMEOUT, {"error": "Translation timed out"}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Translation error: {e}"}
+
+        user = payload.get("user")
+        saved = [await self._save(user, text, translated) for text, translated in zip(texts, translations)]
+        if single:
+            return HTTPStatus.OK, {"input": texts[0], "translation": translations[0], "saved": saved[0]}
+        return HTTPStatus.OK, {"inputs": texts, "translations": translations, "saved": any(saved)}
+
+    # ✅ Minimal HTTP/1.1 handling with keep-alive
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Bad request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                status, payload = await self.route(method.upper(), path, body)
+                extra = {"Retry-After": "1"} if status == HTTPStatus.SERVICE_UNAVAILABLE else None
+                await self._respond(writer, status, payload, keep_alive, extra)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive, extra_headers=None):
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        for name, value in (extra_headers or {}).items():
+            head += f"{name}: {value}\r\n"
+        head += "\r\n"
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(args):
+    from translator.cache import TranslationCache
+    from translator.engine import TranslationEngine
+    from translator.loader import load_translation_model
+    from translator.segmentation import SentencePipeline
+    from translator.warmup import WARMUP_ENABLED, format_warmup, warmup
+
+    model, tokenizer, device, message = load_translation_model()
+    print(message)
+    engine = TranslationEngine(model, tokenizer, device, cache=TranslationCache())
+    # Warm up before listening, so the first request already sees steady-state latency
+    if WARMUP_ENABLED and not args.no_warmup:
+        print(f"✅ {format_warmup(warmup(engine))}")
+    engine = SentencePipeline(engine)
+
+    if args.local_firestore:
+        from firebase.local_firestore import LocalFirestore
+        db = LocalFirestore()
+    else:
+        from firebase.firebase_config import get_db
+        db = get_db()
+
+    service = TranslationService(engine, FirestoreBatchWriter(db).start(), workers=args.workers,
+                                 queue_size=args.queue_size, max_batch_size=args.max_batch_size,
+                                 max_request_texts=args.max_request_texts)
+    server = await service.start(args.host, args.port)
+    print(f"✅ Translation service listening on http://{args.host}:{args.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Async HTTP translation service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2, help="Threads running generate")
+    parser.add_argument("--queue-size", type=int, default=64, help="Pending requests before answering 503")
+    parser.add_argument("--max-batch-size", type=int, default=16, help="Requests coalesced per generate call")
+    parser.add_argument("--max-request-texts", type=int, default=64, help="Texts accepted per batch request")
+    parser.add_argument("--local-firestore", action="store_true", help="Save to an in-memory Firestore stand-in")
+    parser.add_argument("--no-warmup", action="store_true", help="Start listening without the warmup run")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
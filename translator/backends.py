@@ -0,0 +1,102 @@
+# translator/backends.py
+import json
+import os
+
+# ✅ Inference backend, selected with the TRANSLATION_BACKEND environment variable
+#   torch -> fp32 T5ForConditionalGeneration (default)
+#   int8  -> torch dynamic INT8 quantization of every nn.Linear (CPU only)
+#   onnx  -> encoder/decoder exported to ONNX and run through ONNX Runtime
+BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_BACKEND = os.getenv("TRANSLATION_BACKEND", "torch")
+DEFAULT_ONNX_DIR = os.getenv("TRANSLATION_ONNX_DIR", "./fine_tuned_nanot5_onnx")
+
+
+# ✅ Torch dynamic INT8 quantization of the Linear layers (in place, so the
+# fp32 weights are released instead of kept alongside the INT8 copy)
+def quantize_int8(model):
+    import torch
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    model.eval()
+    return model
+
+
+# ✅ What the ONNX export was made from: source path, hub commit and, for a
+# local directory, the size and mtime of its weight/config files
+ONNX_SOURCE_FILE = "translation_source.json"
+
+
+def source_fingerprint(model_name_or_path, commit_hash=None):
+    fingerprint = {"source": model_name_or_path, "commit": commit_hash, "files": {}}
+    if os.path.isdir(model_name_or_path):
+        for name in sorted(os.listdir(model_name_or_path)):
+            if name.endswith((".safetensors", ".bin", ".json")):
+                stat = os.stat(os.path.join(model_name_or_path, name))
+                fingerprint["files"][name] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+
+def _onnx_export_is_current(onnx_dir, fingerprint):
+    try:
+        with open(os.path.join(onnx_dir, ONNX_SOURCE_FILE), encoding="utf-8") as f:
+            return json.load(f) == fingerprint
+    except (OSError, ValueError):
+        return False
+
+
+# ✅ ONNX Runtime seq2seq model (encoder, decoder and decoder-with-past graphs)
+# The export is written to `onnx_dir` with the source fingerprint and reused
+# on later starts while the source weights are unchanged.
+def load_onnx_model(model_name_or_path, onnx_dir=DEFAULT_ONNX_DIR, commit_hash=None):
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImportError(
+            "The onnx backend needs optimum and onnxruntime: pip install optimum[onnxruntime]"
+        ) from e
+
+    fingerprint = source_fingerprint(model_name_or_path, commit_hash)
+    if (onnx_dir and os.path.exists(os.path.join(onnx_dir, "encoder_model.onnx"))
+            and _onnx_export_is_current(onnx_dir, fingerprint)):
+        return ORTModelForSeq2SeqLM.from_pretrained(onnx_dir, use_cache=True)
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name_or_path, export=True, use_cache=True)
+    if onnx_dir:
+        model.save_pretrained(onnx_dir)
+        with open(os.path.join(onnx_dir, ONNX_SOURCE_FILE), "w", encoding="utf-8") as f:
+            json.dump(fingerprint, f, indent=2)
+    return model
+
+
+# ✅ ONNX export source for a loaded model: its packaged directory (fingerprinted
+# on the manifest sha256, no network) or its hub id / model directory
+def onnx_source(model):
+    config = model.config
+    revision = getattr(model, "package_revision", None)
+    if revision is None:
+        return config._name_or_path, getattr(config, "_commit_hash", None)
+    if getattr(config, "pruned_vocab_size", None):
+        raise ValueError(
+            f"{config._name_or_path} has a pruned output vocabulary, which the ONNX export does not support; "
+            "use the torch or int8 backend."
+        )
+    return config._name_or_path, revision
+
+
+# ✅ Convert a loaded fp32 torch model to the requested backend
+# Returns (model, note); the note is appended to the loader's status message.
+def apply_backend(model, device, backend=DEFAULT_BACKEND, onnx_dir=DEFAULT_ONNX_DIR):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if backend == "torch" or device != "cpu":
+        note = "" if backend == "torch" else f" {backend} backend is CPU-only, keeping torch on {device}."
+        backend = "torch"
+    elif backend == "int8":
+        model, note = quantize_int8(model), " Using INT8 dynamic quantization."
+    else:
+        source, revision = onnx_source(model)
+        package_revision = getattr(model, "package_revision", None)
+        model, note = load_onnx_model(source, onnx_dir, revision), " Using ONNX Runtime."
+        model.package_revision = package_revision
+    # Tag the model so caches and reports can tell backends apart
+    model.translation_backend = backend
+    return model, note
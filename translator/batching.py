@@ -0,0 +1,70 @@
+# translator/batching.py
+import threading
+
+DEFAULT_PAD_STRIDE = 8
+DEFAULT_MAX_BATCH_SIZE = 32
+
+
+# ✅ Round a sequence length up to the next multiple of `stride`
+def padded_length(length, stride=DEFAULT_PAD_STRIDE):
+    stride = max(1, stride)
+    return max(stride, -(-length // stride) * stride)
+
+
+# ✅ Group indices into token-length buckets
+# Items are sorted longest-first, grouped by their padded length and split into
+# batches of at most `max_batch_size`, so a short utterance never gets padded
+# up to a long sentence from another bucket. Returns a list of index lists.
+def bucket_by_length(lengths, max_batch_size=DEFAULT_MAX_BATCH_SIZE, stride=DEFAULT_PAD_STRIDE):
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches = []
+    current, current_bucket = [], None
+    for index in order:
+        bucket = padded_length(lengths[index], stride)
+        if current and (bucket != current_bucket or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+        current_bucket = bucket
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
+# ✅ Restore per-batch results to the original input order
+def reorder(batches, batch_results, size):
+    results = [None] * size
+    for indices, outputs in zip(batches, batch_results):
+        for index, output in zip(indices, outputs):
+            results[index] = output
+    return results
+
+
+# ✅ Padding-efficiency counters (real tokens / tokens actually computed)
+class PaddingStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.sequences = 0
+        self.real_tokens = 0
+        self.padded_tokens = 0
+
+    def record(self, lengths, padded_to):
+        with self._lock:
+            self.batches += 1
+            self.sequences += len(lengths)
+            self.real_tokens += sum(lengths)
+            self.padded_tokens += padded_to * len(lengths)
+
+    def efficiency(self):
+        return self.real_tokens / self.padded_tokens if self.padded_tokens else 1.0
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "sequences": self.sequences,
+                "real_tokens": self.real_tokens,
+                "padded_tokens": self.padded_tokens,
+                "padding_efficiency": round(self.efficiency(), 4),
+            }
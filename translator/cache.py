@@ -0,0 +1,111 @@
+# translator/cache.py
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from translator.text_utils import ensure_punctuation
+
+DEFAULT_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "2048"))
+DEFAULT_CACHE_DB = os.getenv("TRANSLATION_CACHE_DB") or None
+
+
+# ✅ Normalize input the same way the chat page does before translating
+def normalize_input(text):
+    text = re.sub(r"\s+", " ", text).strip()
+    return ensure_punctuation(text)
+
+
+# ✅ Cache key: normalized input + prefix + generation settings + model revision
+def make_cache_key(text, prefix, generation_kwargs, model_revision):
+    payload = json.dumps(
+        [normalize_input(text), prefix, generation_kwargs, model_revision],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ✅ Translation Result Cache
+# In-process LRU tier bounded by `max_entries`, plus an optional SQLite tier
+# (`db_path`) that survives restarts. Safe to share between threads.
+class TranslationCache:
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE, db_path=DEFAULT_CACHE_DB):
+        self.max_entries = max(0, int(max_entries))
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, output_text TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def _remember(self, key, value):
+        if self.max_entries == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT output_text FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, output_text) VALUES (?, ?)", (key, value)
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
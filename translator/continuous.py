@@ -0,0 +1,263 @@
+# translator/continuous.py
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from translator.cache import make_cache_key
+from translator.metrics import SIZE_BUCKETS, metrics
+from translator.t5_decoder import T5StepDecoder
+
+CONTINUOUS_BATCHING = os.getenv("TRANSLATION_CONTINUOUS", "0") == "1"
+DEFAULT_MAX_SLOTS = int(os.getenv("TRANSLATION_MAX_SLOTS", "16"))
+
+
+class _Request:
+    def __init__(self, text, future, key):
+        self.text = text
+        self.future = future
+        self.key = key
+        self.budget = 0
+        self.tokens = []
+
+
+# ✅ Continuous (Iteration-Level) Batching Decoder
+# Instead of running model.generate on a fixed micro-batch, one background
+# thread keeps a running decode batch of up to `max_slots` requests and
+# advances it one token at a time. Between steps, waiting requests are encoded
+# and admitted into free slots, and every sequence that produced EOS or used
+# up its token budget is answered and evicted immediately, so short requests
+# never wait for the longest one. Slots are kept contiguous: an evicted slot
+# is filled by moving the last active slot into it, so each step works on
+# plain slices of the preallocated per-slot self/cross-attention KV buffers.
+# Decoding is greedy (one hypothesis per slot), same settings as streaming.
+class ContinuousBatchDecoder:
+    def __init__(self, engine, max_slots=DEFAULT_MAX_SLOTS, encoder_capacity=64):
+        self.engine = engine
+        self.decoder = T5StepDecoder(engine.model)
+        self.max_slots = max(1, int(max_slots))
+        self.max_steps = self._max_new_tokens(10 ** 6)
+        self._encoder_capacity = encoder_capacity
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._slots = []  # active _Request per slot index
+        self._buffers = None
+        self.steps_run = 0
+        self.requests_served = 0
+
+    def _max_new_tokens(self, input_length):
+        kwargs = self.engine.generate_kwargs(input_length)
+        if "max_new_tokens" in kwargs:
+            return kwargs["max_new_tokens"]
+        return kwargs["max_length"] - 1  # max_length counts the decoder start token
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="translation-continuous", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, text):
+        future = Future()
+        if self._stop_event.is_set():
+            future.set_exception(RuntimeError("Continuous decoder is stopped."))
+            return future
+        key = None
+        if self.engine.cache is not None:
+            # Greedy with the engine's budget: same key as stream_translate()
+            key = make_cache_key(text, self.engine.prefix, dict(self.engine.generation_kwargs(), num_beams=1),
+                                 self.engine.model_revision())
+            cached = self.engine.cache.get(key)
+            if cached is not None:
+                metrics.inc("cache_hits_total")
+                future.set_result(cached)
+                return future
+            metrics.inc("cache_misses_total")
+        self.start()
+        self._queue.put(_Request(text, future, key))
+        return future
+
+    def tokenize(self, texts):
+        return self.engine.tokenize(texts)
+
+    # ✅ Decode through the running batch without the cache (warmup)
+    def generate_batch(self, texts, **kwargs):
+        futures = [Future() for _ in texts]
+        self.start()
+        for text, future in zip(texts, futures):
+            self._queue.put(_Request(text, future, None))
+        return [future.result() for future in futures]
+
+    def translate(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    # ✅ Engine-style batch call (SentencePipeline, bulk jobs); every text gets its own slot
+    def translate_batch(self, texts, **kwargs):
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def stream_translate(self, text, timeout=60.0):
+        return self.engine.stream_translate(text, timeout)
+
+    def postprocess(self, translated_text):
+        return self.engine.postprocess(translated_text)
+
+    # ✅ Preallocated per-slot buffers; the encoder axis grows when a longer input arrives
+    def _allocate(self, encoder_length):
+        import torch
+        capacity = max(self._encoder_capacity, encoder_length)
+        if self._buffers is not None and self._buffers["cross"][0][0].shape[2] >= capacity:
+            return
+        decoder = self.decoder
+        cross_shape = (self.max_slots, decoder.num_heads, capacity, decoder.head_dim)
+        cross = [(torch.zeros(cross_shape, dtype=decoder.dtype, device=decoder.device),
+                  torch.zeros(cross_shape, dtype=decoder.dtype, device=decoder.device))
+                 for _ in range(decoder.num_layers)]
+        encoder_mask = torch.zeros((self.max_slots, capacity), dtype=torch.bool, device=decoder.device)
+        if self._buffers is None:
+            self._buffers = {
+                "self": decoder.empty_self_cache(self.max_slots, self.max_steps + 1),
+                "tokens": torch.full((self.max_slots,), decoder.start_token_id, dtype=torch.long,
+                                     device=decoder.device),
+                "positions": torch.zeros((self.max_slots,), dtype=torch.long, device=decoder.device),
+                "encoder_lengths": torch.zeros((self.max_slots,), dtype=torch.long, device=decoder.device),
+            }
+        else:
+            old = self._buffers["cross"][0][0].shape[2]
+            for (new_k, new_v), (old_k, old_v) in zip(cross, self._buffers["cross"]):
+                new_k[:, :, :old] = old_k
+                new_v[:, :, :old] = old_v
+            encoder_mask[:, :old] = self._buffers["encoder_mask"]
+        self._buffers["cross"] = cross
+        self._buffers["encoder_mask"] = encoder_mask
+        self._encoder_capacity = capacity
+
+    # ✅ Encode waiting requests together and place them in free slots
+    def _admit(self, block):
+        waiting = []
+        try:
+            if block:
+                waiting.append(self._queue.get(timeout=0.1))
+            while len(self._slots) + len(waiting) < self.max_slots:
+                waiting.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        waiting = [request for request in waiting if request.future.set_running_or_notify_cancel()]
+        if not waiting:
+            return
+
+        admitted = len(self._slots)
+        try:
+            input_ids = self.engine.tokenize([request.text for request in waiting])
+            inputs = self.engine.collate(input_ids)
+            encoder_states = self.decoder.encode(inputs["input_ids"], inputs["attention_mask"])
+            cross = self.decoder.cross_kv(encoder_states)
+
+            width = inputs["input_ids"].shape[1]
+            self._allocate(width)
+            buffers = self._buffers
+            for row, (request, ids) in enumerate(zip(waiting, input_ids)):
+                slot = len(self._slots)
+                request.budget = min(self._max_new_tokens(len(ids)), self.max_steps)
+                for (slot_k, slot_v), (new_k, new_v) in zip(buffers["cross"], cross):
+                    slot_k[slot, :, :width] = new_k[row]
+                    slot_v[slot, :, :width] = new_v[row]
+                buffers["encoder_mask"][slot] = False
+                buffers["encoder_mask"][slot, :width] = inputs["attention_mask"][row].bool()
+                buffers["tokens"][slot] = self.decoder.start_token_id
+                buffers["positions"][slot] = 0
+                buffers["encoder_lengths"][slot] = width
+                self._slots.append(request)
+        except Exception as e:
+            # Nothing of this block is decoded: drop the slots it took and fail its requests
+            del self._slots[admitted:]
+            metrics.inc("failures_total", len(waiting))
+            for request in waiting:
+                request.future.set_exception(e)
+
+    def _move_slot(self, source, target):
+        buffers = self._buffers
+        for cache_k, cache_v in buffers["self"] + buffers["cross"]:
+            cache_k[target] = cache_k[source]
+            cache_v[target] = cache_v[source]
+        for name in ("encoder_mask", "tokens", "positions", "encoder_lengths"):
+            buffers[name][target] = buffers[name][source]
+        self._slots[target] = self._slots[source]
+
+    # ✅ Answer finished requests and compact the remaining slots
+    def _evict(self, finished):
+        done = [self._slots[slot] for slot in finished]
+        for slot in sorted(finished, reverse=True):
+            last = len(self._slots) - 1
+            if slot != last:
+                self._move_slot(last, slot)
+            self._slots.pop()
+        for request in done:
+            text = self.engine.postprocess(
+                self.engine.tokenizer.decode(request.tokens, skip_special_tokens=True))
+            if request.key is not None:
+                self.engine.cache.put(request.key, text)
+            request.future.set_result(text)
+        self.requests_served += len(done)
+
+    # ✅ One decode step for every active slot
+    def _step(self):
+        active = len(self._slots)
+        buffers = self._buffers
+        positions = buffers["positions"][:active]
+        key_length = int(positions.max()) + 1
+        encoder_length = int(buffers["encoder_lengths"][:active].max())
+        cross = [(k[:active, :, :encoder_length], v[:active, :, :encoder_length]) for k, v in buffers["cross"]]
+        self_cache = [(k[:active], v[:active]) for k, v in buffers["self"]]
+        cross_bias = self.decoder.mask_bias(buffers["encoder_mask"][:active, :encoder_length])[:, None, None, :]
+        logits = self.decoder.step(buffers["tokens"][:active], positions, self_cache, cross,
+                                   cross_bias, key_length)
+        next_tokens = self.decoder.token_ids(logits.argmax(dim=-1))
+        buffers["tokens"][:active] = next_tokens
+        buffers["positions"][:active] += 1
+        self.steps_run += 1
+        metrics.observe("active_slots", active, buckets=SIZE_BUCKETS)
+
+        finished = []
+        for slot, (request, token) in enumerate(zip(self._slots, next_tokens.tolist())):
+            request.tokens.append(token)
+            if token == self.decoder.eos_token_id or len(request.tokens) >= request.budget:
+                finished.append(slot)
+        if finished:
+            self._evict(finished)
+
+    def _fail_active(self, error):
+        metrics.inc("failures_total", len(self._slots))
+        for request in self._slots:
+            if not request.future.done():
+                request.future.set_exception(error)
+        self._slots = []
+
+    def _run(self):
+        import torch
+        with torch.inference_mode():
+            while not self._stop_event.is_set():
+                # Any error ends the requests it touched, never the decoder thread
+                try:
+                    if len(self._slots) < self.max_slots:
+                        self._admit(block=not self._slots)
+                    if self._slots:
+                        self._step()
+                except Exception as e:
+                    self._fail_active(e)
+        self._fail_active(RuntimeError("Continuous decoder is stopped."))
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("Continuous decoder is stopped."))
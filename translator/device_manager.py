@@ -0,0 +1,222 @@
+# translator/device_manager.py
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from translator.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FAULT_RATE = float(os.getenv("TRANSLATION_FAULT_RATE", "0"))
+
+# Messages seen in error_logs.log when the GPU goes bad at generate time
+ACCELERATOR_ERROR_MARKERS = (
+    "CUDA", "CUBLAS_STATUS", "CUDNN_STATUS", "cuDNN", "out of memory", "device-side assert", "NCCL",
+)
+
+
+class InjectedDeviceError(RuntimeError):
+    pass
+
+
+def is_accelerator_error(error):
+    if isinstance(error, InjectedDeviceError):
+        return True
+    try:
+        import torch
+        if isinstance(error, (torch.cuda.CudaError, torch.cuda.OutOfMemoryError)):
+            return True
+    except (ImportError, AttributeError):
+        pass
+    message = str(error)
+    return isinstance(error, RuntimeError) and any(marker in message for marker in ACCELERATOR_ERROR_MARKERS)
+
+
+# ✅ Fault injection: fail a fraction of accelerator calls (TRANSLATION_FAULT_RATE)
+# or exactly the next N calls, so the fallback path can be exercised on CPU.
+class FaultInjector:
+    def __init__(self, rate=FAULT_RATE, seed=None):
+        self.rate = rate
+        self.fail_next = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def check(self):
+        with self._lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                raise InjectedDeviceError("CUBLAS_STATUS_ALLOC_FAILED (injected)")
+        if self.rate and self._random.random() < self.rate:
+            raise InjectedDeviceError("CUBLAS_STATUS_NOT_INITIALIZED (injected)")
+
+
+# ✅ Small kernel + synchronize on the accelerator; raises if the device is unusable
+def accelerator_health_check(device):
+    import torch
+    if device == "cpu":
+        return
+    x = torch.ones((64, 64), device=device)
+    (x @ x).sum().item()
+    torch.cuda.synchronize(device)
+
+
+# ✅ Warm CPU copy of a (GPU) model, built without a second from_pretrained
+def make_cpu_replica(model):
+    import torch
+    from transformers.modeling_utils import no_init_weights
+
+    with no_init_weights(), torch.device("meta"):
+        replica = type(model)(model.config)
+    state = {name: tensor.detach().to("cpu", copy=True) for name, tensor in model.state_dict().items()}
+    replica.load_state_dict(state, strict=False, assign=True)
+    replica.tie_weights()
+    replica.generation_config = model.generation_config
+    return replica.eval()
+
+
+# ✅ Accelerator Device Manager
+# Wraps a primary (GPU) TranslationEngine and a warm CPU replica behind the
+# engine interface. A batch that fails on the accelerator with a device error
+# is re-run on the replica, so the request still succeeds. Failures are
+# tracked over the last `window` accelerator calls; when the failure rate
+# reaches `failure_threshold` the accelerator is demoted and everything runs
+# on CPU. After `cooldown` seconds (doubling on every failed probe, capped at
+# `max_cooldown`) the next request runs a health check and re-promotes the
+# accelerator if it passes.
+class DeviceManager:
+    def __init__(self, primary, replica, health_check=None, injector=None, window=20,
+                 failure_threshold=0.25, min_samples=4, cooldown=30.0, max_cooldown=600.0,
+                 clock=time.monotonic):
+        self.primary = primary
+        self.replica = replica
+        self.health_check = health_check or (lambda: accelerator_health_check(primary.device))
+        self.injector = injector or FaultInjector()
+        self.failure_threshold = failure_threshold
+        self.min_samples = min_samples
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._cooldown = cooldown
+        self._retry_at = None
+        self.demoted = False
+        self.fallbacks = 0
+        self.demotions = 0
+        self.repromotions = 0
+
+    @classmethod
+    def for_engine(cls, engine, replica_engine=None, **kwargs):
+        from translator.engine import TranslationEngine
+        if replica_engine is None:
+            replica_engine = TranslationEngine(
+                make_cpu_replica(engine.model), engine.tokenizer, "cpu", prefix=engine.prefix,
+                max_length=engine.max_length, num_beams=engine.num_beams, use_cache=engine.use_cache,
+                cache=engine.cache, max_batch_size=engine.max_batch_size, pad_stride=engine.pad_stride,
+                budget=engine.budget, lean_decoding=engine.lean_decoding, compiled=engine.compiled,
+            )
+        return cls(engine, replica_engine, **kwargs)
+
+    # The scheduler and the pages only use these engine attributes
+    @property
+    def engine(self):
+        return self.replica if self.demoted else self.primary
+
+    def postprocess(self, translated_text):
+        return self.engine.postprocess(translated_text)
+
+    def failure_rate(self):
+        with self._lock:
+            return (len(self._outcomes) - sum(self._outcomes)) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _record(self, ok):
+        with self._lock:
+            self._outcomes.append(ok)
+            failures = len(self._outcomes) - sum(self._outcomes)
+            if (not ok and not self.demoted and len(self._outcomes) >= self.min_samples
+                    and failures / len(self._outcomes) >= self.failure_threshold):
+                self.demoted = True
+                self.demotions += 1
+                self._cooldown = self.base_cooldown
+                self._retry_at = self.clock() + self._cooldown
+                metrics.inc("device_demotions_total")
+                logger.error(f"Accelerator demoted to CPU after {failures}/{len(self._outcomes)} failures")
+
+    # ✅ Probe the accelerator once the cooldown has passed; re-promote on success
+    def _maybe_repromote(self):
+        with self._lock:
+            if not self.demoted or self.clock() < self._retry_at:
+                return
+            self._retry_at = float("inf")  # one probe at a time
+        try:
+            self.injector.check()
+            self.health_check()
+        except Exception as e:
+            with self._lock:
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._retry_at = self.clock() + self._cooldown
+            logger.error(f"Accelerator health check failed: {e}")
+            return
+        with self._lock:
+            self.demoted = False
+            self._outcomes.clear()
+            self.repromotions += 1
+        metrics.inc("device_repromotions_total")
+
+    def _fallback(self, error):
+        self._record(False)
+        self.fallbacks += 1
+        metrics.inc("device_fallbacks_total")
+        logger.error(f"Accelerator error, rerouting to CPU: {error}")
+
+    def translate_batch(self, texts, **kwargs):
+        texts = list(texts)
+        self._maybe_repromote()
+        if self.demoted:
+            return self.replica.translate_batch(texts, **kwargs)
+        try:
+            self.injector.check()
+            results = self.primary.translate_batch(texts, **kwargs)
+        except Exception as e:
+            if not is_accelerator_error(e):
+                raise
+            self._fallback(e)
+            return self.replica.translate_batch(texts, **kwargs)
+        self._record(True)
+        return results
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    # ✅ Streaming falls back only if the accelerator fails before the first piece
+    def stream_translate(self, text, timeout=60.0):
+        self._maybe_repromote()
+        if self.demoted:
+            yield from self.replica.stream_translate(text, timeout)
+            return
+        emitted = False
+        try:
+            self.injector.check()
+            for piece in self.primary.stream_translate(text, timeout):
+                emitted = True
+                yield piece
+        except Exception as e:
+            if emitted or not is_accelerator_error(e):
+                raise
+            self._fallback(e)
+            yield from self.replica.stream_translate(text, timeout)
+            return
+        self._record(True)
+
+    def stats(self):
+        return {
+            "device": "cpu" if self.demoted else getattr(self.primary, "device", "accelerator"),
+            "demoted": self.demoted,
+            "failure_rate": round(self.failure_rate(), 4),
+            "fallbacks": self.fallbacks,
+            "demotions": self.demotions,
+            "repromotions": self.repromotions,
+        }
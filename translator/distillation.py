@@ -0,0 +1,116 @@
+# translator/distillation.py
+# ✅ Shallow-Decoder Student Distillation
+# Decoding runs the decoder once per output token (per beam) while the
+# encoder runs once per request, so a student keeps the teacher's full
+# encoder and only 1-2 decoder layers. The student starts from teacher
+# weights (encoder, embeddings, lm_head and the chosen decoder layers) and is
+# trained on the teacher's own translations of a Manglish corpus
+# (sequence-level distillation), optionally mixed with the teacher's
+# per-token distributions (soft targets, `alpha` > 0). CPU-only is fine:
+# nothing here needs a GPU.
+import copy
+import random
+import time
+
+
+# ✅ Teacher decoder layers kept by default: first and last
+def default_decoder_layers(teacher, count):
+    total = teacher.config.num_decoder_layers
+    if count == 1:
+        return [total - 1]
+    return sorted({round(i * (total - 1) / (count - 1)) for i in range(count)})
+
+
+# ✅ Student with the teacher's encoder and the given teacher decoder layers
+def make_student(teacher, decoder_layers):
+    from transformers import T5ForConditionalGeneration
+    config = copy.deepcopy(teacher.config)
+    config.num_decoder_layers = len(decoder_layers)
+    student = T5ForConditionalGeneration(config)
+
+    teacher_state = teacher.state_dict()
+    state = {name: tensor for name, tensor in teacher_state.items() if not name.startswith("decoder.block.")}
+    for index, source in enumerate(decoder_layers):
+        prefix = f"decoder.block.{source}."
+        for name, tensor in teacher_state.items():
+            if name.startswith(prefix):
+                state[f"decoder.block.{index}." + name[len(prefix):]] = tensor
+    # Only the first decoder layer owns the relative position bias
+    bias = "layer.0.SelfAttention.relative_attention_bias.weight"
+    state[f"decoder.block.0.{bias}"] = teacher_state[f"decoder.block.0.{bias}"]
+    student.load_state_dict(state, strict=False)
+    student.tie_weights()
+    student.config.distilled_from = getattr(teacher.config, "_name_or_path", None)
+    student.config.teacher_decoder_layers = list(decoder_layers)
+    student.generation_config = copy.deepcopy(teacher.generation_config)
+    return student.eval()
+
+
+# ✅ Teacher translations as training targets: token ids ending with EOS
+def pseudo_labels(engine, sources, batch_size=16):
+    import torch
+    eos_id = engine.eos_token_id()
+    labels = []
+    for start in range(0, len(sources), batch_size):
+        inputs = engine.encode(sources[start:start + batch_size])
+        kwargs = engine.generate_kwargs(int(inputs["attention_mask"].sum(dim=1).max()))
+        with torch.inference_mode():
+            outputs = engine.model.generate(**inputs, **kwargs)
+        for row in outputs[:, 1:].tolist():
+            if eos_id in row:
+                row = row[:row.index(eos_id)]
+            labels.append(row + [eos_id])
+    return labels
+
+
+def _batch(engine, sources, labels):
+    import torch
+    inputs = engine.encode(sources)
+    width = max(len(row) for row in labels)
+    label_ids = torch.full((len(labels), width), -100, dtype=torch.long)
+    for index, row in enumerate(labels):
+        label_ids[index, :len(row)] = torch.tensor(row, dtype=torch.long)
+    return inputs, label_ids.to(inputs["input_ids"].device)
+
+
+# ✅ Train the student on (source, teacher label) pairs
+# loss = (1 - alpha) * cross-entropy on the labels
+#      + alpha * T^2 * KL(teacher || student) at temperature T (needs `teacher`)
+# Returns the mean loss of every epoch.
+def distill(student, engine, sources, labels, teacher=None, epochs=3, batch_size=16, learning_rate=3e-4,
+            alpha=0.0, temperature=2.0, seed=0, log=print):
+    import torch
+    import torch.nn.functional as F
+
+    if alpha > 0 and teacher is None:
+        raise ValueError("Soft-target distillation (alpha > 0) needs the teacher model.")
+    rng = random.Random(seed)
+    torch.manual_seed(seed)
+    optimizer = torch.optim.AdamW([p for p in student.parameters() if p.requires_grad], lr=learning_rate)
+    pairs = list(zip(sources, labels))
+    history = []
+    student.train()
+    for epoch in range(epochs):
+        rng.shuffle(pairs)
+        total, start = 0.0, time.perf_counter()
+        for offset in range(0, len(pairs), batch_size):
+            batch_sources, batch_labels = zip(*pairs[offset:offset + batch_size])
+            inputs, label_ids = _batch(engine, list(batch_sources), list(batch_labels))
+            outputs = student(**inputs, labels=label_ids)
+            loss = outputs.loss
+            if alpha > 0:
+                with torch.no_grad():
+                    teacher_logits = teacher(**inputs, labels=label_ids).logits
+                mask = label_ids != -100
+                soft = F.kl_div(F.log_softmax(outputs.logits[mask] / temperature, dim=-1),
+                                F.log_softmax(teacher_logits[mask] / temperature, dim=-1),
+                                log_target=True, reduction="batchmean")
+                loss = (1 - alpha) * loss + alpha * temperature ** 2 * soft
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total += loss.item() * len(batch_sources)
+        history.append(total / len(pairs))
+        log(f"epoch {epoch + 1}/{epochs}: loss {history[-1]:.4f} ({time.perf_counter() - start:.1f}s)")
+    student.eval()
+    return history
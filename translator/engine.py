@@ -0,0 +1,305 @@
+# translator/engine.py
+import threading
+
+from translator.batching import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_PAD_STRIDE,
+    PaddingStats,
+    bucket_by_length,
+    padded_length,
+    reorder,
+)
+from translator.cache import make_cache_key, normalize_input
+from translator.generation_policy import DEFAULT_BUDGET
+from translator.lean_decode import COMPILED_DECODING, LEAN_DECODING, LeanDecoder
+from translator.metrics import metrics
+from translator.text_utils import TRANSLATION_PREFIX, clean_translation, ensure_punctuation
+
+
+# ✅ Headless Translation Engine (no Streamlit / Firebase imports)
+# Wraps the (model, tokenizer, device) tuple returned by load_model() and
+# translates many inputs with padded model.generate calls, one per
+# token-length bucket (see translator/batching.py).
+class TranslationEngine:
+    def __init__(self, model, tokenizer, device="cpu", prefix=TRANSLATION_PREFIX,
+                 max_length=30, num_beams=2, use_cache=True, cache=None,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE, pad_stride=DEFAULT_PAD_STRIDE, budget=DEFAULT_BUDGET,
+                 lean_decoding=LEAN_DECODING, compiled=COMPILED_DECODING):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.prefix = prefix
+        self.max_length = max_length
+        self.num_beams = num_beams
+        self.use_cache = use_cache
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.pad_stride = pad_stride
+        self.budget = budget
+        self.lean_decoding = lean_decoding or compiled
+        self.compiled = compiled
+        self._lean_decoder = None
+        # The lean loop reuses its buffers: one call at a time (service / Streamlit threads)
+        self._lean_lock = threading.Lock()
+        self.padding_stats = PaddingStats()
+        self.truncated_outputs = 0
+        self.generated_tokens = 0
+        self._prefix_tokens = None
+
+    @classmethod
+    def from_loaded(cls, loaded, **kwargs):
+        model, tokenizer, device = loaded[:3]
+        return cls(model, tokenizer, device, **kwargs)
+
+    # Describes the decoding settings (also part of the cache key)
+    def generation_kwargs(self):
+        if self.budget is not None:
+            return {"budget": self.budget.describe(), "use_cache": self.use_cache}
+        return {"max_length": self.max_length, "num_beams": self.num_beams, "use_cache": self.use_cache}
+
+    def prefix_tokens(self):
+        if self._prefix_tokens is None:
+            # Without the trailing EOS the tokenizer appends
+            self._prefix_tokens = max(0, len(self.tokenizer(self.prefix)["input_ids"]) - 1)
+        return self._prefix_tokens
+
+    # ✅ Arguments for model.generate, given the (unpadded) length of the longest input
+    def generate_kwargs(self, input_length):
+        if self.budget is None:
+            return self.generation_kwargs()
+        input_tokens = max(1, input_length - self.prefix_tokens() - 1)
+        return dict(self.budget.for_input(input_tokens), use_cache=self.use_cache)
+
+    # ✅ Identifies the weights so cached results are dropped when the model changes
+    def model_revision(self):
+        config = getattr(self.model, "config", None)
+        return [
+            getattr(config, "_name_or_path", None),
+            getattr(config, "_commit_hash", None),
+            getattr(self.model, "package_revision", None),
+            getattr(self.model, "translation_backend", "torch"),
+        ]
+
+    # ✅ Tokenize without padding; batches are padded per bucket in collate()
+    # The text is normalized like the cache key, so inputs sharing a key share their tokens
+    def tokenize(self, texts):
+        prefixed = [self.prefix + normalize_input(text) for text in texts]
+        return self.tokenizer(prefixed)["input_ids"]
+
+    # ✅ Right-pad one bucket to a multiple of `pad_stride`
+    # Only input_ids/attention_mask are built: T5 generate rejects token_type_ids.
+    def collate(self, input_ids):
+        import torch
+        width = padded_length(max(len(ids) for ids in input_ids), self.pad_stride)
+        pad_id = self.tokenizer.pad_token_id or 0
+        batch_ids = torch.full((len(input_ids), width), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(input_ids), width), dtype=torch.long)
+        for row, ids in enumerate(input_ids):
+            batch_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, :len(ids)] = 1
+        return {"input_ids": batch_ids.to(self.device), "attention_mask": attention_mask.to(self.device)}
+
+    def encode(self, texts):
+        return self.collate(self.tokenize(texts))
+
+    # ✅ One generate call per length bucket, results back in input order
+    # single_batch=True pads everything into one call instead (up to
+    # max_batch_size), so the batch finishes with its longest input.
+    def generate_batch(self, texts, single_batch=False):
+        import torch
+        if not texts:
+            return []
+        with metrics.span("tokenize"):
+            input_ids = self.tokenize(texts)
+        lengths = [len(ids) for ids in input_ids]
+        if single_batch:
+            batches = [list(range(start, min(start + self.max_batch_size, len(texts))))
+                       for start in range(0, len(texts), self.max_batch_size)]
+        else:
+            batches = bucket_by_length(lengths, self.max_batch_size, self.pad_stride)
+
+        decoded = []
+        for indices in batches:
+            inputs = self.collate([input_ids[i] for i in indices])
+            batch_lengths, padded_to = [lengths[i] for i in indices], inputs["input_ids"].shape[1]
+            self.padding_stats.record(batch_lengths, padded_to)
+            # Padding efficiency = input_tokens_total / padded_input_tokens_total
+            metrics.inc("input_tokens_total", sum(batch_lengths))
+            metrics.inc("padded_input_tokens_total", padded_to * len(batch_lengths))
+            kwargs = self.generate_kwargs(max(lengths[i] for i in indices))
+            with metrics.span("generate"), torch.inference_mode():
+                outputs = self._generate(inputs, kwargs)
+            self._count_truncated(outputs)
+            self._count_generated(outputs)
+            with metrics.span("decode"):
+                decoded.append(self.tokenizer.batch_decode(outputs, skip_special_tokens=True))
+            metrics.inc("generate_batches_total")
+        return reorder(batches, decoded, len(texts))
+
+    # ✅ model.generate, or the lean decode loop (same tokens) when enabled for a PyTorch T5 model
+    # and the settings are ones the loop implements
+    def _run_generate(self, inputs, kwargs):
+        if self.lean_decoding and getattr(self.model, "translation_backend", "torch") == "torch":
+            with self._lean_lock:
+                if self._lean_decoder is None:
+                    self._lean_decoder = LeanDecoder(self.model, compiled=self.compiled)
+                if self._lean_decoder.supports(kwargs):
+                    metrics.inc("lean_generate_total")
+                    return self._lean_decoder.generate(**inputs, **kwargs)
+        return self.model.generate(**inputs, **kwargs)
+
+    # ✅ Greedy rows the model is unsure about are decoded again with beams
+    def _generate(self, inputs, kwargs):
+        min_confidence = self.budget.min_confidence if self.budget is not None else None
+        if kwargs.get("num_beams", 1) > 1 or not min_confidence:
+            return self._run_generate(inputs, kwargs)
+
+        import torch
+        result = self.model.generate(**inputs, **kwargs, return_dict_in_generate=True, output_scores=True)
+        scores = self.model.compute_transition_scores(result.sequences, result.scores, normalize_logits=True)
+        generated = result.sequences[:, 1:]
+        mask = generated != self.model.config.pad_token_id
+        confidence = (scores.exp() * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        retry = (confidence < min_confidence).nonzero().flatten().tolist()
+        if not retry:
+            return result.sequences
+
+        input_length = int(inputs["attention_mask"].sum(dim=1).max())
+        beam_kwargs = dict(self.budget.beam_kwargs(max(1, input_length - self.prefix_tokens() - 1)),
+                           use_cache=self.use_cache)
+        rerun = self._run_generate({name: value[retry] for name, value in inputs.items()}, beam_kwargs)
+        metrics.inc("beam_retries_total", len(retry))
+
+        width = max(result.sequences.shape[1], rerun.shape[1])
+        pad_id = self.model.config.pad_token_id
+        merged = torch.full((result.sequences.shape[0], width), pad_id, dtype=result.sequences.dtype,
+                            device=result.sequences.device)
+        merged[:, :result.sequences.shape[1]] = result.sequences
+        merged[retry] = pad_id
+        merged[retry, :rerun.shape[1]] = rerun
+        return merged
+
+    # ✅ The EOS id generate stops on: generation_config first (fine_tuned_nanot5's
+    # config.json and generation_config.json disagree), the first of a list
+    def eos_token_id(self):
+        eos_id = getattr(getattr(self.model, "generation_config", None), "eos_token_id", None)
+        if eos_id is None:
+            eos_id = self.model.config.eos_token_id
+        if isinstance(eos_id, (list, tuple)):
+            eos_id = eos_id[0]
+        return eos_id
+
+    # ✅ Outputs that ran out of budget before EOS (silently cut translations)
+    def _count_truncated(self, outputs):
+        eos_id = self.eos_token_id()
+        truncated = int((~(outputs[:, 1:] == eos_id).any(dim=1)).sum())
+        if truncated:
+            self.truncated_outputs += truncated
+            metrics.inc("truncated_outputs_total", truncated)
+
+    # ✅ Generated tokens, ignoring the decoder start token and padding after EOS
+    def _count_generated(self, outputs):
+        self.generated_tokens += int((outputs[:, 1:] != self.model.config.pad_token_id).sum())
+
+    # ✅ Same post-processing as the chat page: first sentence + punctuation
+    def postprocess(self, translated_text):
+        translated_text = clean_translation(translated_text)
+        return ensure_punctuation(translated_text)
+
+    def _translate_uncached(self, texts, single_batch=False):
+        generated = self.generate_batch(texts, single_batch=single_batch)
+        with metrics.span("clean_translation"):
+            return [self.postprocess(text) for text in generated]
+
+    # ✅ Cache lookups first; only misses (deduplicated) go through generate
+    def translate_batch(self, texts, single_batch=False):
+        texts = list(texts)
+        metrics.inc("requests_total", len(texts))
+        if self.cache is None:
+            return self._translate_uncached(texts, single_batch)
+
+        generation_kwargs = self.generation_kwargs()
+        revision = self.model_revision()
+        keys = [make_cache_key(text, self.prefix, generation_kwargs, revision) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+        hits = sum(result is not None for result in results)
+        metrics.inc("cache_hits_total", hits)
+        metrics.inc("cache_misses_total", len(results) - hits)
+
+        pending = {}
+        for key, text, result in zip(keys, texts, results):
+            if result is None and key not in pending:
+                pending[key] = text
+        if pending:
+            translated = dict(zip(pending, self._translate_uncached(list(pending.values()), single_batch)))
+            for key, value in translated.items():
+                self.cache.put(key, value)
+            results = [translated.get(key, result) for key, result in zip(keys, results)]
+        return results
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    # ✅ Streaming translation: yields decoded text pieces as they are generated
+    # Hugging Face streamers do not support beam search, so streaming decodes
+    # greedily (num_beams=1). Generation is stopped as soon as the first
+    # sentence is complete, since clean_translation() keeps only that sentence.
+    # Join the pieces and pass them through postprocess() for the final text.
+    def stream_translate(self, text, timeout=60.0):
+        import torch
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+        key = None
+        if self.cache is not None:
+            key = make_cache_key(text, self.prefix, dict(self.generation_kwargs(), num_beams=1),
+                                 self.model_revision())
+            cached = self.cache.get(key)
+            if cached is not None:
+                metrics.inc("cache_hits_total")
+                yield cached
+                return
+            metrics.inc("cache_misses_total")
+
+        stop_event = threading.Event()
+
+        class StopWhenAsked(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs):
+                return stop_event.is_set()
+
+        stopping_criteria = StoppingCriteriaList([StopWhenAsked()])
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True,
+                                        timeout=timeout)
+        inputs = self.encode([text])
+        generation_kwargs = dict(self.generate_kwargs(int(inputs["attention_mask"].sum())), num_beams=1)
+        generation_kwargs.pop("early_stopping", None)
+        errors = []
+
+        def run():
+            try:
+                with torch.inference_mode():
+                    self.model.generate(**inputs, **generation_kwargs, streamer=streamer,
+                                        stopping_criteria=stopping_criteria)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        metrics.inc("requests_total")
+        thread = threading.Thread(target=run, name="translation-stream", daemon=True)
+        with metrics.span("stream_generate"):
+            thread.start()
+            generated = ""
+            for piece in streamer:
+                if "." in piece:
+                    piece = piece[:piece.index(".") + 1]
+                    stop_event.set()
+                generated += piece
+                if piece:
+                    yield piece
+                if stop_event.is_set():
+                    break
+            stop_event.set()
+            thread.join(timeout)
+        if errors:
+            raise errors[0]
+        if key is not None:
+            self.cache.put(key, self.postprocess(generated))
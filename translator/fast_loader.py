@@ -0,0 +1,131 @@
+# translator/fast_loader.py
+import hashlib
+import json
+import os
+import struct
+import time
+
+MANIFEST_NAME = "package.json"
+WEIGHTS_NAME = "model.safetensors"
+PACKAGED_MODEL_DIR = os.getenv("TRANSLATION_MODEL_DIR", "./fine_tuned_nanot5_packaged")
+
+# safetensors dtype tags -> torch dtype names
+_DTYPES = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8", "U8": "uint8", "BOOL": "bool",
+}
+
+
+def is_packaged(model_dir):
+    return bool(model_dir) and os.path.isfile(os.path.join(model_dir, MANIFEST_NAME))
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(model_dir):
+    with open(os.path.join(model_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ✅ Map a .safetensors file and return tensors that are views into the mapping
+# The file is mapped copy-on-write (MAP_PRIVATE): nothing is read until a page
+# is touched, and several processes mapping the same file share the page cache.
+def mmap_safetensors(path):
+    import torch
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+    data_start = 8 + header_size
+    nbytes = os.path.getsize(path)
+
+    storage = torch.UntypedStorage.from_file(path, shared=False, nbytes=nbytes)
+    raw = torch.empty(0, dtype=torch.uint8).set_(storage)
+
+    tensors, copied = {}, 0
+    for name, info in header.items():
+        dtype = getattr(torch, _DTYPES[info["dtype"]])
+        begin, end = info["data_offsets"]
+        chunk = raw[data_start + begin:data_start + end]
+        itemsize = torch.empty(0, dtype=dtype).element_size()
+        if (data_start + begin) % itemsize:
+            chunk = chunk.clone()  # misaligned for a zero-copy dtype view
+            copied += 1
+        tensors[name] = chunk.view(dtype).reshape(info["shape"])
+    return tensors, copied
+
+
+# ✅ Load a directory written by package_model.py: no network, no weight copies
+# The model is built on the meta device (no allocation, no random init) and the
+# mmapped tensors are assigned as its parameters. Returns (model, tokenizer, timings).
+# The model names its directory as _name_or_path and carries the weights'
+# sha256 as `package_revision`, so caches keyed on the model revision tell a
+# package apart from its hub source and from other packages (pruned, distilled).
+def load_packaged_model(model_dir=PACKAGED_MODEL_DIR, device="cpu", verify=False):
+    import torch
+    from transformers import AutoTokenizer, T5Config, T5ForConditionalGeneration
+    from transformers.modeling_utils import no_init_weights
+
+    timings = {}
+    start = last = time.perf_counter()
+
+    def mark(stage):
+        nonlocal last
+        now = time.perf_counter()
+        timings[stage] = round(now - last, 4)
+        last = now
+
+    manifest = read_manifest(model_dir)
+    weights_path = os.path.join(model_dir, manifest.get("weights", WEIGHTS_NAME))
+    if verify and file_sha256(weights_path) != manifest.get("sha256"):
+        raise ValueError(f"{weights_path} does not match the checksum in {MANIFEST_NAME}.")
+    config = T5Config.from_pretrained(model_dir, local_files_only=True)
+    config._name_or_path = model_dir
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+    mark("config_tokenizer")
+
+    state_dict, copied = mmap_safetensors(weights_path)
+    mark("mmap")
+
+    # no_init_weights also skips the nn.init calls, which on meta tensors still
+    # cost a second importing torch's reference kernels
+    with no_init_weights(), torch.device("meta"):
+        model = T5ForConditionalGeneration(config)
+        if getattr(config, "pruned_vocab_size", None):
+            # Output vocabulary pruned by prune_vocab.py
+            from translator.vocab_pruning import empty_pruned_lm_head
+            model.lm_head = empty_pruned_lm_head(config)
+    mark("build")
+
+    model.load_state_dict(state_dict, strict=False, assign=True)
+    model.tie_weights()  # embed_tokens share `shared.weight`, which safetensors stores once
+    still_meta = [name for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+                  if tensor.device.type == "meta"]
+    if still_meta:
+        raise ValueError(f"{weights_path} is missing weights: {', '.join(still_meta[:5])}")
+    try:
+        from transformers import GenerationConfig
+        model.generation_config = GenerationConfig.from_pretrained(model_dir, local_files_only=True)
+    except OSError:
+        pass
+    model.package_revision = manifest.get("sha256")
+    model.eval()
+    if device != "cpu":
+        model.to(device)
+    mark("assign")
+
+    timings["total"] = round(time.perf_counter() - start, 4)
+    timings["copied_tensors"] = copied
+    return model, tokenizer, timings
+
+
+def format_timings(timings):
+    stages = [f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in timings.items()
+              if stage not in ("total", "copied_tensors", "with_imports")]
+    return f"{timings['total']:.2f}s (" + ", ".join(stages) + ")"
@@ -0,0 +1,57 @@
+# translator/generation_policy.py
+import math
+import os
+
+ADAPTIVE_GENERATION = os.getenv("TRANSLATION_ADAPTIVE", "0") == "1"
+
+
+# ✅ Adaptive Generation Budget
+# Replaces the fixed max_length=30 / num_beams=2 with settings derived from
+# the input length (in tokens, without the task prefix):
+#   * max_new_tokens grows with the input (ratio * n + slack, clamped), so
+#     long sentences are no longer cut at 30 tokens and short ones stop early;
+#   * inputs shorter than `beam_min_tokens` decode greedily, longer ones use
+#     `num_beams` with early stopping;
+#   * with `min_confidence` set, greedy outputs whose mean token probability
+#     falls below it are decoded again with beams (see TranslationEngine).
+class GenerationBudget:
+    def __init__(self, ratio=1.5, slack=4, min_new_tokens=8, max_new_tokens=128,
+                 beam_min_tokens=8, num_beams=2, min_confidence=None):
+        self.ratio = ratio
+        self.slack = slack
+        self.min_new_tokens = min_new_tokens
+        self.max_new_tokens = max_new_tokens
+        self.beam_min_tokens = beam_min_tokens
+        self.num_beams = num_beams
+        self.min_confidence = min_confidence
+
+    def max_new_tokens_for(self, input_tokens):
+        budget = math.ceil(self.ratio * input_tokens) + self.slack
+        return max(self.min_new_tokens, min(self.max_new_tokens, budget))
+
+    def beam_kwargs(self, input_tokens):
+        return {
+            "max_new_tokens": self.max_new_tokens_for(input_tokens),
+            "num_beams": self.num_beams,
+            "early_stopping": True,
+        }
+
+    def for_input(self, input_tokens):
+        if input_tokens < self.beam_min_tokens or self.num_beams <= 1:
+            return {"max_new_tokens": self.max_new_tokens_for(input_tokens), "num_beams": 1}
+        return self.beam_kwargs(input_tokens)
+
+    # Part of the translation cache key, so changing the policy drops old entries
+    def describe(self):
+        return {
+            "ratio": self.ratio,
+            "slack": self.slack,
+            "min_new_tokens": self.min_new_tokens,
+            "max_new_tokens": self.max_new_tokens,
+            "beam_min_tokens": self.beam_min_tokens,
+            "num_beams": self.num_beams,
+            "min_confidence": self.min_confidence,
+        }
+
+
+DEFAULT_BUDGET = GenerationBudget() if ADAPTIVE_GENERATION else None
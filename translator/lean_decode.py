@@ -0,0 +1,296 @@
+# translator/lean_decode.py
+import os
+
+from translator.t5_decoder import T5StepDecoder
+
+LEAN_DECODING = os.getenv("TRANSLATION_LEAN_DECODE", "0") == "1"
+# torch.compile the encoder and the decoder step of the lean loop (implies lean decoding)
+COMPILED_DECODING = os.getenv("TRANSLATION_COMPILE", "0") == "1"
+
+# generate() settings the loop does not implement, with the value that leaves the output unchanged
+NEUTRAL_SETTINGS = {
+    "do_sample": False,
+    "num_return_sequences": 1,
+    "repetition_penalty": 1.0,
+    "no_repeat_ngram_size": 0,
+    "min_length": 0,
+    "min_new_tokens": None,
+    "bad_words_ids": None,
+    "forced_bos_token_id": None,
+    "forced_eos_token_id": None,
+}
+# Implemented by the loop (early_stopping="never" excepted, see unsupported())
+IMPLEMENTED_SETTINGS = ("max_length", "max_new_tokens", "num_beams", "early_stopping", "length_penalty")
+# Accepted and ignored: the loop always caches, which gives the same tokens
+IGNORED_SETTINGS = ("use_cache",)
+
+
+# Finished hypotheses of one input (same bookkeeping as transformers' BeamHypotheses)
+class _Hypotheses:
+    def __init__(self, num_beams, length_penalty, early_stopping):
+        self.num_beams = num_beams
+        self.length_penalty = length_penalty
+        self.early_stopping = early_stopping
+        self.beams = []  # (score, tokens without EOS)
+        self.worst_score = 1e9
+
+    def add(self, tokens, sum_logprobs, generated_len):
+        score = sum_logprobs / (generated_len ** self.length_penalty)
+        if len(self.beams) < self.num_beams or score > self.worst_score:
+            self.beams.append((score, tokens))
+            if len(self.beams) > self.num_beams:
+                ranked = sorted((s, index) for index, (s, _) in enumerate(self.beams))
+                del self.beams[ranked[0][1]]
+                self.worst_score = ranked[1][0]
+            else:
+                self.worst_score = min(score, self.worst_score)
+
+    def is_done(self, best_sum_logprobs, generated_len):
+        if len(self.beams) < self.num_beams:
+            return False
+        if self.early_stopping:
+            return True
+        return self.worst_score >= best_sum_logprobs / (generated_len ** self.length_penalty)
+
+    def best(self):
+        return sorted(self.beams, key=lambda beam: beam[0])[-1][1]
+
+
+# ✅ Lean Greedy / Beam Decode Loop
+# A drop-in for model.generate(input_ids, attention_mask, max_length or
+# max_new_tokens, num_beams, early_stopping) on T5 models, without the
+# generic machinery (logits processors, stopping criteria, a past-key-values
+# cache that is concatenated and re-indexed every step). The self-attention
+# KV cache, the token buffer and the relative position bias table are
+# allocated once for the largest (rows, max_length) seen and reused; beams
+# are reordered with index_select into a second set of buffers. Outputs are
+# the same token ids generate() returns: finished greedy rows are padded,
+# beam search keeps generate's length penalty and early-stopping rules.
+# Any other setting (sampling, repetition penalty, ...) that is not neutral,
+# in the call or in the model's generation_config, is refused: supports()
+# tells the caller to use model.generate instead.
+# compiled=True runs the encoder and the decoder step through torch.compile
+# (dynamic shapes); the first calls per shape family compile, so warm it up
+# at startup (translator/warmup.py).
+class LeanDecoder:
+    def __init__(self, model, compiled=False):
+        self.model = model
+        self.decoder = T5StepDecoder(model)
+        self.compiled = compiled
+        self._encode = self.decoder.encode
+        self._decoder_step = self.decoder.step
+        if compiled:
+            import torch
+            self._encode = torch.compile(self.decoder.encode, dynamic=True)
+            self._decoder_step = torch.compile(self.decoder.step, dynamic=True)
+        generation = getattr(model, "generation_config", None)
+        self.length_penalty = getattr(generation, "length_penalty", 1.0)
+        self.early_stopping = getattr(generation, "early_stopping", False)
+        self._configured = {name: getattr(generation, name, neutral) for name, neutral in NEUTRAL_SETTINGS.items()}
+        self._storage = None
+        self._positions = None
+        self._bias_table = None
+
+    # ✅ Buffers for `rows` sequences of up to `length` tokens
+    # The storage only grows; every call gets contiguous views of exactly
+    # (rows, ..., length), so reordering beams copies no unused capacity.
+    def _reserve(self, rows, length):
+        import torch
+        decoder = self.decoder
+        storage = self._storage
+        if storage is None or storage["rows"] < rows or storage["length"] < length:
+            max_rows = max(rows, storage["rows"] if storage else 0)
+            max_length = max(length, storage["length"] if storage else 0)
+            size = max_rows * decoder.num_heads * max_length * decoder.head_dim
+
+            # Zeroed: the compiled step reads (masked) cache entries it has not written yet
+            def flat(count, dtype=decoder.dtype):
+                return torch.zeros(count, dtype=dtype, device=decoder.device)
+
+            storage = self._storage = {
+                "rows": max_rows,
+                "length": max_length,
+                "self": [[(flat(size), flat(size)) for _ in range(decoder.num_layers)] for _ in range(2)],
+                "tokens": [flat(max_rows * max_length, torch.long), flat(max_rows * max_length, torch.long)],
+                "scores": flat(max_rows, torch.float),
+                "finished": flat(max_rows, torch.bool),
+                "step_tokens": flat(max_rows, torch.long),
+            }
+            self._positions = torch.arange(max_length, device=decoder.device)
+            self._bias_table = decoder.position_bias(self._positions, max_length)
+
+        shape = (rows, decoder.num_heads, length, decoder.head_dim)
+        size = rows * decoder.num_heads * length * decoder.head_dim
+        return {
+            "self": [[(k[:size].view(shape), v[:size].view(shape)) for k, v in cache] for cache in storage["self"]],
+            "tokens": [tokens[:rows * length].view(rows, length) for tokens in storage["tokens"]],
+            "scores": storage["scores"][:rows],
+            "finished": storage["finished"][:rows],
+            "step_tokens": storage["step_tokens"][:rows],
+        }
+
+    def _prepare(self, input_ids, attention_mask, num_beams):
+        decoder = self.decoder
+        encoder_states = self._encode(input_ids, attention_mask)
+        cross = [(k.contiguous(), v.contiguous()) for k, v in decoder.cross_kv(encoder_states)]
+        cross_bias = decoder.mask_bias(attention_mask.bool())[:, None, None, :]
+        if num_beams > 1:
+            cross = [(k.repeat_interleave(num_beams, dim=0), v.repeat_interleave(num_beams, dim=0))
+                     for k, v in cross]
+            cross_bias = cross_bias.repeat_interleave(num_beams, dim=0)
+        return cross, cross_bias
+
+    def _step(self, buffers, tokens, step, self_cache, cross, cross_bias):
+        if not self.compiled:
+            bias = self._bias_table[step:step + 1, :, :, :step + 1]
+            return self._decoder_step(tokens, self._positions[step:step + 1], self_cache, cross, cross_bias,
+                                      step + 1, self_bias=bias)
+        # Same shapes and fresh (offset 0) tensors at every step, so one compiled
+        # graph serves the whole request: the full cache is read and the causal
+        # mask in the bias table hides the steps not decoded yet
+        length = self_cache[0][0].shape[2]
+        position = self._positions[step:step + 1].clone()
+        bias = self._bias_table[:, :, :, :length].index_select(0, position)
+        buffers["step_tokens"].copy_(tokens)
+        return self._decoder_step(buffers["step_tokens"], position, self_cache, cross, cross_bias, length,
+                                  self_bias=bias)
+
+    # ✅ Settings this loop would decode differently from model.generate
+    # generate's early_stopping="never" bounds the best attainable score by
+    # max_length; the loop only has the True / False rules
+    def unsupported(self, kwargs):
+        settings = dict(self._configured)
+        settings.update((name, value) for name, value in kwargs.items()
+                        if name not in IMPLEMENTED_SETTINGS + IGNORED_SETTINGS)
+        unsupported = [name for name, value in settings.items()
+                       if name not in NEUTRAL_SETTINGS or value != NEUTRAL_SETTINGS[name]]
+        if kwargs.get("early_stopping", self.early_stopping) == "never":
+            unsupported.append("early_stopping")
+        return sorted(unsupported)
+
+    def supports(self, kwargs):
+        return not self.unsupported(kwargs)
+
+    def generate(self, input_ids, attention_mask=None, max_length=20, max_new_tokens=None, num_beams=1,
+                 early_stopping=None, length_penalty=None, **kwargs):
+        import torch
+        unsupported = self.unsupported(dict(kwargs, early_stopping=early_stopping) if early_stopping is not None
+                                       else kwargs)
+        if unsupported:
+            raise ValueError(f"Lean decoding does not support {', '.join(unsupported)}; use model.generate.")
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        if max_new_tokens is not None:
+            max_length = max_new_tokens + 1  # + the decoder start token
+        early_stopping = self.early_stopping if early_stopping is None else early_stopping
+        length_penalty = self.length_penalty if length_penalty is None else length_penalty
+        with torch.inference_mode():
+            if num_beams > 1:
+                return self._beam_search(input_ids, attention_mask, max_length, num_beams, early_stopping,
+                                         length_penalty)
+            return self._greedy(input_ids, attention_mask, max_length)
+
+    def _greedy(self, input_ids, attention_mask, max_length):
+        decoder = self.decoder
+        rows = input_ids.shape[0]
+        buffers = self._reserve(rows, max_length)
+        self_cache = buffers["self"][0]
+        tokens = buffers["tokens"][0]
+        finished = buffers["finished"]
+        cross, cross_bias = self._prepare(input_ids, attention_mask, 1)
+
+        tokens[:, 0] = decoder.start_token_id
+        finished.fill_(False)
+        length = 1
+        while length < max_length:
+            logits = self._step(buffers, tokens[:, length - 1], length - 1, self_cache, cross, cross_bias)
+            next_tokens = decoder.token_ids(logits.argmax(dim=-1)).masked_fill_(finished, decoder.pad_token_id)
+            tokens[:, length] = next_tokens
+            finished |= next_tokens == decoder.eos_token_id
+            length += 1
+            if bool(finished.all()):
+                break
+        return tokens[:, :length].clone()
+
+    def _beam_search(self, input_ids, attention_mask, max_length, num_beams, early_stopping, length_penalty):
+        import torch
+        decoder = self.decoder
+        batch = input_ids.shape[0]
+        rows = batch * num_beams
+        buffers = self._reserve(rows, max_length)
+        caches = buffers["self"]
+        tokens = buffers["tokens"]
+        beam_scores = buffers["scores"]
+        cross, cross_bias = self._prepare(input_ids, attention_mask, num_beams)
+
+        # Only the first beam of every input is live at step 0
+        tokens[0][:, 0] = decoder.start_token_id
+        beam_scores.view(batch, num_beams).fill_(-1e9)[:, 0] = 0.0
+        hypotheses = [_Hypotheses(num_beams, length_penalty, early_stopping) for _ in range(batch)]
+        done = [False] * batch
+        current = 0
+        length = 1
+        while length < max_length:
+            logits = self._step(buffers, tokens[current][:, length - 1], length - 1, caches[current], cross,
+                                cross_bias)
+            scores = torch.log_softmax(logits.float(), dim=-1)
+            scores += beam_scores[:, None]
+            vocab = scores.shape[-1]
+            top_scores, top_ids = scores.view(batch, num_beams * vocab).topk(2 * num_beams, dim=1)
+            top_tokens = decoder.token_ids(top_ids % vocab).tolist()
+            top_scores, top_ids = top_scores.tolist(), top_ids.tolist()
+
+            next_rows, next_tokens, next_scores = [], [], []
+            for index in range(batch):
+                if done[index]:
+                    next_rows += [index * num_beams] * num_beams
+                    next_tokens += [decoder.pad_token_id] * num_beams
+                    next_scores += [0.0] * num_beams
+                    continue
+                chosen = 0
+                for rank, (score, candidate, token) in enumerate(
+                        zip(top_scores[index], top_ids[index], top_tokens[index])):
+                    row = index * num_beams + candidate // vocab
+                    if token == decoder.eos_token_id:
+                        # Length counts the EOS, as in generate(); only top-num_beams EOS are kept
+                        if rank < num_beams:
+                            hypotheses[index].add(tokens[current][row, :length].clone(), score, length)
+                        continue
+                    next_rows.append(row)
+                    next_tokens.append(token)
+                    next_scores.append(score)
+                    chosen += 1
+                    if chosen == num_beams:
+                        break
+                done[index] = hypotheses[index].is_done(max(top_scores[index]), length)
+
+            # Reorder the surviving beams into the other buffer set, then append their tokens
+            order = torch.tensor(next_rows, device=decoder.device)
+            target = 1 - current
+            for (source_k, source_v), (target_k, target_v) in zip(caches[current], caches[target]):
+                torch.index_select(source_k, 0, order, out=target_k)
+                torch.index_select(source_v, 0, order, out=target_v)
+            torch.index_select(tokens[current], 0, order, out=tokens[target])
+            tokens[target][:, length] = torch.tensor(next_tokens, device=decoder.device)
+            beam_scores.copy_(torch.tensor(next_scores, device=decoder.device))
+            current = target
+            length += 1
+            if all(done):
+                break
+
+        # Inputs still open at max_length: their live beams become hypotheses
+        final_scores = beam_scores.tolist()
+        for index in range(batch):
+            if done[index]:
+                continue
+            for row in range(index * num_beams, (index + 1) * num_beams):
+                hypotheses[index].add(tokens[current][row, :length].clone(), final_scores[row], length - 1)
+
+        best = [hypothesis.best() for hypothesis in hypotheses]
+        width = min(max(len(sequence) for sequence in best) + 1, max_length)
+        outputs = torch.full((batch, width), decoder.pad_token_id, dtype=torch.long, device=decoder.device)
+        for index, sequence in enumerate(best):
+            outputs[index, :len(sequence)] = sequence
+            if len(sequence) < width:
+                outputs[index, len(sequence)] = decoder.eos_token_id
+        return outputs
@@ -0,0 +1,58 @@
+# translator/loader.py
+from translator.backends import DEFAULT_BACKEND, apply_backend
+from translator.fast_loader import PACKAGED_MODEL_DIR, format_timings, is_packaged, load_packaged_model
+from translator.metrics import metrics
+
+FINE_TUNED_MODEL_DIR = "./fine_tuned_nanot5"
+BASE_MODEL_NAME = "mesolitica/nanot5-small-malaysian-translation-v2"
+
+
+# ✅ Turn on the decoder past-key-values cache
+# fine_tuned_nanot5/config.json ships with "use_cache": false, which makes every
+# beam step recompute self-attention over the whole decoded prefix.
+def enable_kv_cache(model, enabled=True):
+    model.config.use_cache = enabled
+    if getattr(model, "generation_config", None) is not None:
+        model.generation_config.use_cache = enabled
+    return model
+
+
+# ✅ Load Model and Tokenizer without any Streamlit dependency
+# Returns (model, tokenizer, device, status_message) so the UI can show the status.
+# A directory written by package_model.py is preferred: it is memory-mapped
+# with no network access (translator/fast_loader.py).
+def load_translation_model(model_dir=FINE_TUNED_MODEL_DIR, base_model=BASE_MODEL_NAME, use_cache=True,
+                           backend=DEFAULT_BACKEND, packaged_dir=PACKAGED_MODEL_DIR):
+    # torch / transformers are imported here so importing this module stays cheap
+    import torch
+    from transformers import T5ForConditionalGeneration, AutoTokenizer
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    if is_packaged(packaged_dir):
+        model, tokenizer, timings = load_packaged_model(packaged_dir, device)
+        metrics.observe("model_load_seconds", timings["total"])
+        message = f"✅ Packaged model loaded offline in {format_timings(timings)}."
+    elif device == "cuda":
+        try:
+            torch.cuda.init()  # Explicit CUDA check
+            tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            model = T5ForConditionalGeneration.from_pretrained(model_dir)
+            model.to(device)
+            message = "✅ Fine-tuned model is ready for chat!"
+        except torch.cuda.CudaError:
+            metrics.inc("cpu_fallbacks_total")
+            device = "cpu"
+            tokenizer = AutoTokenizer.from_pretrained(base_model)
+            model = T5ForConditionalGeneration.from_pretrained(base_model)
+            model.to(device)
+            message = "⚠️ CUDA initialization error. Loaded base model on CPU."
+    else:
+        tokenizer = AutoTokenizer.from_pretrained(base_model)
+        model = T5ForConditionalGeneration.from_pretrained(base_model)
+        model.to(device)
+        message = "⚠️ CUDA not available. Loaded base model on CPU."
+
+    model.eval()
+    enable_kv_cache(model, use_cache)
+    model, note = apply_backend(model, device, backend)
+    return model, tokenizer, device, message + note
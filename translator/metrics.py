@@ -0,0 +1,180 @@
+# translator/metrics.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ✅ Hot-path metrics, off unless TRANSLATION_METRICS=1
+# When disabled every call returns immediately (span() hands back a shared
+# no-op context manager), so the instrumentation costs a function call.
+METRICS_ENABLED = os.getenv("TRANSLATION_METRICS", "0") == "1"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+_NOOP = nullcontext()
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    pairs = list(key) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        total, out = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            out.append((bound, total))
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self, enabled=METRICS_ENABLED, prefix="translation"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    # ✅ Counters: requests, cache hits, failures, CPU fallbacks, ...
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    # ✅ Histograms: stage latencies (seconds) or sizes with buckets=SIZE_BUCKETS
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    # ✅ Per-stage timing span: with metrics.span("generate"): ...
+    def span(self, stage):
+        if not self.enabled:
+            return _NOOP
+        return self._timed(stage)
+
+    @contextmanager
+    def _timed(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # ✅ Prometheus text exposition format
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, key), value in sorted(self._counters.items()):
+                metric = f"{self.prefix}_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{_format_labels(key)} {value}")
+            for (name, key), histogram in sorted(self._histograms.items()):
+                metric = f"{self.prefix}_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                for bound, total in histogram.cumulative():
+                    lines.append(f"{metric}_bucket{_format_labels(key, {'le': bound})} {total}")
+                lines.append(f"{metric}_bucket{_format_labels(key, {'le': '+Inf'})} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {histogram.sum}")
+                lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    # ✅ JSON snapshot (counters + histogram count/sum/mean)
+    def snapshot(self):
+        with self._lock:
+            counters = {
+                name + _format_labels(key): value for (name, key), value in self._counters.items()
+            }
+            histograms = {
+                name + _format_labels(key): {
+                    "count": h.count,
+                    "sum": round(h.sum, 6),
+                    "mean": round(h.sum / h.count, 6) if h.count else 0.0,
+                    "buckets": {str(bound): total for bound, total in h.cumulative()},
+                }
+                for (name, key), h in self._histograms.items()
+            }
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+    def dump_json(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    # ✅ Periodic JSON dump on a daemon thread
+    def start_json_dump(self, path, interval=30.0):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.dump_json(path)
+
+        thread = threading.Thread(target=loop, name="metrics-json-dump", daemon=True)
+        thread.start()
+        return thread
+
+    # ✅ Serve GET /metrics on a daemon thread
+    def start_http_server(self, port, host="0.0.0.0"):
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+# ✅ Process-wide registry used by the translator and the Streamlit app
+metrics = MetricsRegistry()
@@ -0,0 +1,123 @@
+# translator/parity.py
+import argparse
+import copy
+import json
+import time
+
+from translator.reference_corpus import REFERENCE_SENTENCES
+
+
+# ✅ Time a single generate call and return (token_ids, seconds)
+def _timed_generate(engine, text, **overrides):
+    import torch
+    inputs = engine.encode([text])
+    kwargs = dict(engine.generate_kwargs(int(inputs["attention_mask"].sum())), **overrides)
+    with torch.inference_mode():
+        start = time.perf_counter()
+        outputs = engine.model.generate(**inputs, **kwargs)
+        elapsed = time.perf_counter() - start
+    return outputs[0].tolist(), elapsed
+
+
+# ✅ KV-Cache Verification Mode
+# Runs every sentence with and without past-key-values and checks the output
+# token ids are identical, reporting the per-sentence latency difference.
+def verify_kv_cache(engine, sentences=REFERENCE_SENTENCES, warmup=True):
+    if warmup:
+        _timed_generate(engine, sentences[0], use_cache=True)
+        _timed_generate(engine, sentences[0], use_cache=False)
+
+    rows = []
+    for text in sentences:
+        cached_ids, cached_time = _timed_generate(engine, text, use_cache=True)
+        uncached_ids, uncached_time = _timed_generate(engine, text, use_cache=False)
+        rows.append({
+            "input": text,
+            "identical": cached_ids == uncached_ids,
+            "cached_ms": round(cached_time * 1000, 3),
+            "uncached_ms": round(uncached_time * 1000, 3),
+            "saved_ms": round((uncached_time - cached_time) * 1000, 3),
+        })
+
+    total_cached = sum(row["cached_ms"] for row in rows)
+    total_uncached = sum(row["uncached_ms"] for row in rows)
+    all_identical = all(row["identical"] for row in rows)
+    return {
+        "passed": all_identical,
+        "all_identical": all_identical,
+        "sentences": rows,
+        "mean_cached_ms": round(total_cached / len(rows), 3),
+        "mean_uncached_ms": round(total_uncached / len(rows), 3),
+        "speedup": round(total_uncached / total_cached, 3) if total_cached else None,
+    }
+
+
+# ✅ Backend Parity Check
+# Compares a candidate engine (INT8 / ONNX) with the fp32 reference engine on
+# the same corpus: exact token match rate, post-processed text match rate and
+# mean latency of each.
+def verify_backend(reference, candidate, sentences=REFERENCE_SENTENCES, min_match_rate=0.9):
+    rows = []
+    for text in sentences:
+        reference_ids, reference_time = _timed_generate(reference, text)
+        candidate_ids, candidate_time = _timed_generate(candidate, text)
+        reference_text = reference.postprocess(reference.tokenizer.decode(reference_ids, skip_special_tokens=True))
+        candidate_text = candidate.postprocess(candidate.tokenizer.decode(candidate_ids, skip_special_tokens=True))
+        rows.append({
+            "input": text,
+            "reference": reference_text,
+            "candidate": candidate_text,
+            "tokens_identical": reference_ids == candidate_ids,
+            "text_identical": reference_text == candidate_text,
+            "reference_ms": round(reference_time * 1000, 3),
+            "candidate_ms": round(candidate_time * 1000, 3),
+        })
+
+    token_match_rate = sum(row["tokens_identical"] for row in rows) / len(rows)
+    text_match_rate = sum(row["text_identical"] for row in rows) / len(rows)
+    mean_reference = sum(row["reference_ms"] for row in rows) / len(rows)
+    mean_candidate = sum(row["candidate_ms"] for row in rows) / len(rows)
+    return {
+        "passed": text_match_rate >= min_match_rate,
+        "backend": getattr(candidate.model, "translation_backend", "torch"),
+        "token_match_rate": round(token_match_rate, 4),
+        "text_match_rate": round(text_match_rate, 4),
+        "mean_reference_ms": round(mean_reference, 3),
+        "mean_candidate_ms": round(mean_candidate, 3),
+        "speedup": round(mean_reference / mean_candidate, 3) if mean_candidate else None,
+        "sentences": rows,
+    }
+
+
+def main(argv=None):
+    from translator.engine import TranslationEngine
+    from translator.backends import BACKENDS, apply_backend
+    from translator.loader import load_translation_model
+
+    parser = argparse.ArgumentParser(description="Check generation parity on the reference corpus.")
+    parser.add_argument("--kv-cache", action="store_true", help="Compare cached vs uncached decoding.")
+    parser.add_argument("--backend", choices=[b for b in BACKENDS if b != "torch"],
+                        help="Compare this backend against the fp32 torch model.")
+    parser.add_argument("--min-match-rate", type=float, default=0.9,
+                        help="Minimum share of identical translations for the backend check.")
+    args = parser.parse_args(argv)
+    run_all = not (args.kv_cache or args.backend)
+
+    model, tokenizer, device, message = load_translation_model(backend="torch")
+    print(message)
+    engine = TranslationEngine(model, tokenizer, device)
+
+    report = {}
+    if args.kv_cache or run_all:
+        report["kv_cache"] = verify_kv_cache(engine)
+    if args.backend:
+        candidate_model, note = apply_backend(copy.deepcopy(model), device, args.backend)
+        print(note.strip())
+        candidate = TranslationEngine(candidate_model, tokenizer, device)
+        report["backend"] = verify_backend(engine, candidate, min_match_rate=args.min_match_rate)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0 if all(section["passed"] for section in report.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,21 @@
+# translator/reference_corpus.py
+# ✅ Fixed Manglish sentences used for parity checks and benchmarks.
+# Keep this list stable so results are comparable between runs.
+REFERENCE_SENTENCES = [
+    "Saya lapar.",
+    "Aku nak eat.",
+    "Aku nak gi shopping.",
+    "Dia tanya pasal apa?",
+    "Jom lepak mamak tonight.",
+    "Boss cakap meeting postpone to next week.",
+    "Aku tak sure dia datang ke tak.",
+    "Weekend ni nak pergi Genting dengan family.",
+    "Can you tolong pass the remote?",
+    "Traffic jam teruk gila pagi tadi, sampai office lambat.",
+    "Dia punya phone rosak so dia tak reply message aku.",
+    "Nanti kita discuss balik lepas lunch, okay?",
+    "Mak aku masak rendang for Raya this year.",
+    "Assignment ni due esok tapi aku belum start lagi.",
+    "Kalau hujan, kita cancel je lah the picnic.",
+    "I rasa movie tu best gila, you should watch.",
+]
@@ -0,0 +1,104 @@
+# translator/scheduler.py
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from translator.metrics import SIZE_BUCKETS, metrics
+
+DEFAULT_BATCH_WINDOW_MS = float(os.getenv("TRANSLATION_BATCH_WINDOW_MS", "10"))
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("TRANSLATION_MAX_BATCH_SIZE", "16"))
+
+
+# ✅ Dynamic Micro-Batching Scheduler
+# Every Streamlit session submits to the same scheduler; a single background
+# thread waits up to `batch_window_ms` (or until `max_batch_size` requests are
+# pending) and runs one translate_batch call for all of them.
+class MicroBatchScheduler:
+    def __init__(self, engine, batch_window_ms=DEFAULT_BATCH_WINDOW_MS,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        self.engine = engine
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.batches_run = 0
+        self.requests_served = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="translation-batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, text):
+        future = Future()
+        if self._stop_event.is_set():
+            future.set_exception(RuntimeError("Translation scheduler is stopped."))
+            return future
+        self.start()
+        self._queue.put((text, future))
+        return future
+
+    def translate(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    # ✅ Collect one batch: block for the first request, then fill until the window closes
+    def _collect_batch(self):
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_batch(self, batch):
+        # Skip requests whose caller already gave up
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        metrics.observe("batch_size", len(batch), buckets=SIZE_BUCKETS)
+        try:
+            results = self.engine.translate_batch([text for text, _ in batch])
+        except Exception as e:
+            metrics.inc("failures_total", len(batch))
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+        self.batches_run += 1
+        self.requests_served += len(batch)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._run_batch(batch)
+        # Drain anything still queued so no session waits forever
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(pending), self.max_batch_size):
+            self._run_batch(pending[start:start + self.max_batch_size])
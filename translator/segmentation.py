@@ -0,0 +1,82 @@
+# translator/segmentation.py
+import re
+
+from translator.metrics import metrics
+
+# Titles and company suffixes that end with a full stop but not a sentence
+ABBREVIATIONS = {"dr", "en", "pn", "tn", "cik", "prof", "sdn", "bhd", "no", "jln", "mr", "mrs", "ms", "st", "etc"}
+
+_BOUNDARY = re.compile(r"([.!?]+)(\s+)")
+_TERMINAL = re.compile(r"[.!?]+$")
+
+
+# ✅ Split text into sentences, keeping the whitespace that separated them
+# Returns [(sentence, separator_after), ...]; joining every sentence with its
+# separator gives back the original text.
+def split_sentences(text):
+    parts, start = [], 0
+    for match in _BOUNDARY.finditer(text):
+        words = text[start:match.start()].split()
+        if match.group(1) == "." and words and words[-1].lower() in ABBREVIATIONS:
+            continue
+        parts.append((text[start:match.end(1)], match.group(2)))
+        start = match.end()
+    if text[start:].strip():
+        parts.append((text[start:], ""))
+    elif parts:
+        parts[-1] = (parts[-1][0], parts[-1][1] + text[start:])
+    return parts
+
+
+# ✅ Give the translated sentence the source sentence's end punctuation (? ! ...)
+def restore_punctuation(source, translated):
+    match = _TERMINAL.search(source.strip())
+    if match is None or not translated:
+        return translated
+    return _TERMINAL.sub("", translated.rstrip()) + match.group(0)
+
+
+# ✅ Sentence-Splitting Pipeline
+# Wraps an engine (TranslationEngine, DeviceManager) behind the same
+# interface. clean_translation() keeps only the first output sentence, so
+# multi-sentence input is split first: every sentence of every request goes
+# into one translate_batch call and the translations are put back together
+# in order, with the original end punctuation and spacing. A lone paragraph
+# is generated as a single padded batch, so it takes about as long as its
+# longest sentence; several requests keep the engine's length bucketing.
+class SentencePipeline:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def translate_batch(self, texts):
+        texts = list(texts)
+        segmented = [split_sentences(text) or [(text, "")] for text in texts]
+        sentences = [sentence.strip() for parts in segmented for sentence, _ in parts]
+        metrics.inc("sentences_total", len(sentences))
+        if len(sentences) == len(texts):
+            # Nothing to split: same call as without the pipeline
+            return self.engine.translate_batch(texts)
+
+        translated = iter(self.engine.translate_batch(sentences, single_batch=len(texts) == 1))
+        results = []
+        for parts in segmented:
+            pieces = []
+            for sentence, separator in parts:
+                pieces.append(restore_punctuation(sentence, next(translated)) + separator)
+            results.append("".join(pieces).strip())
+        return results
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    # ✅ Single sentences stream token by token; longer input arrives in one piece
+    def stream_translate(self, text, timeout=60.0):
+        if len(split_sentences(text)) <= 1:
+            yield from self.engine.stream_translate(text, timeout)
+            return
+        yield self.translate(text)
+
+    def postprocess(self, translated_text):
+        if len(split_sentences(translated_text)) > 1:
+            return translated_text  # already post-processed sentence by sentence
+        return self.engine.postprocess(translated_text)
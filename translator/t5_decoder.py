@@ -0,0 +1,150 @@
+# translator/t5_decoder.py
+# ✅ Single-step T5 decoder over caller-managed KV buffers
+# model.generate keeps one past-key-values cache for the whole batch, so every
+# row must sit at the same decode step. T5StepDecoder runs one decoder step
+# from the model's own modules but takes the cache tensors and the position of
+# every row explicitly, so rows can join, leave or be reordered between steps
+# (continuous batching, the lean decode loop). Eval/inference only.
+
+
+def _token_id(generation, config, name):
+    value = getattr(generation, name, None)
+    if value is None:
+        value = getattr(config, name)
+    if isinstance(value, (list, tuple)):
+        value = value[0]
+    return value
+
+
+class T5StepDecoder:
+    def __init__(self, model):
+        self.model = model
+        config = model.config
+        self.blocks = model.decoder.block
+        self.num_layers = len(self.blocks)
+        attention = self.blocks[0].layer[0].SelfAttention
+        self.num_heads = attention.n_heads
+        self.head_dim = attention.key_value_proj_dim
+        self.relative_bias = attention.relative_attention_bias
+        self.num_buckets = attention.relative_attention_num_buckets
+        self.max_distance = attention.relative_attention_max_distance
+        self.bucket = type(attention)._relative_position_bucket
+        self.embed = model.decoder.embed_tokens
+        self.final_layer_norm = model.decoder.final_layer_norm
+        self.lm_head = model.lm_head
+        # Pruned output vocabulary (translator/vocab_pruning.py): step() returns
+        # logits over the kept tokens and token_ids() maps indices back
+        self.vocab_ids = getattr(self.lm_head, "vocab_ids", None)
+        # Tied embeddings are rescaled before the LM head, as in T5ForConditionalGeneration
+        self.output_scale = config.d_model ** -0.5 if config.tie_word_embeddings else None
+        # Special tokens as model.generate resolves them (generation_config first)
+        generation = getattr(model, "generation_config", None)
+        self.start_token_id = _token_id(generation, config, "decoder_start_token_id")
+        self.eos_token_id = _token_id(generation, config, "eos_token_id")
+        self.pad_token_id = _token_id(generation, config, "pad_token_id")
+
+    # From the embedding: a dynamically quantized lm_head has no weight tensor
+    @property
+    def device(self):
+        return self.embed.weight.device
+
+    @property
+    def dtype(self):
+        return self.embed.weight.dtype
+
+    def encode(self, input_ids, attention_mask):
+        return self.model.encoder(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    def _heads(self, states):
+        batch = states.shape[0]
+        return states.view(batch, -1, self.num_heads, self.head_dim).transpose(1, 2)
+
+    # ✅ Cross-attention keys/values, computed once per request: [(k, v)] per layer, (B, H, E, D)
+    def cross_kv(self, encoder_states):
+        cache = []
+        for block in self.blocks:
+            attention = block.layer[1].EncDecAttention
+            cache.append((self._heads(attention.k(encoder_states)), self._heads(attention.v(encoder_states))))
+        return cache
+
+    def empty_self_cache(self, rows, steps):
+        import torch
+        shape = (rows, self.num_heads, steps, self.head_dim)
+        return [(torch.zeros(shape, dtype=self.dtype, device=self.device),
+                 torch.zeros(shape, dtype=self.dtype, device=self.device)) for _ in range(self.num_layers)]
+
+    # Additive mask: 0 where attended, large negative elsewhere
+    def mask_bias(self, keep):
+        import torch
+        return (~keep).to(self.dtype) * torch.finfo(self.dtype).min
+
+    # ✅ Relative position bias for one query per row at `positions`: (B, H, 1, K)
+    def position_bias(self, positions, key_length):
+        import torch
+        keys = torch.arange(key_length, device=positions.device)
+        relative = keys[None, :] - positions[:, None]
+        buckets = self.bucket(relative, bidirectional=False, num_buckets=self.num_buckets,
+                              max_distance=self.max_distance)
+        bias = self.relative_bias(buckets).permute(0, 2, 1).unsqueeze(2)
+        causal = keys[None, :] <= positions[:, None]
+        return bias + self.mask_bias(causal)[:, None, None, :]
+
+    @staticmethod
+    def _attend(query, keys, values, bias):
+        import torch
+        scores = torch.matmul(query, keys.transpose(3, 2)) + bias
+        weights = torch.softmax(scores.float(), dim=-1).type_as(scores)
+        return torch.matmul(weights, values)
+
+    def _merge(self, states):
+        return states.transpose(1, 2).reshape(states.shape[0], 1, self.num_heads * self.head_dim)
+
+    # New key/value (B, H, 1, D) into the cache at every row's position
+    @staticmethod
+    def _write(cache, rows, positions, values):
+        if rows is None:
+            cache.index_copy_(2, positions, values)
+        else:
+            cache[rows, :, positions] = values[:, :, 0]
+
+    # ✅ One decoder step for B rows
+    #   tokens     (B,)   last token of every row
+    #   positions  (B,)   index of that token in its row (0 for the start token),
+    #              or (1,) when all rows are at the same step
+    #   self_cache [(k, v)] per layer, (B, H, T, D); the new key/value is written at `positions`
+    #   cross      [(k, v)] per layer, (B, H, E, D); cross_bias (B, 1, 1, E) from mask_bias()
+    # Only the first `key_length` cached steps are read (must exceed max(positions)).
+    # self_bias, if given, replaces position_bias(positions, key_length).
+    # Returns logits (B, vocab), or (B, kept tokens) for a pruned lm_head.
+    def step(self, tokens, positions, self_cache, cross, cross_bias, key_length, self_bias=None):
+        import torch
+        rows = None if positions.shape[0] == 1 else torch.arange(tokens.shape[0], device=tokens.device)
+        hidden = self.embed(tokens)[:, None, :]
+        if self_bias is None:
+            self_bias = self.position_bias(positions, key_length)
+        for block, (cache_k, cache_v), (cross_k, cross_v) in zip(self.blocks, self_cache, cross):
+            layer = block.layer[0]
+            attention = layer.SelfAttention
+            normed = layer.layer_norm(hidden)
+            self._write(cache_k, rows, positions, self._heads(attention.k(normed)))
+            self._write(cache_v, rows, positions, self._heads(attention.v(normed)))
+            context = self._attend(self._heads(attention.q(normed)), cache_k[:, :, :key_length],
+                                   cache_v[:, :, :key_length], self_bias)
+            hidden = hidden + attention.o(self._merge(context))
+
+            layer = block.layer[1]
+            attention = layer.EncDecAttention
+            context = self._attend(self._heads(attention.q(layer.layer_norm(hidden))), cross_k, cross_v, cross_bias)
+            hidden = hidden + attention.o(self._merge(context))
+
+            hidden = block.layer[-1](hidden)
+        hidden = self.final_layer_norm(hidden)
+        if self.output_scale is not None:
+            hidden = hidden * self.output_scale
+        if self.vocab_ids is not None:
+            return self.lm_head.project(hidden)[:, 0, :]
+        return self.lm_head(hidden)[:, 0, :]
+
+    # Token ids for indices into step()'s logits
+    def token_ids(self, indices):
+        return indices if self.vocab_ids is None else self.vocab_ids[indices]
@@ -0,0 +1,25 @@
+# translator/text_utils.py
+import re
+
+# ✅ Task prefix the nanoT5 translation model was fine-tuned with
+TRANSLATION_PREFIX = "terjemah ke Inggeris: "
+
+
+# ✅ Cleaning Translation Results
+def clean_translation(text):
+    sentences = [s.strip() for s in text.split('.') if s.strip()]
+    return sentences[0] if sentences else text
+
+
+# ✅ Add a full stop when the text does not end with punctuation
+def ensure_punctuation(text):
+    if text and text[-1] not in ['.', '!', '?']:
+        return text + '.'
+    return text
+
+
+# Allow letters, numbers, spaces, and standard punctuation only
+def ensure_valid_input(text):
+    if not re.match(r'^[a-zA-Z0-9\s.,!?]+$', text):
+        return False
+    return True
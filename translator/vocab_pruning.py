@@ -0,0 +1,116 @@
+# translator/vocab_pruning.py
+# ✅ Output Vocabulary Pruning
+# fine_tuned_nanot5 has an untied 512 x 32100 lm_head, but English output only
+# ever uses a few thousand of those tokens. A pruned model keeps the lm_head
+# rows of the active target vocabulary (derived from a corpus, see
+# active_vocabulary) and the ids they stand for:
+#   * PrunedLMHead returns full-size logits by default, with every pruned
+#     token at the lowest score, so generate / streaming / beam search work
+#     unchanged and only the projection gets cheaper;
+#   * T5StepDecoder (lean loop, continuous batching) uses the small logits
+#     directly and maps the chosen indices back through `vocab_ids`.
+# Embeddings and the tokenizer are untouched: token ids stay the tokenizer's.
+# torch is imported on first use, like the rest of translator/: PrunedLMHead
+# (an nn.Module) is defined when it is first looked up.
+_pruned_lm_head_class = None
+
+
+def _define_pruned_lm_head():
+    import torch
+
+    class PrunedLMHead(torch.nn.Module):
+        def __init__(self, weight, vocab_ids, vocab_size):
+            super().__init__()
+            self.weight = torch.nn.Parameter(weight, requires_grad=False)
+            self.register_buffer("vocab_ids", vocab_ids)
+            self.vocab_size = vocab_size
+            self.in_features = weight.shape[1]
+            self.out_features = weight.shape[0]
+
+        # Logits over the kept tokens only: (..., len(vocab_ids))
+        def project(self, hidden):
+            return torch.nn.functional.linear(hidden, self.weight)
+
+        def forward(self, hidden):
+            logits = self.project(hidden)
+            full = logits.new_full((*logits.shape[:-1], self.vocab_size), torch.finfo(logits.dtype).min)
+            return full.index_copy_(-1, self.vocab_ids, logits)
+
+    # Picklable as translator.vocab_pruning.PrunedLMHead (resolved by __getattr__)
+    PrunedLMHead.__module__ = __name__
+    PrunedLMHead.__qualname__ = "PrunedLMHead"
+    return PrunedLMHead
+
+
+def pruned_lm_head_class():
+    global _pruned_lm_head_class
+    if _pruned_lm_head_class is None:
+        _pruned_lm_head_class = _define_pruned_lm_head()
+    return _pruned_lm_head_class
+
+
+def __getattr__(name):
+    if name == "PrunedLMHead":
+        return pruned_lm_head_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def special_token_ids(model, tokenizer):
+    ids = {model.config.decoder_start_token_id, model.config.eos_token_id, model.config.pad_token_id}
+    generation = getattr(model, "generation_config", None)
+    for name in ("decoder_start_token_id", "eos_token_id", "pad_token_id"):
+        value = getattr(generation, name, None)
+        ids.update(value if isinstance(value, (list, tuple)) else [value])
+    ids.update(tokenizer.all_special_ids)
+    return {token_id for token_id in ids if token_id is not None}
+
+
+# ✅ Token ids the full model generates for `sources` (engine settings + overrides)
+def generated_token_ids(engine, sources, batch_size=16, **overrides):
+    import torch
+    ids = set()
+    sources = list(sources)
+    for start in range(0, len(sources), batch_size):
+        inputs = engine.encode(sources[start:start + batch_size])
+        kwargs = dict(engine.generate_kwargs(int(inputs["attention_mask"].sum(dim=1).max())), **overrides)
+        with torch.inference_mode():
+            outputs = engine.model.generate(**inputs, **kwargs)
+        ids.update(outputs.flatten().tolist())
+    return ids
+
+
+# ✅ Active target vocabulary: special tokens + reference translations + teacher outputs
+def active_vocabulary(model, tokenizer, targets=(), generated=()):
+    ids = special_token_ids(model, tokenizer)
+    for text in targets:
+        ids.update(tokenizer(text)["input_ids"])
+    ids.update(generated)
+    return sorted(token_id for token_id in ids if 0 <= token_id < model.config.vocab_size)
+
+
+# ✅ Replace the model's lm_head with the rows of `vocab_ids` (in place)
+# A tied head is untied: the T5 output rescaling (d_model ** -0.5) is folded
+# into the kept rows, so the model computes the same logits without it.
+def prune_lm_head(model, vocab_ids):
+    import torch
+    config = model.config
+    vocab_ids = torch.tensor(sorted(vocab_ids), dtype=torch.long, device=model.lm_head.weight.device)
+    weight = model.lm_head.weight.detach()[vocab_ids].clone()
+    if config.tie_word_embeddings:
+        weight = weight * config.d_model ** -0.5
+        config.tie_word_embeddings = False
+    model.lm_head = pruned_lm_head_class()(weight, vocab_ids, config.vocab_size)
+    config.pruned_vocab_size = len(vocab_ids)
+    return model
+
+
+# ✅ Empty head of the right shape, for models built on the meta device (fast_loader)
+def empty_pruned_lm_head(config):
+    import torch
+    size = config.pruned_vocab_size
+    return pruned_lm_head_class()(torch.empty((size, config.d_model)), torch.empty((size,), dtype=torch.long),
+                        config.vocab_size)
+
+
+def is_pruned(model):
+    return getattr(model.lm_head, "vocab_ids", None) is not None
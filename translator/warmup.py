@@ -0,0 +1,94 @@
+# translator/warmup.py
+import argparse
+import json
+import os
+import time
+
+from translator.metrics import metrics
+from translator.reference_corpus import REFERENCE_SENTENCES
+
+WARMUP_ENABLED = os.getenv("TRANSLATION_WARMUP", "1") == "1"
+WARMUP_BATCH_SIZES = (1, 4)
+
+
+# Shortest, median and longest sentence (in tokens) of the corpus
+def representative_sentences(engine, sentences=REFERENCE_SENTENCES):
+    ranked = sorted(sentences, key=lambda text: len(engine.tokenize([text])[0]))
+    picks = [ranked[0], ranked[len(ranked) // 2], ranked[-1]]
+    return list(dict.fromkeys(picks))
+
+
+# ✅ Startup Warmup
+# The first generate calls of a process pay one-off costs (lazy kernel and
+# allocator setup, oneDNN primitive creation, and with TRANSLATION_COMPILE=1
+# the torch.compile graphs). warmup() runs every representative shape (short,
+# median and long input x single request and a small batch) through the
+# engine's generate path, bypassing the translation cache, until it reaches
+# steady state, and reports the time of the first and the last round.
+# `progress`, if given, is called with every finished shape (worker heartbeats).
+def warmup(engine, sentences=REFERENCE_SENTENCES, batch_sizes=WARMUP_BATCH_SIZES, rounds=2, progress=None):
+    start = time.perf_counter()
+    shapes = []
+    for text in representative_sentences(engine, sentences):
+        for batch_size in batch_sizes:
+            timings = []
+            for _ in range(rounds):
+                began = time.perf_counter()
+                engine.generate_batch([text] * batch_size)
+                timings.append(time.perf_counter() - began)
+            shapes.append({
+                "batch_size": batch_size,
+                "input_tokens": len(engine.tokenize([text])[0]),
+                "first_ms": round(timings[0] * 1000, 3),
+                "steady_ms": round(timings[-1] * 1000, 3),
+            })
+            if progress is not None:
+                progress(shapes[-1])
+    total = time.perf_counter() - start
+    metrics.observe("warmup_seconds", total)
+    return {"seconds": round(total, 3), "compiled": getattr(engine, "compiled", False), "shapes": shapes}
+
+
+def format_warmup(report):
+    first = sum(shape["first_ms"] for shape in report["shapes"])
+    steady = sum(shape["steady_ms"] for shape in report["shapes"])
+    mode = "compiled" if report["compiled"] else "eager"
+    return (f"warmed up {len(report['shapes'])} shapes ({mode}) in {report['seconds']:.1f}s: "
+            f"first round {first:.0f} ms, steady {steady:.0f} ms")
+
+
+# ✅ Startup report: model load, warmup and the first request after it
+#   python -m translator.warmup [--compile]
+def main(argv=None):
+    from translator.engine import TranslationEngine
+    from translator.loader import load_translation_model
+
+    parser = argparse.ArgumentParser(description="Warm up the translator and report the time it takes.")
+    parser.add_argument("--compile", action="store_true", help="Use the torch.compile lean decode path")
+    parser.add_argument("--rounds", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    model, tokenizer, device, message = load_translation_model()
+    load_seconds = time.perf_counter() - start
+    print(message)
+    engine = TranslationEngine(model, tokenizer, device, **({"compiled": True} if args.compile else {}))
+    report = warmup(engine, rounds=args.rounds)
+    print(format_warmup(report))
+
+    # A sentence outside the warmup set, as the first user would send it
+    warmed = set(representative_sentences(engine))
+    text = next(sentence for sentence in REFERENCE_SENTENCES if sentence not in warmed)
+    began = time.perf_counter()
+    engine.generate_batch([text])
+    first_request_ms = (time.perf_counter() - began) * 1000
+    print(json.dumps({
+        "load_seconds": round(load_seconds, 3),
+        "warmup": report,
+        "first_request_ms": round(first_request_ms, 3),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
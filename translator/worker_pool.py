@@ -0,0 +1,269 @@
+# translator/worker_pool.py
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from translator.metrics import metrics
+from translator.warmup import WARMUP_ENABLED, warmup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "0"))
+DEFAULT_THREADS_PER_WORKER = int(os.getenv("TRANSLATION_THREADS_PER_WORKER", "0"))
+_STOP = None
+
+
+# ✅ Split the usable cores into one contiguous group per worker
+def partition_cores(workers, cores=None, threads_per_worker=0):
+    if cores is None:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    cores = list(cores)
+    workers = max(1, int(workers))
+    if threads_per_worker:
+        size = max(1, int(threads_per_worker))
+    else:
+        size = max(1, len(cores) // workers)
+    groups = []
+    for index in range(workers):
+        group = cores[index * size:(index + 1) * size] if (index + 1) * size <= len(cores) else []
+        # More workers than cores: wrap around instead of leaving a worker unpinned
+        groups.append(group or [cores[index % len(cores)]])
+    return groups
+
+
+def default_engine_factory(model, tokenizer, **engine_kwargs):
+    from translator.cache import TranslationCache
+    from translator.engine import TranslationEngine
+    engine_kwargs.setdefault("cache", TranslationCache())
+    return TranslationEngine(model, tokenizer, "cpu", **engine_kwargs)
+
+
+# ✅ Worker process: pin to its cores, size the intra-op pool, then serve batches
+def _worker_main(index, cores, model, tokenizer, engine_factory, engine_kwargs,
+                 requests, results, max_batch_size, in_flight):
+    import torch
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(max(1, len(cores)))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # already set by an earlier parallel op
+
+    try:
+        engine = engine_factory(model, tokenizer, **engine_kwargs)
+        # Warm up every worker before it reports ready (first calls in a process are slow);
+        # a heartbeat per shape keeps a long (compiled) warmup within start_timeout
+        if WARMUP_ENABLED and hasattr(engine, "generate_batch"):
+            warmup(engine, progress=lambda shape: results.put(("warming", index, shape)))
+    except Exception as e:
+        results.put(("error", index, repr(e)))
+        return
+    results.put(("ready", index, None))
+    while True:
+        item = requests.get()
+        if item is _STOP:
+            break
+        batch = [item]
+        # Drain whatever is already waiting so one generate call serves it all
+        while len(batch) < max_batch_size:
+            try:
+                item = requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                requests.put(_STOP)
+                break
+            batch.append(item)
+        # Written to shared memory (a queued message could die with the process),
+        # so the parent can fail these requests if this worker exits while serving them
+        in_flight[1:len(batch) + 1] = [request_id for request_id, _ in batch]
+        in_flight[0] = len(batch)
+        try:
+            translations = engine.translate_batch([text for _, text in batch])
+        except Exception as e:
+            for request_id, _ in batch:
+                results.put(("error", request_id, f"{type(e).__name__}: {e}"))
+            continue
+        for (request_id, _), translation in zip(batch, translations):
+            results.put(("ok", request_id, translation))
+
+
+# ✅ Multi-Process CPU Worker Pool
+# The parent moves the model weights into shared memory once
+# (model.share_memory()); every worker process receives handles to the same
+# storage instead of its own copy, so N workers cost one set of weights plus
+# their activations. Each worker is pinned to its own group of cores with a
+# matching torch.set_num_threads. Requests go through one shared queue; idle
+# workers pull the next ones, which keeps all workers busy without a
+# separate load-balancing step. Same interface as MicroBatchScheduler.
+# A worker that dies (OOM kill, crash in a native kernel) fails the requests
+# it was serving; when none are left, every pending request fails.
+class WorkerPool:
+    def __init__(self, model, tokenizer, workers=DEFAULT_WORKERS, threads_per_worker=DEFAULT_THREADS_PER_WORKER,
+                 cores=None, max_batch_size=16, engine_factory=default_engine_factory, engine_kwargs=None,
+                 start_timeout=300.0, health_interval=0.5):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.core_groups = partition_cores(workers or (os.cpu_count() or 1), cores, threads_per_worker)
+        self.workers = len(self.core_groups)
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.engine_factory = engine_factory
+        self.engine_kwargs = engine_kwargs or {}
+        self.start_timeout = start_timeout
+        self.health_interval = health_interval
+        self._processes = []
+        self._dead = set()
+        self._stopping = False
+        self._in_flight = []  # per worker, shared: [count, request ids of its current batch...]
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._requests = None
+        self._results = None
+        self._collector = None
+
+    def start(self):
+        if self._processes:
+            return self
+        import torch.multiprocessing as mp
+        if getattr(self.model, "translation_backend", "torch") != "torch":
+            raise ValueError("WorkerPool shares torch weights; use the torch backend.")
+        if self.model is not None:
+            if next(self.model.parameters()).device.type != "cpu":
+                raise ValueError("WorkerPool is for CPU inference; move the model to CPU first.")
+            self.model.share_memory()
+
+        context = mp.get_context("spawn")
+        self._requests = context.Queue()
+        self._results = context.Queue()
+        self._in_flight = [context.Array("q", self.max_batch_size + 1, lock=False) for _ in self.core_groups]
+        for index, cores in enumerate(self.core_groups):
+            process = context.Process(
+                target=_worker_main,
+                args=(index, cores, self.model, self.tokenizer, self.engine_factory, self.engine_kwargs,
+                      self._requests, self._results, self.max_batch_size, self._in_flight[index]),
+                name=f"translation-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+        deadline = time.monotonic() + self.start_timeout
+        ready = 0
+        while ready < self.workers:
+            try:
+                kind, index, value = self._results.get(timeout=min(1.0, max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                exited = [process.name for process in self._processes if not process.is_alive()]
+                if exited or time.monotonic() >= deadline:
+                    self.stop()
+                    reason = f"{', '.join(exited)} exited" if exited else f"not ready after {self.start_timeout:.0f}s"
+                    raise RuntimeError(f"Translation workers failed to start: {reason}.")
+                continue
+            if kind == "error":
+                self.stop()
+                raise RuntimeError(f"Translation worker {index} failed to start: {value}")
+            # start_timeout bounds the time without progress, not the whole warmup
+            deadline = time.monotonic() + self.start_timeout
+            ready += kind == "ready"
+        self._collector = threading.Thread(target=self._collect, name="translation-pool-results", daemon=True)
+        self._collector.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        if not self._processes:
+            return
+        self._stopping = True
+        for _ in self._processes:
+            self._requests.put(_STOP)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._dead = set()
+        self._in_flight = []
+        if self._collector is not None:
+            self._results.put(("stop", None, None))
+            self._collector.join(timeout)
+            self._collector = None
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError("Translation worker pool is stopped."))
+        self._stopping = False
+
+    # ✅ Collector thread: route worker results back to the waiting futures
+    def _collect(self):
+        next_check = time.monotonic() + self.health_interval
+        while True:
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + self.health_interval
+            try:
+                kind, key, value = self._results.get(timeout=self.health_interval)
+            except queue.Empty:
+                continue
+            if kind == "stop":
+                return
+            with self._lock:
+                future = self._pending.pop(key, None)
+            if future is None:
+                continue
+            if kind == "ok":
+                future.set_result(value)
+            else:
+                metrics.inc("failures_total")
+                future.set_exception(RuntimeError(value))
+
+    # ✅ Fail the requests of workers that exited; everything once none are left
+    def _check_workers(self):
+        if self._stopping:
+            return
+        processes, shared = list(self._processes), self._in_flight
+        for index, process in enumerate(processes):
+            if index in self._dead or process.is_alive():
+                continue
+            self._dead.add(index)
+            metrics.inc("worker_crashes_total")
+            logger.error(f"Translation worker {index} exited with code {process.exitcode}")
+            in_flight = shared[index]
+            self._fail(list(in_flight[1:in_flight[0] + 1]),
+                       RuntimeError(f"Translation worker {index} exited (code {process.exitcode})."))
+        if processes and len(self._dead) == len(processes):
+            with self._lock:
+                request_ids = list(self._pending)
+            self._fail(request_ids, RuntimeError("All translation workers have exited."))
+
+    def _fail(self, request_ids, error):
+        for request_id in request_ids:
+            with self._lock:
+                future = self._pending.pop(request_id, None)
+            if future is not None:
+                metrics.inc("failures_total")
+                future.set_exception(error)
+
+    def submit(self, text):
+        future = Future()
+        if not self._processes or len(self._dead) == len(self._processes):
+            future.set_exception(RuntimeError("Translation worker pool is not running."))
+            return future
+        request_id = next(self._ids)
+        with self._lock:
+            self._pending[request_id] = future
+        self._requests.put((request_id, text))
+        return future
+
+    def translate(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    # ✅ Lets the pool stand in for a TranslationEngine (bulk jobs, HTTP service)
+    # single_batch is accepted for SentencePipeline; the workers batch on their own.
+    def translate_batch(self, texts, timeout=None, single_batch=False):
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout) for future in futures]